@@ -0,0 +1,159 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from flask import jsonify, request
+
+from .config import Config
+
+# The concurrency slot the current request holds, released on teardown
+_slot = ContextVar('admission_slot', default=None)
+
+# Tokens a request of each class takes from its client's bucket
+CLASS_COST = {'cheap': 1, 'list': 2, 'expensive': 5, 'write': 2}
+CHEAP_ENDPOINTS = ('jobs.get_job', 'jobs.batch_get_jobs', 'jobs.suggest_values', 'jobs.get_job_changes',
+                   'jobs.cache_stats')
+EXPENSIVE_ENDPOINTS = ('jobs.search_jobs', 'jobs.export_jobs')
+# Long-lived streams are rate limited but don't hold a concurrency slot
+UNSLOTTED_ENDPOINTS = ('jobs.stream_job_changes',)
+# get_jobs pages whose OFFSET skips more rows than this count as expensive
+DEEP_OFFSET = 1000
+
+
+def classify(req):
+    """
+    Estimate a request's cost class from its route and parameters: 'cheap'
+    (point lookups, suggestions, summary facets), 'list' (indexed get_jobs
+    pages), 'expensive' (deep OFFSETs, exact totals, archive unions, live
+    facets, search, export) or 'write'.
+    """
+    endpoint = req.endpoint
+    if endpoint in CHEAP_ENDPOINTS:
+        return 'cheap'
+    if req.method not in ('GET', 'HEAD'):
+        return 'write'
+    if endpoint in EXPENSIVE_ENDPOINTS:
+        return 'expensive'
+    args = req.args
+    if endpoint == 'jobs.get_facets':
+        tags = len(args.getlist('tag'))
+        live = ((args.get('location') and tags) or tags > 1
+                or args.get('collapse_duplicates', '').lower() == 'true')
+        return 'expensive' if live else 'cheap'
+    if endpoint == 'jobs.get_jobs':
+        try:
+            # Clamped as get_jobs clamps it, so an oversized per_page costs what is actually served
+            per_page = min(int(args.get('per_page', 10)), Config.MAX_PER_PAGE)
+            offset = (int(args.get('page', 1)) - 1) * per_page
+        except ValueError:
+            offset = 0
+        if (offset > DEEP_OFFSET or args.get('include_total', '').lower() == 'true'
+                or args.get('include_archived', '').lower() == 'true'):
+            return 'expensive'
+        return 'list'
+    return 'cheap'
+
+
+class TokenBuckets:
+    """Per-client token buckets refilled at `rate` tokens a second up to `burst`, least recently seen evicted."""
+
+    def __init__(self, rate, burst, max_clients=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, client, cost):
+        """Take `cost` tokens. Returns 0 if admitted, else the seconds until the client could afford it."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = [self.burst, now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                return 0
+            bucket[0] = tokens
+            return (cost - tokens) / self.rate
+
+
+class AdmissionControl:
+    """
+    Guards the job blueprint under overload. Each client (by remote
+    address) has a token bucket, and costlier request classes take more
+    tokens; an empty bucket gets 429. Each class also has a fixed number of
+    concurrent slots and a short queue wait, so expensive scans can't tie
+    up the database pool: when a class is saturated its requests get 503
+    instead of queueing. Cheap reads get the most slots and the longest
+    wait, expensive scans the fewest and none.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.blueprints = ('jobs',)
+        self.buckets = None
+        self.trust_forwarded_for = False
+        self._slots = {}
+        self._queue_seconds = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['admission_control'] = self
+        self.enabled = app.config.get('ADMISSION_ENABLED', True)
+        self.buckets = TokenBuckets(app.config.get('RATE_LIMIT_PER_SECOND', 20.0),
+                                    app.config.get('RATE_LIMIT_BURST', 60.0))
+        self.trust_forwarded_for = app.config.get('ADMISSION_TRUST_FORWARDED_FOR', False)
+        self._slots = {name: threading.BoundedSemaphore(limit)
+                       for name, limit in app.config['ADMISSION_CONCURRENCY'].items()}
+        self._queue_seconds = {name: ms / 1000 for name, ms in app.config['ADMISSION_QUEUE_MS'].items()}
+        app.before_request(self._admit)
+        app.teardown_request(self._release)
+
+    def _client(self):
+        if self.trust_forwarded_for and request.access_route:
+            return request.access_route[0]
+        return request.remote_addr
+
+    def _admit(self):
+        _slot.set(None)
+        if not self.enabled or request.blueprint not in self.blueprints or request.method == 'OPTIONS':
+            return None
+        cost_class = classify(request)
+        wait = self.buckets.take(self._client(), CLASS_COST[cost_class])
+        if wait:
+            return _reject('Rate limit exceeded', 429, wait)
+        if request.endpoint in UNSLOTTED_ENDPOINTS:
+            return None
+        slots = self._slots.get(cost_class)
+        if slots is None:
+            return None
+        if not slots.acquire(timeout=self._queue_seconds.get(cost_class, 0)):
+            return _reject(f'Server busy ({cost_class} requests)', 503, 1)
+        _slot.set(slots)
+        return None
+
+    def _release(self, exc=None):
+        slots = _slot.get()
+        if slots is not None:
+            _slot.set(None)
+            slots.release()
+
+
+def _reject(message, status, retry_after):
+    response = jsonify({'error': message})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+admission_control = AdmissionControl()
@@ -2,14 +2,32 @@ from flask import Flask
 from flask_cors import CORS
 from .config import Config
 from .db import db
+from .cache import response_cache
+from .metrics import request_metrics
+from .admission import admission_control
+from .replicas import replica_router
 from .routes.job_routes import job_bp
+from .commands import backfill_tags_command, init_search_command, migrate_command, check_query_plans_command, \
+    rebuild_facets_command, compact_changes_command, archive_jobs_command, dedup_jobs_command
 
 app = Flask(__name__)
 CORS(app, origins=["http://localhost:5173"])
 app.config.from_object(Config)
 db.init_app(app)
+replica_router.init_app(app)
+response_cache.init_app(app)
+request_metrics.init_app(app)
+admission_control.init_app(app)
 
 app.register_blueprint(job_bp)
+app.cli.add_command(backfill_tags_command)
+app.cli.add_command(init_search_command)
+app.cli.add_command(migrate_command)
+app.cli.add_command(check_query_plans_command)
+app.cli.add_command(rebuild_facets_command)
+app.cli.add_command(compact_changes_command)
+app.cli.add_command(archive_jobs_command)
+app.cli.add_command(dedup_jobs_command)
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
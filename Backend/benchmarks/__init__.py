@@ -0,0 +1,5 @@
+"""
+Standalone benchmarks, each runnable with `python -m Backend.benchmarks.<name>`.
+serializers points the app at a throwaway SQLite database; seed and load take
+the database (or server) to work against as an argument.
+"""
@@ -0,0 +1,123 @@
+"""
+Measure what archiving stale postings does to the jobs table size and to
+get_jobs latency: time a set of list queries, run 'flask archive-jobs' with
+the given threshold, then time them again (and once more with
+include_archived=true).
+
+    python -m Backend.benchmarks.archive [--rows 200000] [--older-than-days 90]
+    python -m Backend.benchmarks.archive --database-url sqlite:///bench.db --older-than-days 90
+
+Without --database-url a throwaway SQLite database is seeded. A database
+given with --database-url is archived in place.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, func, select, text
+
+from .load import percentile
+from .seed import seed
+
+SCENARIOS = (
+    ('page 1', '/jobs?per_page=20'),
+    ('page 1, total count', '/jobs?per_page=20&cursor=&include_total=true'),
+    ('deep page (OFFSET)', '/jobs?per_page=20&page=2000'),
+    ('job_type=Contract', '/jobs?per_page=20&job_type=Contract'),
+    ('location=London', '/jobs?per_page=20&location=London'),
+    ('tag=Pricing', '/jobs?per_page=20&tag=Pricing'),
+    ('oldest first', '/jobs?per_page=20&sort=posting_date_asc'),
+)
+
+
+def table_size(conn, name):
+    """(rows, bytes including indexes); bytes is None where the database can't say."""
+    rows = conn.execute(select(func.count()).select_from(text(name))).scalar()
+    if conn.dialect.name == 'sqlite':
+        # Bytes in use: SQLite keeps freed pages in the file until VACUUM
+        size = conn.execute(text("SELECT SUM(pgsize - unused) FROM dbstat WHERE name = :name OR name IN "
+                                 "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :name)"),
+                            {'name': name}).scalar()
+    elif conn.dialect.name == 'mysql':
+        size = conn.execute(text("SELECT data_length + index_length FROM information_schema.tables "
+                                 "WHERE table_schema = DATABASE() AND table_name = :name"), {'name': name}).scalar()
+    else:
+        size = None
+    return rows, size
+
+
+def measure_tables(engine, *names):
+    """Refresh planner statistics (so both runs plan on current data) and return each table's size."""
+    with engine.begin() as conn:
+        conn.execute(text('ANALYZE'))
+        return [table_size(conn, name) for name in names]
+
+
+def time_scenarios(client, requests, suffix=''):
+    results = {}
+    for name, path in SCENARIOS:
+        client.get(path + suffix)
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = client.get(path + suffix)
+            timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, (path, response.get_json())
+        results[name] = (statistics.median(timings), percentile(timings, 95))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--database-url', help='Seeded database to archive in place (default: seed a temporary one)')
+    parser.add_argument('--rows', type=int, default=200000, help='Rows to seed the temporary database with')
+    parser.add_argument('--older-than-days', type=int, default=90)
+    parser.add_argument('--requests', type=int, default=30, help='Timed requests per scenario')
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_archive.db')}"
+    if not args.database_url:
+        seed(create_engine(url), args.rows, log=lambda line: None)
+    os.environ['DATABASE_URL'] = url
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+    os.environ['METRICS_ENABLED'] = 'false'
+    os.environ['ADMISSION_ENABLED'] = 'false'
+    os.environ.setdefault('MAX_OFFSET', str(10 ** 9))
+    from .. import migrations
+    from ..app import app
+    from ..commands import archive_jobs_command
+    from ..db import db
+
+    with app.app_context():
+        migrations.upgrade(db.engine)
+        sizes_before = measure_tables(db.engine, 'jobs')[0]
+    client = app.test_client()
+    before = time_scenarios(client, args.requests)
+
+    started = time.perf_counter()
+    result = app.test_cli_runner().invoke(archive_jobs_command, [
+        '--older-than-days', str(args.older_than_days), '--pause', '0'])
+    if result.exit_code != 0:
+        raise SystemExit(result.output)
+    archive_seconds = time.perf_counter() - started
+    with app.app_context():
+        sizes_after, archive_sizes = measure_tables(db.engine, 'jobs', 'jobs_archive')
+    after = time_scenarios(client, args.requests)
+    with_archive = time_scenarios(client, args.requests, '&include_archived=true')
+
+    def mb(size):
+        return f'{size / 1e6:.1f} MB' if size is not None else 'n/a'
+
+    print(f'Archived postings older than {args.older_than_days} days in {archive_seconds:.1f}s')
+    print(f'jobs: {sizes_before[0]} rows, {mb(sizes_before[1])} -> {sizes_after[0]} rows, {mb(sizes_after[1])}; '
+          f'jobs_archive: {archive_sizes[0]} rows, {mb(archive_sizes[1])}')
+    print(f"{'scenario':<22} {'before p50/p95 ms':>18} {'hot only':>18} {'include_archived':>18}")
+    for name, _ in SCENARIOS:
+        cells = [f'{p50:.2f}/{p95:.2f}' for p50, p95 in (before[name], after[name], with_archive[name])]
+        print(f'{name:<22} {cells[0]:>18} {cells[1]:>18} {cells[2]:>18}')
+
+
+if __name__ == '__main__':
+    main()
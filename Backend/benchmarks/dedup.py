@@ -0,0 +1,145 @@
+"""
+Measure what near-duplicate detection costs at ingest: signing and linking
+a seeded database with 'flask dedup-jobs', reloading the LSH index as a
+worker does at startup, then POST /jobs/bulk throughput with dedup off and
+on. A share of the ingested postings are planted near-duplicates of stored
+ones (reposts, an extra city, an extra tag), and the report shows how many
+were linked, along with index lookup latency and memory.
+
+    python -m Backend.benchmarks.dedup [--rows 1000000] [--ingest 20000] [--planted 0.2]
+    python -m Backend.benchmarks.dedup --database-url sqlite:///bench.db
+
+Without --database-url a throwaway SQLite database is seeded. A database
+given with --database-url gets signatures, duplicate links and the
+ingested rows written to it.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, func, select
+
+from .load import percentile
+from .seed import LOCATIONS, TAGS, JobGenerator, seed
+
+
+def index_bytes(index):
+    """Approximate memory held by a DuplicateIndex: its dicts, signatures, keys and shared buckets."""
+    total = sys.getsizeof(index.signatures) + sys.getsizeof(index._buckets)
+    total += sum(sys.getsizeof(job_pk) + sys.getsizeof(sig) for job_pk, sig in index.signatures.items())
+    total += sum(sys.getsizeof(key) + (sys.getsizeof(bucket) if isinstance(bucket, list) else 0)
+                 for key, bucket in index._buckets.items())
+    return total
+
+
+def planted_duplicate(row, rnd):
+    """A repost of a stored posting, or the same role listed in one more city or with one more tag."""
+    variant = {'title': row.title, 'company': row.company, 'city': row.city, 'country': row.country,
+               'job_type': row.job_type, 'tags': row.tags}
+    kind = rnd.choice(('repost', 'city', 'tag'))
+    if kind == 'city':
+        extra = [city for city in LOCATIONS.get(row.country, ()) if city not in (row.city or '')]
+        if extra:
+            variant['city'] = f'{row.city}, {rnd.choice(extra)}'
+    elif kind == 'tag':
+        extra = [tag for tag in TAGS if tag not in (row.tags or '')]
+        variant['tags'] = f'{row.tags}, {rnd.choice(extra)}'
+    return variant
+
+
+def ingest_payload(stored, count, planted_share, rnd, prefix):
+    """`count` bulk rows, a `planted_share` of them near-duplicates of `stored` rows. Returns (rows, planted)."""
+    generator = JobGenerator(seed=rnd.randint(2, 10 ** 6))
+    rows, planted = [], set()
+    for i in range(count):
+        if rnd.random() < planted_share:
+            row = planted_duplicate(rnd.choice(stored), rnd)
+            planted.add(i)
+        else:
+            row = generator.row(i)
+            row = {name: row[name] for name in ('title', 'company', 'city', 'country', 'job_type', 'tags')}
+        rows.append({**row, 'tags': [tag.strip() for tag in (row['tags'] or '').split(',') if tag.strip()],
+                     'posting_date': time.strftime('%Y-%m-%d'), 'job_id': f'{prefix}-{i}'})
+    return rows, planted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--database-url', help='Seeded database to use (default: seed a temporary one)')
+    parser.add_argument('--rows', type=int, default=1000000, help='Rows to seed the temporary database with')
+    parser.add_argument('--ingest', type=int, default=20000, help='Rows posted to /jobs/bulk per run')
+    parser.add_argument('--planted', type=float, default=0.2, help='Share of ingested rows that are near-duplicates')
+    parser.add_argument('--lookups', type=int, default=5000, help='Timed index lookups')
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_dedup.db')}"
+    if not args.database_url:
+        seed(create_engine(url), args.rows, log=lambda line: None)
+    os.environ['DATABASE_URL'] = url
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+    os.environ['METRICS_ENABLED'] = 'false'
+    os.environ['ADMISSION_ENABLED'] = 'false'
+    from .. import migrations
+    from ..app import app
+    from ..commands import dedup_jobs_command
+    from ..db import db
+    from ..models.job import Job
+    from ..routes.job_routes import _duplicate_index
+    from ..utils.dedup import signature
+
+    with app.app_context():
+        migrations.upgrade(db.engine)
+        stored_rows = db.session.execute(select(func.count()).select_from(Job)).scalar()
+
+    started = time.perf_counter()
+    result = app.test_cli_runner().invoke(dedup_jobs_command, ['--batch-size', '5000'])
+    if result.exit_code != 0:
+        raise SystemExit(result.output)
+    backfill_seconds = time.perf_counter() - started
+    print(f'dedup-jobs: {stored_rows} stored postings signed and linked in {backfill_seconds:.1f}s '
+          f'({stored_rows / backfill_seconds:.0f} rows/s); {result.output.strip().splitlines()[-1]}')
+
+    threshold = _duplicate_index.threshold
+    with app.app_context():
+        started = time.perf_counter()
+        loaded = _duplicate_index.load(db.session)
+        print(f'Index reload: {loaded} canonical postings in {time.perf_counter() - started:.1f}s, '
+              f'~{index_bytes(_duplicate_index) / 1e6:.0f} MB')
+        rnd = random.Random(1)
+        max_id = db.session.execute(select(func.max(Job.id))).scalar()
+        sample = db.session.execute(select(Job.id, Job.title, Job.company, Job.city, Job.country, Job.job_type,
+                                           Job.tags)
+                                    .where(Job.id.in_([rnd.randint(1, max_id) for _ in range(5000)]))).all()
+
+    timings = []
+    for row in sample[:args.lookups]:
+        sig = signature(row.title, row.company, row.city, row.country, row.tags)
+        started = time.perf_counter()
+        _duplicate_index.candidates(sig)
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f'Index lookup: p50 {percentile(timings, 50):.3f} ms  p99 {percentile(timings, 99):.3f} ms')
+
+    client = app.test_client()
+    print(f"{'dedup':<6} {'rows/s':>8} {'planted linked':>15} {'others linked':>14}")
+    rates = {}
+    for name, value in (('off', 0), ('on', threshold)):
+        _duplicate_index.threshold = value
+        rows, planted = ingest_payload(sample, args.ingest, args.planted, rnd, f'dedup-bench-{name}-{time.time_ns()}')
+        started = time.perf_counter()
+        response = client.post('/jobs/bulk', json=rows)
+        elapsed = time.perf_counter() - started
+        results = response.get_json()['results']
+        assert all(item['status'] != 'error' for item in results), [item for item in results if 'errors' in item][:3]
+        linked = {item['index'] for item in results if item.get('duplicate_of') is not None}
+        rates[name] = len(rows) / elapsed
+        print(f'{name:<6} {rates[name]:>8.0f} {len(linked & planted):>7}/{len(planted):<7} '
+              f'{len(linked - planted):>7}/{len(rows) - len(planted):<6}')
+    _duplicate_index.threshold = threshold
+    print(f"Dedup costs {(1 - rates['on'] / rates['off']) * 100:.1f}% of bulk ingest throughput")
+
+
+if __name__ == '__main__':
+    main()
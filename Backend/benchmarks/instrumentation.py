@@ -0,0 +1,83 @@
+"""
+Measure what request metrics cost per request on the hot read endpoints,
+and fail (exit 1) if the overhead across them exceeds a budget, so the
+instrumentation stays cheap enough to leave on in production.
+
+    python -m Backend.benchmarks.instrumentation [--rounds 40] [--budget-pct 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+_db_file = os.path.join(tempfile.mkdtemp(), 'bench_instrumentation.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{_db_file}'
+os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+os.environ['METRICS_ENABLED'] = 'true'
+os.environ['ADMISSION_ENABLED'] = 'false'
+
+from ..app import app  # noqa: E402
+from ..db import db  # noqa: E402
+from ..metrics import request_metrics  # noqa: E402
+from ..models.job import Job  # noqa: E402
+
+PATHS = ('/jobs?per_page=10', '/jobs?per_page=100&cursor=', '/jobs/1', '/jobs/500?fields=title,company')
+
+
+def seed(rows=1000):
+    db.create_all()
+    db.session.add_all(
+        Job(title=f'Pricing Actuary {i}', company=f'Company {i % 50}', city='London, Manchester',
+            country='United Kingdom', posting_date=date(2024, 1, 1) + timedelta(days=i % 365),
+            job_type='Full-Time', tags='Pricing, Python, R, SQL', link=f'https://example.com/{i}', job_id=str(i))
+        for i in range(rows))
+    db.session.commit()
+
+
+def time_round(client, path, requests):
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get(path)
+    return (time.perf_counter() - started) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=40)
+    parser.add_argument('--requests', type=int, default=50, help='Requests per round')
+    parser.add_argument('--budget-pct', type=float, default=5.0, help='Allowed added time, as a share of request time')
+    args = parser.parse_args()
+
+    with app.app_context():
+        seed()
+    client = app.test_client()
+    instrumented = request_metrics.blueprints
+    assert 'Server-Timing' in client.get(PATHS[0]).headers, 'metrics are not enabled'
+
+    print(f"{'path':<32} {'off ms':>8} {'on ms':>8} {'overhead us':>12} {'%':>7}")
+    total_off = total_on = 0
+    for path in PATHS:
+        off, on = [], []
+        # Interleave rounds, alternating which side goes first, so drift
+        # (caches, CPU frequency) hits both sides equally
+        for i in range(args.rounds):
+            sides = [((), off), (instrumented, on)]
+            for blueprints, timings in (sides if i % 2 else sides[::-1]):
+                request_metrics.blueprints = blueprints
+                timings.append(time_round(client, path, args.requests))
+        off_ms, on_ms = statistics.median(off), statistics.median(on)
+        total_off += off_ms
+        total_on += on_ms
+        print(f'{path:<32} {off_ms:>8.3f} {on_ms:>8.3f} {(on_ms - off_ms) * 1000:>+12.1f} '
+              f'{(on_ms / off_ms - 1) * 100:>+6.1f}%')
+
+    overhead = (total_on / total_off - 1) * 100
+    print(f'Overall overhead: {overhead:+.1f}% (budget {args.budget_pct:g}%)')
+    if overhead > args.budget_pct:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""
+Load-test the job API: every get_jobs filter/sort/pagination combination
+(including deep pages), single-job reads, search, facets and the write
+endpoints, each under concurrency. Reports p50/p95/p99 latency, throughput
+and SQL statements per request as JSON, and can diff against an earlier run.
+
+    python -m Backend.benchmarks.load --database-url sqlite:///bench.db [--concurrency 8] [--requests 20]
+        [--match REGEX] [--output results.json] [--compare baseline.json]
+
+Seed the database first with Backend.benchmarks.seed. The app runs in-process
+with the response cache off (--cache keeps it) so statements can be counted;
+--url drives a running server instead, without statement counts.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+from ..utils.pagination import encode_cursor
+
+JOB_TYPES = (None, 'Contract')
+LOCATIONS = (None, 'London')
+TAG_FILTERS = ((), (('Pricing',), 'any'), (('Pricing', 'Python'), 'any'), (('Pricing', 'Python'), 'all'))
+SORTS = ('posting_date_desc', 'posting_date_asc')
+PAGINATION = ('page_1', 'deep_page', 'cursor_first', 'cursor_deep')
+PER_PAGE = (10, 100)
+
+
+class InProcessClient:
+    """Calls the app through Flask's test client and counts SQL statements per request."""
+
+    def __init__(self, app, db):
+        from sqlalchemy import event
+
+        self.app = app
+        self._local = threading.local()
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self._local.statements = getattr(self._local, 'statements', 0) + 1
+
+    def request(self, method, path, body=None):
+        if not hasattr(self._local, 'client'):
+            self._local.client = self.app.test_client()
+        self._local.statements = 0
+        response = self._local.client.open(path, method=method, json=body)
+        return response.status_code, response.get_json(silent=True), self._local.statements
+
+
+class HttpClient:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request) as response:
+                status, payload = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, payload = e.code, e.read()
+        try:
+            return status, json.loads(payload), None
+        except ValueError:
+            return status, None, None
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))]
+
+
+def run_scenario(client, make_request, requests, concurrency):
+    """Issue `requests` calls built by make_request(i) on `concurrency` threads and summarize them."""
+    def one(i):
+        method, path, body = make_request(i)
+        started = time.perf_counter()
+        status, _, statements = client.request(method, path, body)
+        return (time.perf_counter() - started) * 1000, status, statements
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+    latencies = [latency for latency, _, _ in results]
+    statements = [count for _, _, count in results if count is not None]
+    statuses = {}
+    for _, status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        'requests': requests,
+        'errors': sum(1 for _, status, _ in results if status >= 500),
+        'status': statuses,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'throughput_rps': round(requests / wall, 1),
+        'sql_per_request': round(sum(statements) / len(statements), 2) if statements else None,
+    }
+
+
+def list_params(job_type, location, tag_filter, sort, per_page):
+    params = [('sort', sort), ('per_page', per_page)]
+    if job_type:
+        params.append(('job_type', job_type))
+    if location:
+        params.append(('location', location))
+    if tag_filter:
+        tags, mode = tag_filter
+        params += [('tag', tag) for tag in tags] + [('tag_mode', mode)]
+    return params
+
+
+def list_scenarios(client, seen_ids):
+    """Yield (name, make_request) for every get_jobs combination, resolving deep pages up front."""
+    for job_type, location, tag_filter, sort, per_page in itertools.product(
+            JOB_TYPES, LOCATIONS, TAG_FILTERS, SORTS, PER_PAGE):
+        params = list_params(job_type, location, tag_filter, sort, per_page)
+        status, first, _ = client.request('GET', '/jobs?' + urlencode(params))
+        if status != 200:
+            raise RuntimeError(f'GET /jobs?{urlencode(params)} returned {status}')
+        seen_ids.update(job['id'] for job in first['jobs'])
+        deep_page = max(1, first['meta']['total_pages'] // 2)
+        _, deep, _ = client.request('GET', '/jobs?' + urlencode(params + [('page', deep_page)]))
+        # A cursor that resumes where the deep page ends, so keyset and OFFSET cover the same rows
+        last = deep['jobs'][-1] if deep['jobs'] else None
+        deep_cursor = encode_cursor(datetime.strptime(last['posting_date'], '%Y-%m-%d').date(),
+                                    last['id'], 'next') if last else ''
+
+        tags = '+'.join(tag_filter[0]) + '/' + tag_filter[1] if tag_filter else None
+        label = ','.join(f'{key}={value}' for key, value in (
+            ('job_type', job_type), ('location', location), ('tag', tags),
+            ('sort', sort.replace('posting_date_', '')), ('per_page', per_page)) if value)
+        variants = {
+            'page_1': params + [('page', 1)],
+            'deep_page': params + [('page', deep_page)],
+            'cursor_first': params + [('cursor', '')],
+            'cursor_deep': params + [('cursor', deep_cursor)],
+        }
+        for mode in PAGINATION:
+            path = '/jobs?' + urlencode(variants[mode])
+            yield f'get_jobs[{label},{mode}]', lambda i, path=path: ('GET', path, None)
+
+
+def new_job(i):
+    return {'title': f'Load Test Actuary {i}', 'company': 'Benchmark Re', 'city': 'London, Leeds',
+            'country': 'United Kingdom', 'posting_date': datetime.now().strftime('%Y-%m-%d'),
+            'job_type': 'Contract', 'tags': ['Pricing', 'Python']}
+
+
+def run(client, requests, concurrency, match=None):
+    seen_ids = set()
+    scenarios = list(list_scenarios(client, seen_ids))
+    ids = sorted(seen_ids)
+    rnd = random.Random(1)
+    scenarios += [
+        ('get_job', lambda i: ('GET', f'/jobs/{rnd.choice(ids)}', None)),
+        ('get_job[fields=title,company]', lambda i: ('GET', f'/jobs/{rnd.choice(ids)}?fields=title,company', None)),
+        ('get_job[missing]', lambda i: ('GET', '/jobs/0', None)),
+        ('search[q=pricing]', lambda i: ('GET', '/jobs/search?q=pricing', None)),
+        ('search[q=python reserving]', lambda i: ('GET', '/jobs/search?q=python+reserving', None)),
+        ('facets', lambda i: ('GET', '/jobs/facets', None)),
+        ('facets[job_type=Contract,tag=Pricing]', lambda i: ('GET', '/jobs/facets?job_type=Contract&tag=Pricing', None)),
+    ]
+
+    results = {}
+    for name, make_request in scenarios:
+        if match and not re.search(match, name):
+            continue
+        results[name] = run_scenario(client, make_request, requests, concurrency)
+
+    # Writes last, on jobs the run creates itself: create, then update and delete those
+    if not match or re.search(match, 'create_job update_job delete_job'):
+        created = []
+        lock = threading.Lock()
+
+        class Recorder:
+            def request(self, method, path, body=None):
+                status, payload, statements = client.request(method, path, body)
+                if status == 201:
+                    with lock:
+                        created.append(payload['id'])
+                return status, payload, statements
+
+        results['create_job'] = run_scenario(Recorder(), lambda i: ('POST', '/jobs', new_job(i)), requests, concurrency)
+        targets = list(created)
+        if targets:
+            results['update_job'] = run_scenario(
+                client, lambda i: ('PUT', f'/jobs/{targets[i]}', {**new_job(i), 'tags': ['Reserving', 'R']}),
+                len(targets), concurrency)
+            results['delete_job'] = run_scenario(
+                client, lambda i: ('DELETE', f'/jobs/{targets[i]}', None), len(targets), concurrency)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current):
+    """Print p95/throughput changes for scenarios present in both runs, worst p95 regression first."""
+    rows = []
+    for name, now in current['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if before:
+            rows.append((now['p95_ms'] / before['p95_ms'] - 1 if before['p95_ms'] else 0, name, before, now))
+    print(f"{'p95 change':>10} {'p95 ms (before -> after)':>26} {'rps (before -> after)':>24}  scenario")
+    for change, name, before, now in sorted(rows, reverse=True):
+        print(f"{change:>+10.1%} {before['p95_ms']:>12.2f} -> {now['p95_ms']:<10.2f} "
+              f"{before['throughput_rps']:>10.1f} -> {now['throughput_rps']:<10.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--database-url', help='Database to load-test in-process (seed it first)')
+    parser.add_argument('--url', help='Base URL of a running server to load-test instead')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=20, help='Requests per scenario')
+    parser.add_argument('--match', help='Only run scenarios whose name matches this regex')
+    parser.add_argument('--cache', action='store_true', help='Keep the response cache on (in-process mode)')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    parser.add_argument('--compare', help='Earlier JSON report to print changes against')
+    args = parser.parse_args()
+    if bool(args.database_url) == bool(args.url):
+        parser.error('pass exactly one of --database-url or --url')
+
+    if args.url:
+        client = HttpClient(args.url)
+        target = args.url
+    else:
+        os.environ['DATABASE_URL'] = args.database_url
+        if not args.cache:
+            os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+        # Measure the queries themselves, including deep OFFSET pages, without shedding
+        os.environ['ADMISSION_ENABLED'] = 'false'
+        os.environ.setdefault('MAX_OFFSET', str(10 ** 9))
+        from ..app import app
+        from ..db import db
+
+        client = InProcessClient(app, db)
+        target = re.sub(r'//[^@/]*@', '//', args.database_url)
+
+    started = time.perf_counter()
+    scenarios = run(client, args.requests, args.concurrency, args.match)
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'target': target,
+            'concurrency': args.concurrency,
+            'requests_per_scenario': args.requests,
+            'response_cache': args.cache or bool(args.url),
+            'python': platform.python_version(),
+            'seconds': round(time.perf_counter() - started, 1),
+        },
+        'scenarios': scenarios,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
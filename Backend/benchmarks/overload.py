@@ -0,0 +1,138 @@
+"""
+Drive the job API at its normal concurrency and then at 10x, with admission
+control off and on. Reports p50/p99 latency of the requests that were
+served, per cost class, and how many were shed with 429/503.
+
+    python -m Backend.benchmarks.overload [--rows 100000] [--clients 4] [--overload 10] [--seconds 10]
+    python -m Backend.benchmarks.overload --database-url sqlite:///bench.db
+
+Without --database-url a throwaway SQLite database is seeded. Every client
+has its own address, so the per-client rate limit only bites on the greedy
+client that shares one address across several threads. The concurrency
+limits default to the baseline client count, as they would be sized to the
+connection pool in production. Rejected clients back off for --backoff-ms
+instead of honouring Retry-After, to keep the offered load at 10x.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+from sqlalchemy import create_engine
+
+from .load import percentile
+from .seed import seed
+
+# (class, share of requests, path template); {id} is a random job id
+MIX = (
+    ('cheap', 50, '/jobs/{id}'),
+    ('cheap', 15, '/suggest?field=title&prefix=An'),
+    ('list', 20, '/jobs?per_page=20&job_type=Contract'),
+    ('list', 5, '/jobs?per_page=20&location=London'),
+    ('expensive', 5, '/jobs?per_page=20&include_total=true'),
+    ('expensive', 5, '/jobs?per_page=20&page=60'),
+)
+
+
+def drive(app, clients, seconds, max_id, backoff, greedy_threads=0):
+    """Run `clients` closed-loop clients (plus greedy ones sharing an address) and collect their results."""
+    results = defaultdict(list)
+    statuses = Counter()
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+    weights = [share for _, share, _ in MIX]
+
+    def client(address, seed_value, label=None):
+        rnd = random.Random(seed_value)
+        test_client = app.test_client()
+        while time.monotonic() < deadline:
+            cost_class, _, template = rnd.choices(MIX, weights)[0]
+            started = time.perf_counter()
+            response = test_client.get(template.format(id=rnd.randint(1, max_id)),
+                                       environ_base={'REMOTE_ADDR': address})
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                statuses[(label or cost_class, response.status_code)] += 1
+                if response.status_code in (200, 404):
+                    results[label or cost_class].append(elapsed)
+            if response.status_code in (429, 503):
+                time.sleep(backoff)
+
+    threads = [threading.Thread(target=client, args=(f'10.0.{i // 250}.{i % 250 + 1}', i))
+               for i in range(clients)]
+    threads += [threading.Thread(target=client, args=('10.255.0.1', 10000 + i, 'greedy'))
+                for i in range(greedy_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, statuses
+
+
+def report(name, results, statuses, seconds):
+    served = sum(len(timings) for timings in results.values())
+    print(f'{name}: {served / seconds:.0f} req/s served')
+    for label in ('cheap', 'list', 'expensive', 'greedy'):
+        timings = results.get(label, [])
+        shed = {status: count for (row, status), count in statuses.items() if row == label and status in (429, 503)}
+        if not timings and not shed:
+            continue
+        latency = (f'p50 {percentile(timings, 50):7.1f} ms  p99 {percentile(timings, 99):7.1f} ms'
+                   if timings else f"{'no requests served':>32}")
+        print(f'  {label:<10} {len(timings):>6} served  {latency}  shed '
+              + (', '.join(f'{count} x {status}' for status, count in sorted(shed.items())) or '0'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--database-url', help='Seeded database to drive (default: seed a temporary one)')
+    parser.add_argument('--rows', type=int, default=100000, help='Rows to seed the temporary database with')
+    parser.add_argument('--clients', type=int, default=4, help='Concurrent clients at normal load')
+    parser.add_argument('--overload', type=int, default=10, help='Multiple of --clients to overload with')
+    parser.add_argument('--seconds', type=float, default=10, help='Duration of each run')
+    parser.add_argument('--backoff-ms', type=float, default=20, help='Pause after a 429/503 before the next request')
+    parser.add_argument('--greedy-threads', type=int, default=4,
+                        help='Threads of one client that ignores the rate limit, in the overload runs')
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_overload.db')}"
+    if not args.database_url:
+        seed(create_engine(url), args.rows, log=lambda line: None)
+    os.environ['DATABASE_URL'] = url
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+    os.environ['METRICS_ENABLED'] = 'false'
+    os.environ.setdefault('ADMISSION_CONCURRENCY', f'cheap={args.clients},list={max(1, args.clients // 2)},'
+                                                   f'expensive=1,write=1')
+    from sqlalchemy import func, select
+
+    from ..admission import admission_control
+    from ..app import app
+    from ..db import db
+    from ..models.job import Job
+    from ..routes.job_routes import _suggest_index
+
+    with app.app_context():
+        max_id = db.session.execute(select(func.max(Job.id))).scalar()
+        _suggest_index.suggest('title', '')
+    backoff = args.backoff_ms / 1000
+    overload = args.clients * args.overload
+
+    admission_control.enabled = False
+    runs = [(f'{args.clients} clients', drive(app, args.clients, args.seconds, max_id, backoff))]
+    runs.append((f'{overload} clients, admission off',
+                 drive(app, overload, args.seconds, max_id, backoff, args.greedy_threads)))
+    admission_control.enabled = True
+    runs.append((f'{overload} clients, admission on',
+                 drive(app, overload, args.seconds, max_id, backoff, args.greedy_threads)))
+
+    print(f"Admission limits {os.environ['ADMISSION_CONCURRENCY']}; "
+          f'{app.config["RATE_LIMIT_PER_SECOND"]:g} tokens/s per client')
+    for name, (results, statuses) in runs:
+        report(name, results, statuses, args.seconds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Fill a jobs database with synthetic postings for load testing: skewed
+job_type, country/city (some multi-city), company and tag distributions
+shaped like the scraped data, with recent posting dates more common.
+
+    python -m Backend.benchmarks.seed --database-url sqlite:///bench.db --rows 10000 [--seed 1]
+
+Rows are appended after any existing ones, and the tag and location indexes,
+facet summary and search index are filled in alongside, as the write paths
+would.
+"""
+import argparse
+import random
+import time
+from collections import Counter
+from datetime import date, timedelta
+from itertools import accumulate
+
+from sqlalchemy import create_engine, func, insert, select
+
+from .. import migrations
+from ..models.job import Job
+from ..models.job_location import job_locations, locations as location_table
+from ..models.tag import Tag, job_tags
+from ..utils import facets
+from ..utils.locations import location_keys
+from ..utils.search import backend_for_dialect
+from ..utils.tags import tag_key
+
+JOB_TYPES = (('Full-Time', 80), ('Contract', 10), ('Part-Time', 6), ('Internship', 4))
+LOCATIONS = {
+    'United States': ('New York', 'Chicago', 'Hartford', 'Boston', 'Des Moines', 'Remote'),
+    'United Kingdom': ('London', 'Manchester', 'Edinburgh', 'Leeds', 'Birmingham'),
+    'Canada': ('Toronto', 'Montreal', 'Waterloo'),
+    'India': ('Bengaluru', 'Mumbai', 'Gurugram', 'Noida'),
+    'Australia': ('Sydney', 'Melbourne'),
+    'Germany': ('Munich', 'Cologne'),
+    'Ireland': ('Dublin',),
+    'Switzerland': ('Zurich',),
+    'Singapore': ('Singapore',),
+    'Bermuda': ('Hamilton',),
+}
+TAGS = ('Pricing', 'Reserving', 'Life', 'Health', 'Pensions', 'Property & Casualty', 'Reinsurance', 'Modelling',
+        'Python', 'R', 'SQL', 'Microsoft Excel', 'VBA', 'Prophet', 'IFRS 17', 'Solvency II', 'Capital',
+        'Experience Analysis', 'Reporting', 'Predictive Analytics', 'Machine Learning', 'Risk Management',
+        'Actuary (Fellow)', 'Actuary (Associate)', 'Actuarial Analyst', 'Senior Actuary', 'Entry Level',
+        'Student', 'Consulting', 'Insurance', 'Investments', 'ALM', 'Valuation', 'Underwriting', 'Cyber',
+        'Climate', 'Annuities', 'Group Benefits', 'Workers Compensation', 'Catastrophe Modelling')
+ROLES = ('Pricing Actuary', 'Reserving Actuary', 'Actuarial Analyst', 'Senior Actuarial Analyst', 'Chief Actuary',
+         'Capital Modelling Actuary', 'Valuation Actuary', 'Actuarial Intern', 'Pensions Consultant',
+         'Head of Pricing', 'Data Scientist', 'Risk Actuary')
+LEVELS = ('', 'Senior ', 'Lead ', 'Associate ', 'Assistant ')
+DAYS = 730
+
+
+def zipf_weights(n, s=1.1):
+    return list(accumulate(1 / (rank ** s) for rank in range(1, n + 1)))
+
+
+class JobGenerator:
+    """Deterministic stream of synthetic job rows for a given seed."""
+
+    def __init__(self, seed=1, companies=2000):
+        self.random = random.Random(seed)
+        self.companies = [f'{self.random.choice(("Global", "United", "Northern", "Pacific", "Summit"))} '
+                          f'{self.random.choice(("Re", "Life", "Mutual", "Insurance", "Actuarial", "Partners"))} {i}'
+                          for i in range(companies)]
+        self.company_weights = zipf_weights(companies)
+        self.countries = list(LOCATIONS)
+        self.country_weights = zipf_weights(len(self.countries), 1.3)
+        self.tag_weights = zipf_weights(len(TAGS), 0.9)
+        self.job_types = [name for name, _ in JOB_TYPES]
+        self.job_type_weights = list(accumulate(weight for _, weight in JOB_TYPES))
+
+    def row(self, pk):
+        rnd = self.random
+        country = rnd.choices(self.countries, cum_weights=self.country_weights)[0]
+        cities = LOCATIONS[country]
+        # About one posting in seven lists several cities, comma-joined like the scraper stores them
+        n_cities = rnd.randint(2, min(3, len(cities))) if len(cities) > 1 and rnd.random() < 0.15 else 1
+        tags = set(rnd.choices(TAGS, cum_weights=self.tag_weights, k=rnd.randint(2, 10)))
+        # Skew towards recent postings, like a live board
+        age = min(int(rnd.expovariate(1 / 90)), DAYS)
+        return {
+            'id': pk,
+            'title': f'{rnd.choice(LEVELS)}{rnd.choice(ROLES)}',
+            'company': rnd.choices(self.companies, cum_weights=self.company_weights)[0],
+            'city': ', '.join(rnd.sample(cities, n_cities)),
+            'country': country,
+            'posting_date': date.today() - timedelta(days=age),
+            'job_type': rnd.choices(self.job_types, cum_weights=self.job_type_weights)[0],
+            'tags': ', '.join(sorted(tags)),
+            'link': f'https://example.com/jobs/{pk}',
+            'job_id': f'bench-{pk}',
+        }
+
+
+def seed(engine, rows, seed=1, chunk_size=10000, log=print):
+    """Append `rows` synthetic jobs with their tag and location links, facet counts and search rows. Returns rows/s."""
+    migrations.upgrade(engine)
+    generator = JobGenerator(seed)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        first_pk = (conn.execute(select(func.max(Job.id))).scalar() or 0) + 1
+        keys = [tag_key(name) for name in TAGS]
+        existing = set(conn.execute(select(Tag.name)).scalars())
+        missing = [{'name': key} for key in keys if key not in existing]
+        if missing:
+            conn.execute(insert(Tag.__table__), missing)
+        tag_ids = dict(conn.execute(select(Tag.name, Tag.id).where(Tag.name.in_(keys))).all())
+
+    deltas = Counter()
+    seen_locations = set()
+    for offset in range(0, rows, chunk_size):
+        batch = [generator.row(first_pk + offset + i) for i in range(min(chunk_size, rows - offset))]
+        links = [{'job_id': row['id'], 'tag_id': tag_ids[tag_key(name)]}
+                 for row in batch for name in row['tags'].split(', ')]
+        locations = [{'job_id': row['id'], 'location': key}
+                     for row in batch for key in location_keys(row['city'], row['country'])]
+        with engine.begin() as conn:
+            conn.execute(insert(Job.__table__), batch)
+            conn.execute(insert(job_tags), links)
+            conn.execute(insert(job_locations), locations)
+        for row in batch:
+            deltas.update(facets.facet_rows(row['job_type'], row['country'], row['city'], row['tags']))
+        seen_locations.update(row['location'] for row in locations)
+        done = offset + len(batch)
+        log(f'{done}/{rows} rows ({done / (time.perf_counter() - started):.0f} rows/s)')
+
+    with engine.begin() as conn:
+        facets.apply_delta(deltas, conn)
+        seen_locations -= set(conn.execute(select(location_table.c.location)).scalars())
+        if seen_locations:
+            conn.execute(insert(location_table), [{'location': key} for key in sorted(seen_locations)])
+        search = backend_for_dialect(conn.dialect.name)
+        # SQLite's FTS5 table is rebuilt from jobs; MySQL's FULLTEXT index keeps itself
+        if conn.dialect.name == 'sqlite' and search is not None:
+            search.create_index(conn)
+    return rows / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--rows', type=int, default=10000, help='e.g. 10000, 1000000 or 10000000')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    rate = seed(engine, args.rows, args.seed, args.chunk_size)
+    print(f'Seeded {args.rows} jobs at {rate:.0f} rows/s')
+
+
+if __name__ == '__main__':
+    main()
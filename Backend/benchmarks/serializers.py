@@ -0,0 +1,65 @@
+"""
+Compare the ORM + marshmallow list path with the tuple + compiled serializer
+path at 10/100/1000 rows per page, and check both produce identical JSON.
+
+    python -m Backend.benchmarks.serializers [--repeat 200]
+"""
+import argparse
+import os
+import tempfile
+import timeit
+from datetime import date, timedelta
+
+_db_file = os.path.join(tempfile.mkdtemp(), 'bench_serializers.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{_db_file}'
+
+from flask import json  # noqa: E402
+
+from ..app import app  # noqa: E402
+from ..db import db  # noqa: E402
+from ..models.job import Job  # noqa: E402
+from ..routes.job_routes import jobs_schema  # noqa: E402
+from ..utils.serializers import JOB_FIELDS, lean_query  # noqa: E402
+
+PAGE_SIZES = (10, 100, 1000)
+
+
+def seed(rows=1000):
+    db.create_all()
+    db.session.add_all(
+        Job(title=f'Pricing Actuary {i}', company=f'Company {i % 50}', city='London, Manchester',
+            country='United Kingdom', posting_date=date(2024, 1, 1) + timedelta(days=i % 365),
+            job_type='Full-Time', tags='Pricing, Python, R, SQL', link=f'https://example.com/{i}', job_id=str(i))
+        for i in range(rows))
+    db.session.commit()
+
+
+def orm_page(per_page):
+    db.session.expunge_all()
+    return json.dumps(jobs_schema.dump(Job.query.order_by(Job.id).limit(per_page).all()))
+
+
+def lean_page(per_page, fields=JOB_FIELDS):
+    lean, serialize = lean_query(Job.query.order_by(Job.id), fields)
+    return json.dumps([serialize(row) for row in lean.limit(per_page).all()])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    with app.app_context():
+        seed(max(PAGE_SIZES))
+        print(f"{'rows':>6} {'orm+marshmallow ms':>20} {'lean ms':>10} {'lean title,company,city ms':>28} {'speedup':>8}")
+        for per_page in PAGE_SIZES:
+            assert orm_page(per_page) == lean_page(per_page), 'lean serializer output differs from JobSchema'
+            orm = timeit.timeit(lambda: orm_page(per_page), number=args.repeat) / args.repeat * 1000
+            lean = timeit.timeit(lambda: lean_page(per_page), number=args.repeat) / args.repeat * 1000
+            narrow = timeit.timeit(lambda: lean_page(per_page, ('title', 'company', 'city')),
+                                   number=args.repeat) / args.repeat * 1000
+            print(f'{per_page:>6} {orm:>20.3f} {lean:>10.3f} {narrow:>28.3f} {orm / lean:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Measure GET /suggest on a seeded database: index build time, then p50/p99
+latency of the in-memory lookup and of the endpoint for prefixes typed one
+character at a time, with writes landing in between. Exits 1 if the
+endpoint's p99 is over budget.
+
+    python -m Backend.benchmarks.suggest --database-url sqlite:///bench.db [--requests 20000] [--budget-ms 1]
+
+Seed the database first with Backend.benchmarks.seed (--rows 1000000 for the
+1M-posting target).
+"""
+import argparse
+import os
+import random
+import time
+
+from .load import new_job, percentile
+
+
+def typed_prefixes(values, rnd, count):
+    """Prefixes of real values, 1 to 6 characters long, as a user would type them."""
+    values = [value for value in values if value]
+    for _ in range(count):
+        value = rnd.choice(values)
+        yield value[:rnd.randint(1, min(6, len(value)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--write-every', type=int, default=200, help='Create a job after this many lookups')
+    parser.add_argument('--budget-ms', type=float, default=1.0, help='Allowed endpoint p99')
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+    os.environ['METRICS_ENABLED'] = 'false'
+    os.environ['ADMISSION_ENABLED'] = 'false'
+    from ..app import app
+    from ..routes.job_routes import _suggest_index
+    from ..utils.suggest import SUGGEST_FIELDS
+
+    client = app.test_client()
+    started = time.perf_counter()
+    with app.app_context():
+        _suggest_index.suggest('title', '')
+    print(f'Index built in {time.perf_counter() - started:.1f}s: '
+          + ', '.join(f'{len(index.keys)} {field}' for field, index in _suggest_index.fields.items()))
+    _suggest_index.refresh_seconds = float('inf')
+
+    rnd = random.Random(1)
+    queries = [(field, prefix) for field in SUGGEST_FIELDS
+               for prefix in typed_prefixes([value for value, _ in _suggest_index.fields[field].entries.values()],
+                                            rnd, args.requests // len(SUGGEST_FIELDS))]
+    rnd.shuffle(queries)
+
+    lookup, endpoint = [], []
+    for i, (field, prefix) in enumerate(queries):
+        if i % args.write_every == 0:
+            client.post('/jobs', json=new_job(i))
+        t0 = time.perf_counter()
+        response = client.get('/suggest', query_string={'field': field, 'prefix': prefix})
+        t1 = time.perf_counter()
+        with _suggest_index._lock:
+            _suggest_index.fields[field].suggest(prefix, 10)
+        t2 = time.perf_counter()
+        assert response.status_code == 200, response.get_json()
+        endpoint.append((t1 - t0) * 1000)
+        lookup.append((t2 - t1) * 1000)
+
+    for name, timings in (('index lookup', lookup), ('GET /suggest', endpoint)):
+        print(f'{name:<14} p50 {percentile(timings, 50):.3f} ms  p99 {percentile(timings, 99):.3f} ms  '
+              f'max {max(timings):.3f} ms')
+    p99 = percentile(endpoint, 99)
+    print(f'{len(queries)} lookups, {len(queries) // args.write_every} writes; p99 budget {args.budget_ms:g} ms')
+    if p99 > args.budget_ms:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
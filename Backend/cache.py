@@ -0,0 +1,218 @@
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import Response, current_app, request
+from sqlalchemy import event
+
+from .db import RoutingSession, db
+
+
+class LRUCacheBackend:
+    """
+    In-process LRU with a per-entry TTL. The default backend. Its
+    generations are per process too, so writes made elsewhere (the scraper,
+    other workers) show once the TTL expires.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._generations = Counter()
+        self._lock = threading.Lock()
+
+    def generation(self, resource):
+        with self._lock:
+            return self._generations[resource]
+
+    def bump(self, resource):
+        with self._lock:
+            self._generations[resource] += 1
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCacheBackend:
+    """
+    Shared backend for multi-worker deployments; generations are INCR'd
+    counters, so every worker and the scraper retire the same entries.
+    Takes any client exposing redis-py's get/set(ex=)/incr/scan_iter/delete,
+    so tests can pass an in-memory fake.
+    """
+
+    evictions = 0  # Redis evicts on its own; see its INFO stats
+
+    def __init__(self, client, prefix='jobs-cache:'):
+        self.client = client
+        self.prefix = prefix
+
+    def generation(self, resource):
+        return int(self.client.get(f'{self.prefix}generation:{resource}') or 0)
+
+    def bump(self, resource):
+        self.client.incr(f'{self.prefix}generation:{resource}')
+
+    @classmethod
+    def from_url(cls, url):
+        import redis
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        etag, mimetype, body = raw.split(b'\n', 2)
+        return body, mimetype.decode(), etag.decode()
+
+    def set(self, key, value, ttl):
+        body, mimetype, etag = value
+        self.client.set(self.prefix + key, b'\n'.join([etag.encode(), mimetype.encode(), body]), ex=ttl)
+
+    def clear(self, batch_size=500):
+        """Delete this cache's keys only; the Redis database may be shared."""
+        keys = []
+        for key in self.client.scan_iter(match=self.prefix + '*', count=batch_size):
+            keys.append(key)
+            if len(keys) >= batch_size:
+                self.client.delete(*keys)
+                keys = []
+        if keys:
+            self.client.delete(*keys)
+
+
+class ResponseCache:
+    """
+    Caches serialized GET responses keyed on the path, the normalized query
+    string and the current cache generation, and answers If-None-Match with
+    304 using a strong ETag over the cached body.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.ttl = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        kind = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 60)
+        if kind == 'memory':
+            self.backend = LRUCacheBackend(app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+        elif kind == 'redis':
+            self.backend = RedisCacheBackend.from_url(app.config['RESPONSE_CACHE_REDIS_URL'])
+        elif kind == 'none':
+            self.backend = None
+        else:
+            raise ValueError(f'Unknown RESPONSE_CACHE_BACKEND: {kind}')
+        app.extensions['response_cache'] = self
+
+    @property
+    def enabled(self):
+        return self.backend is not None and self.ttl > 0
+
+    def bump(self, resource='jobs'):
+        if self.backend is not None:
+            self.backend.bump(resource)
+
+    def stats(self):
+        return {
+            'backend': type(self.backend).__name__ if self.backend else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.backend.evictions if self.backend else 0,
+        }
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def cached(self, resource='jobs'):
+        """Decorator for GET views whose output depends only on the URL and the resource's generation."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return view(*args, **kwargs)
+
+                key = cache_key(resource, self.backend.generation(resource))
+                entry = self.backend.get(key)
+                hit = entry is not None
+                self._count(hit)
+                if not hit:
+                    response = current_app.make_response(view(*args, **kwargs))
+                    # Errors are not cached so a transient failure doesn't stick
+                    if response.status_code != 200:
+                        return response
+                    body = response.get_data()
+                    entry = (body, response.mimetype, hashlib.sha1(body).hexdigest())
+                    self.backend.set(key, entry, self.ttl)
+
+                body, mimetype, etag = entry
+                response = Response(body, mimetype=mimetype)
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'no-cache'
+                response.headers['X-Cache'] = 'HIT' if hit else 'MISS'
+                return response.make_conditional(request)
+            return wrapper
+        return decorator
+
+
+def cache_key(resource, generation):
+    """Path plus query args sorted by name and value, so parameter order doesn't split entries."""
+    return f'{resource}:{generation}:{request.path}?{urlencode(sorted(request.args.items(multi=True)))}'
+
+
+def bump_generation(resource='jobs'):
+    """
+    Invalidate every cached response for a resource once the request
+    session's transaction commits. Bumping any earlier would let a read in
+    between cache the old rows under the new generation; a rollback bumps
+    nothing.
+    """
+    db.session.info.setdefault('cache_bumps', set()).add(resource)
+
+
+response_cache = ResponseCache()
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _bump_committed(session):
+    for resource in session.info.pop('cache_bumps', ()):
+        response_cache.bump(resource)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _discard_bumps(session):
+    session.info.pop('cache_bumps', None)
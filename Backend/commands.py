@@ -0,0 +1,183 @@
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import select
+
+from .cache import bump_generation
+from .db import db
+from .models.job import Job
+from .models.job_signature import JobSignature
+from .models.tag import Tag, job_tags
+from .models.facet_count import FacetCount
+from .utils.tags import parse_tags, tag_key
+from .utils.search import get_search_backend
+from .utils.query_plans import check_get_jobs_plans
+from .utils import archive, change_log, dedup, facets
+from . import migrations
+
+
+@click.command('backfill-tags')
+@click.option('--batch-size', default=1000, show_default=True, help='Jobs processed per transaction.')
+@with_appcontext
+def backfill_tags_command(batch_size):
+    """Fill the tags/job_tags tables from Job.tags."""
+    tag_ids = {tag.name: tag.id for tag in Tag.query.all()}
+    last_id = 0
+    total = 0
+
+    while True:
+        rows = (db.session.query(Job.id, Job.tags)
+                .filter(Job.id > last_id)
+                .order_by(Job.id)
+                .limit(batch_size)
+                .all())
+        if not rows:
+            break
+
+        links = []
+        for job_pk, tags in rows:
+            for key in map(tag_key, parse_tags(tags)):
+                if key not in tag_ids:
+                    tag = Tag(name=key)
+                    db.session.add(tag)
+                    db.session.flush()
+                    tag_ids[key] = tag.id
+                links.append({'job_id': job_pk, 'tag_id': tag_ids[key]})
+
+        job_pks = [job_pk for job_pk, _ in rows]
+        db.session.execute(job_tags.delete().where(job_tags.c.job_id.in_(job_pks)))
+        if links:
+            db.session.execute(job_tags.insert(), links)
+        db.session.commit()
+
+        last_id = job_pks[-1]
+        total += len(rows)
+        click.echo(f'Back-filled tags for {total} jobs')
+
+    click.echo(f'Done: {total} jobs, {len(tag_ids)} distinct tags')
+
+
+@click.command('init-search')
+@with_appcontext
+def init_search_command():
+    """Create (or rebuild) the full-text index used by GET /jobs/search."""
+    with db.engine.begin() as conn:
+        get_search_backend().create_index(conn)
+    click.echo(f'Search index ready on {db.engine.dialect.name}')
+
+
+@click.command('migrate')
+@with_appcontext
+def migrate_command():
+    """Apply pending schema migrations."""
+    applied = migrations.upgrade(db.engine)
+    if applied:
+        click.echo(f"Applied migrations: {', '.join(str(version) for version in applied)}")
+    else:
+        click.echo('Schema is up to date')
+
+
+@click.command('check-query-plans')
+@with_appcontext
+def check_query_plans_command():
+    """EXPLAIN every get_jobs filter/sort shape and fail if any falls back to a full scan."""
+    failures = check_get_jobs_plans()
+    for label, problems in failures:
+        click.echo(f"FAIL {label}: {'; '.join(problems)}")
+    if failures:
+        raise click.exceptions.Exit(1)
+    click.echo('All get_jobs query shapes use an index')
+
+
+@click.command('rebuild-facets')
+@click.option('--check', is_flag=True, help='Only report drift; exit non-zero if any is found.')
+@click.option('--batch-size', default=1000, show_default=True, help='Summary rows inserted per statement.')
+@with_appcontext
+def rebuild_facets_command(check, batch_size):
+    """Recompute job_facet_counts from the jobs table and repair any drift."""
+    expected = facets.expected_counts()
+    actual = {(row.facet, row.value, row.job_type, row.filter_tag, row.filter_location): row.n
+              for row in FacetCount.query.filter(FacetCount.n != 0)}
+    drifted = [key for key in expected.keys() | actual.keys() if expected.get(key, 0) != actual.get(key, 0)]
+    click.echo(f'{len(drifted)} of {len(expected)} summary rows drifted')
+
+    if check:
+        if drifted:
+            raise click.exceptions.Exit(1)
+        return
+
+    FacetCount.query.delete()
+    rows = [{'facet': facet, 'value': value, 'job_type': job_type, 'filter_tag': filter_tag,
+             'filter_location': filter_location, 'n': n}
+            for (facet, value, job_type, filter_tag, filter_location), n in expected.items()]
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(FacetCount.__table__.insert(), rows[start:start + batch_size])
+    db.session.commit()
+    click.echo(f'Rebuilt {len(rows)} summary rows')
+
+
+@click.command('compact-changes')
+@click.option('--retention-days', type=int, default=None,
+              help='Days to keep delete tombstones (default CHANGE_LOG_RETENTION_DAYS).')
+@click.option('--batch-size', default=1000, show_default=True, help='Log entries deleted per transaction.')
+@with_appcontext
+def compact_changes_command(retention_days, batch_size):
+    """Keep the job change log bounded: drop superseded entries and old tombstones."""
+    if retention_days is None:
+        retention_days = current_app.config['CHANGE_LOG_RETENTION_DAYS']
+    superseded, tombstones = change_log.compact(retention_days, batch_size)
+    click.echo(f'Removed {superseded} superseded entries and {tombstones} tombstones older than {retention_days} days')
+
+
+@click.command('archive-jobs')
+@click.option('--older-than-days', type=int, default=None,
+              help='Archive postings older than this (default JOB_ARCHIVE_AFTER_DAYS).')
+@click.option('--batch-size', default=500, show_default=True, help='Jobs moved per transaction.')
+@click.option('--pause', default=0.05, show_default=True, help='Seconds between batches, so other writers get in.')
+@with_appcontext
+def archive_jobs_command(older_than_days, batch_size, pause):
+    """Move stale postings from jobs to jobs_archive in small batches."""
+    if older_than_days is None:
+        older_than_days = current_app.config['JOB_ARCHIVE_AFTER_DAYS']
+    cutoff = archive.cutoff_for(older_than_days)
+    total = 0
+    while True:
+        moved = archive.archive_batch(cutoff, batch_size)
+        if not moved:
+            break
+        total += moved
+        click.echo(f'Archived {total} jobs posted before {cutoff}')
+        time.sleep(pause)
+    click.echo(f'Done: {total} jobs archived')
+
+
+@click.command('dedup-jobs')
+@click.option('--batch-size', default=1000, show_default=True, help='Jobs processed per transaction.')
+@with_appcontext
+def dedup_jobs_command(batch_size):
+    """Compute signatures for jobs stored without one and link their near-duplicates, oldest first."""
+    index = dedup.DuplicateIndex(threshold=current_app.config['DEDUP_THRESHOLD'])
+    if not index.enabled:
+        click.echo('DEDUP_THRESHOLD is 0; nothing to do')
+        return
+    last_id = 0
+    total = linked = 0
+    while True:
+        rows = db.session.execute(select(Job.id, Job.title, Job.company, Job.city, Job.country, Job.tags)
+                                  .outerjoin(JobSignature, JobSignature.job_id == Job.id)
+                                  .where(Job.id > last_id, JobSignature.job_id.is_(None))
+                                  .order_by(Job.id)
+                                  .limit(batch_size)).all()
+        if not rows:
+            break
+        links = dedup.link_duplicates(index, rows)
+        bump_generation()
+        db.session.commit()
+        last_id = rows[-1].id
+        total += len(rows)
+        linked += sum(1 for canonical in links.values() if canonical is not None)
+        click.echo(f'Checked {total} jobs, {linked} duplicates linked')
+    click.echo(f'Done: {total} jobs checked, {linked} linked to an earlier posting')
+
@@ -1,3 +1,21 @@
+from contextvars import ContextVar
+
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+
+# Name of the replica bind the current request reads from, set by ReplicaRouter.reads
+read_bind = ContextVar('read_bind', default=None)
+
+
+class RoutingSession(Session):
+    """Sends queries to the request's replica bind when one is chosen; flushes always go to the primary."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing:
+            name = read_bind.get()
+            if name is not None:
+                return self._db.engines[name]
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
 
-db = SQLAlchemy()
\ No newline at end of file
+db = SQLAlchemy(session_options={'class_': RoutingSession})
@@ -0,0 +1,211 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from flask import Response, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+slow_query_log = logging.getLogger('Backend.slow_query')
+
+# The current request's measurements. A context variable rather than flask.g,
+# because the engine hooks run for every statement and g's proxy is slow
+_current = ContextVar('request_metrics', default=None)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+ROW_BUCKETS = (0, 1, 10, 25, 50, 100, 250, 1000, 10000)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram keyed by a label tuple, rendered in Prometheus
+    text format. Not locked itself: RequestMetrics holds one lock around all
+    of a request's observations.
+    """
+
+    def __init__(self, name, help, labels, buckets):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, label_values, value):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for label_values, counts, total in series:
+            labels = ','.join(f'{name}="{value}"' for name, value in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total}')
+            lines.append(f'{self.name}_count{{{labels}}} {cumulative}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help, labels):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+
+    def inc(self, label_values, amount=1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        values = sorted(self._values.items())
+        for label_values, value in values:
+            labels = ','.join(f'{name}="{value}"' for name, value in zip(self.labels, label_values))
+            lines.append(f'{self.name}{{{labels}}} {value}')
+        return lines
+
+
+class _TimedJSONProvider(DefaultJSONProvider):
+    """Adds the time spent encoding JSON responses to the request's serialization time."""
+
+    def dumps(self, obj, **kwargs):
+        data = _current.get()
+        if data is None:
+            return super().dumps(obj, **kwargs)
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            data['serialize'] += time.perf_counter() - started
+
+
+class RequestMetrics:
+    """
+    Per-request timings for the job blueprint: wall time, time in the
+    database and number of SQL statements (from engine events), rows
+    returned and serialization time. Exported as Prometheus histograms on
+    /metrics and as a Server-Timing header on each response. Statements
+    slower than SLOW_QUERY_MS are logged to 'Backend.slow_query'.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.slow_query_seconds = None
+        self.blueprints = ('jobs',)
+        self._lock = threading.Lock()
+        self.requests = Counter('http_requests_total', 'Requests by endpoint, method and status.',
+                                ('endpoint', 'method', 'status'))
+        self.duration = Histogram('http_request_duration_seconds', 'Wall time per request.',
+                                  ('endpoint', 'method'), LATENCY_BUCKETS)
+        self.db_time = Histogram('http_request_db_seconds', 'Time spent executing SQL per request.',
+                                 ('endpoint', 'method'), LATENCY_BUCKETS)
+        self.statements = Histogram('http_request_sql_statements', 'SQL statements executed per request.',
+                                    ('endpoint', 'method'), COUNT_BUCKETS)
+        self.rows = Histogram('http_request_rows', 'Rows serialized into the response.',
+                              ('endpoint', 'method'), ROW_BUCKETS)
+        self.serialize = Histogram('http_request_serialize_seconds', 'Time building and encoding the response body.',
+                                   ('endpoint', 'method'), LATENCY_BUCKETS)
+        self.slow_queries = Counter('db_slow_queries_total', 'Statements slower than SLOW_QUERY_MS.', ('endpoint',))
+        self._metrics = (self.requests, self.duration, self.db_time, self.statements, self.rows, self.serialize,
+                         self.slow_queries)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['request_metrics'] = self
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        if not self.enabled:
+            return
+        slow_ms = app.config.get('SLOW_QUERY_MS', 0)
+        self.slow_query_seconds = slow_ms / 1000 if slow_ms else None
+
+        app.json = _TimedJSONProvider(app)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.add_url_rule('/metrics', 'metrics', self.export)
+        # Engine-class listeners see every engine, including replica binds
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    def _start(self):
+        # Always set, so a worker thread never carries over the last request's dict
+        if request.blueprint in self.blueprints:
+            _current.set({'labels': (request.endpoint, request.method), 'started': time.perf_counter(),
+                          'db': 0.0, 'statements': 0, 'rows': 0, 'serialize': 0.0, 'slow': 0,
+                          'slow_query_seconds': self.slow_query_seconds})
+        else:
+            _current.set(None)
+
+    def _finish(self, response):
+        data = _current.get()
+        if data is None:
+            return response
+        _current.set(None)
+        wall = time.perf_counter() - data['started']
+        labels = data['labels']
+        with self._lock:
+            self.requests.inc(labels + (response.status_code,))
+            self.duration.observe(labels, wall)
+            self.db_time.observe(labels, data['db'])
+            self.statements.observe(labels, data['statements'])
+            self.rows.observe(labels, data['rows'])
+            self.serialize.observe(labels, data['serialize'])
+            if data['slow']:
+                self.slow_queries.inc(labels[:1], data['slow'])
+        response.headers['Server-Timing'] = (
+            f'app;dur={wall * 1000:.2f}, db;dur={data["db"] * 1000:.2f};desc="{data["statements"]} queries", '
+            f'ser;dur={data["serialize"] * 1000:.2f}')
+        return response
+
+    def export(self):
+        lines = []
+        with self._lock:
+            for metric in self._metrics:
+                lines += metric.render()
+        return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+
+def serialize_rows(serialize, rows):
+    """Serialize result rows, counting them and the time taken towards the request's metrics."""
+    data = _current.get()
+    if data is None:
+        return [serialize(row) for row in rows]
+    started = time.perf_counter()
+    items = [serialize(row) for row in rows]
+    data['serialize'] += time.perf_counter() - started
+    data['rows'] += len(items)
+    return items
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('metrics_query_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    data = _current.get()
+    if data is None:
+        return
+    data['db'] += elapsed
+    data['statements'] += 1
+    threshold = data['slow_query_seconds']
+    if threshold is not None and elapsed >= threshold:
+        data['slow'] += 1
+        slow_query_log.warning('%.1f ms in %s: %s', elapsed * 1000, data['labels'][0], ' '.join(statement.split())[:1000])
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,70 @@
+"""
+Versioned schema migrations. Each vNNN_*.py module defines VERSION,
+DESCRIPTION and upgrade(conn); applied versions are recorded in
+schema_migrations. Runs on a plain SQLAlchemy connection so the scraper can
+apply the same schema without a Flask app.
+
+Each migration declares the tables and indexes it creates itself, as they
+were at that version, rather than importing the models: a model change must
+not change what an existing migration does. Changes go in a new migration.
+"""
+import importlib
+import pkgutil
+import re
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select
+
+_metadata = MetaData()
+schema_migrations = Table(
+    'schema_migrations', _metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(255)),
+    Column('applied_at', DateTime),
+)
+
+
+def load_migrations():
+    """Return the migration modules in version order."""
+    modules = []
+    for info in pkgutil.iter_modules(__path__):
+        if re.match(r'v\d{3}_', info.name):
+            modules.append(importlib.import_module(f'{__name__}.{info.name}'))
+    return sorted(modules, key=lambda module: module.VERSION)
+
+
+def applied_versions(conn):
+    _metadata.create_all(conn)
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def upgrade(engine):
+    """Apply pending migrations, one transaction each. Returns the versions applied."""
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+    applied = []
+    for module in load_migrations():
+        if module.VERSION in done:
+            continue
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=module.VERSION, description=module.DESCRIPTION, applied_at=datetime.utcnow()))
+        applied.append(module.VERSION)
+    return applied
+
+
+def create_missing_indexes(conn, table, names):
+    """Create the named indexes declared on a model table if the database lacks them."""
+    existing = {index['name'] for index in inspect(conn).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name in names and index.name not in existing:
+            index.create(conn)
+
+
+def drop_indexes(conn, table_name, names):
+    """Drop the named indexes from a table if the database has them."""
+    table = Table(table_name, MetaData(), autoload_with=conn)
+    for index in table.indexes:
+        if index.name in names:
+            index.drop(conn)
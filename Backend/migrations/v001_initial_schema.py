@@ -0,0 +1,81 @@
+from sqlalchemy import (Column, Date, ForeignKey, Index, Integer, MetaData, String, Table, Text, bindparam, delete,
+                        insert, inspect, literal, select, text, update)
+from sqlalchemy.schema import CreateTable
+
+VERSION = 1
+DESCRIPTION = 'jobs (AUTOINCREMENT on SQLite), tags and job_tags tables'
+
+metadata = MetaData()
+jobs = Table(
+    'jobs', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('title', String(255)),
+    Column('company', String(255)),
+    Column('city', String(255)),
+    Column('country', String(255)),
+    Column('posting_date', Date),
+    Column('job_type', String(255)),
+    Column('tags', Text),
+    Column('link', String(255)),
+    Column('job_id', String(50), unique=True),
+    # Archived jobs keep their id, so SQLite must never hand one out again
+    sqlite_autoincrement=True,
+)
+tags = Table(
+    'tags', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('name', String(100), nullable=False, unique=True),
+)
+job_tags = Table(
+    'job_tags', metadata,
+    Column('job_id', Integer, ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_job_tags_tag_job', 'tag_id', 'job_id'),
+)
+
+
+def upgrade(conn):
+    if conn.dialect.name == 'sqlite' and inspect(conn).has_table('jobs'):
+        _add_autoincrement(conn)
+    # checkfirst keeps databases created by the old scraper DDL intact
+    metadata.create_all(conn)
+    _lowercase_tags(conn)
+
+
+def _add_autoincrement(conn):
+    """Rebuild a jobs table created without AUTOINCREMENT by the old app."""
+    created = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'jobs'")).scalar()
+    if 'AUTOINCREMENT' in created.upper():
+        return
+    # SQLite can't add AUTOINCREMENT in place: copy into a new table and swap it in.
+    # Copying the ids sets sqlite_sequence past the highest one.
+    rebuilt = jobs.to_metadata(MetaData(), name='jobs_rebuilt')
+    conn.execute(CreateTable(rebuilt))
+    columns = [column.name for column in jobs.columns]
+    conn.execute(insert(rebuilt).from_select(columns, select(*(jobs.c[name] for name in columns))))
+    conn.execute(text('DROP TABLE jobs'))
+    conn.execute(text('ALTER TABLE jobs_rebuilt RENAME TO jobs'))
+
+
+def _lowercase_tags(conn):
+    """Tags are stored lowercased; merge any created before that which differ only in case."""
+    keep, merged, renamed = {}, {}, []
+    for tag_pk, name in conn.execute(select(tags.c.id, tags.c.name).order_by(tags.c.id)):
+        key = name.lower()
+        if key in keep:
+            merged[tag_pk] = keep[key]
+            continue
+        keep[key] = tag_pk
+        if name != key:
+            renamed.append({'tag_pk': tag_pk, 'key': key})
+
+    for old, new in merged.items():
+        # A job tagged with both spellings keeps a single link
+        conn.execute(insert(job_tags).prefix_with('IGNORE', dialect='mysql').prefix_with('OR IGNORE', dialect='sqlite')
+                     .from_select(['job_id', 'tag_id'],
+                                  select(job_tags.c.job_id, literal(new)).where(job_tags.c.tag_id == old)))
+        conn.execute(delete(job_tags).where(job_tags.c.tag_id == old))
+    if merged:
+        conn.execute(delete(tags).where(tags.c.id.in_(list(merged))))
+    if renamed:
+        conn.execute(update(tags).where(tags.c.id == bindparam('tag_pk')).values(name=bindparam('key')), renamed)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Date, Index, Integer, MetaData, String, Table
+
+from . import create_missing_indexes
+
+VERSION = 2
+DESCRIPTION = 'composite indexes for the get_jobs filters and sorts'
+
+metadata = MetaData()
+jobs = Table(
+    'jobs', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('posting_date', Date),
+    Column('job_type', String(255)),
+    # Optional job_type equality, then ORDER BY posting_date, id
+    Index('ix_jobs_type_date_id', 'job_type', 'posting_date', 'id'),
+    Index('ix_jobs_date_id', 'posting_date', 'id'),
+)
+
+
+def upgrade(conn):
+    create_missing_indexes(conn, jobs, {'ix_jobs_type_date_id', 'ix_jobs_date_id'})
@@ -0,0 +1,16 @@
+from sqlalchemy import inspect, text
+
+VERSION = 3
+DESCRIPTION = 'full-text index for GET /jobs/search'
+
+SEARCH_COLUMNS = 'title, company, tags, city, country'
+
+
+def upgrade(conn):
+    if conn.dialect.name == 'mysql':
+        if not any(index['name'] == 'ft_jobs_search' for index in inspect(conn).get_indexes('jobs')):
+            conn.execute(text(f'ALTER TABLE jobs ADD FULLTEXT INDEX ft_jobs_search ({SEARCH_COLUMNS})'))
+    elif conn.dialect.name == 'sqlite':
+        conn.execute(text(f'CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5({SEARCH_COLUMNS})'))
+        conn.execute(text('DELETE FROM jobs_fts'))
+        conn.execute(text(f'INSERT INTO jobs_fts (rowid, {SEARCH_COLUMNS}) SELECT id, {SEARCH_COLUMNS} FROM jobs'))
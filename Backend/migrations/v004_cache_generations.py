@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, MetaData, String, Table
+
+VERSION = 4
+DESCRIPTION = 'cache_generations counter for response cache invalidation'
+
+metadata = MetaData()
+cache_generations = Table(
+    'cache_generations', metadata,
+    Column('name', String(50), primary_key=True),
+    Column('value', BigInteger, nullable=False, default=0),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn)
+    conn.execute(cache_generations.insert().values(name='jobs', value=0))
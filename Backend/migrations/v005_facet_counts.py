@@ -0,0 +1,58 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, MetaData, String, Table, insert, select
+
+VERSION = 5
+DESCRIPTION = ('job_facet_counts summary table for GET /jobs/facets (fill with flask rebuild-facets), '
+               'and job_locations and locations for the location filter')
+
+metadata = MetaData()
+jobs = Table(
+    'jobs', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('city', String(255)),
+    Column('country', String(255)),
+)
+job_facet_counts = Table(
+    'job_facet_counts', metadata,
+    Column('facet', String(20), primary_key=True),
+    Column('value', String(255), primary_key=True),
+    Column('job_type', String(255), primary_key=True),
+    Column('filter_tag', String(100), primary_key=True),
+    Column('filter_location', String(100), primary_key=True),
+    Column('n', Integer, nullable=False, default=0),
+    Index('ix_job_facet_counts_filter', 'filter_tag', 'filter_location', 'job_type'),
+)
+job_locations = Table(
+    'job_locations', metadata,
+    Column('job_id', Integer, ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    Column('location', String(100), primary_key=True),
+    Index('ix_job_locations_location_job', 'location', 'job_id'),
+)
+locations = Table(
+    'locations', metadata,
+    Column('location', String(100), primary_key=True),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, tables=[job_facet_counts, job_locations, locations])
+    keys = set()
+    rows = []
+    for job_pk, city, country in conn.execute(select(jobs.c.id, jobs.c.city, jobs.c.country)
+                                              .execution_options(yield_per=10000)):
+        rows += [{'job_id': job_pk, 'location': key} for key in _location_keys(city, country)]
+        if len(rows) >= 10000:
+            conn.execute(insert(job_locations), rows)
+            keys.update(row['location'] for row in rows)
+            rows = []
+    if rows:
+        conn.execute(insert(job_locations), rows)
+        keys.update(row['location'] for row in rows)
+    if keys:
+        conn.execute(insert(locations), [{'location': key} for key in sorted(keys)])
+
+
+def _location_keys(city, country):
+    """A job's country and each city of a comma-joined city string, trimmed and lowercased."""
+    cities = [name.strip()[:255] for name in (city or '').split(',') if name.strip()]
+    keys = [(value or '').strip().lower()[:100] for value in [country] + cities]
+    return list(dict.fromkeys(key for key in keys if key))
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, DateTime, MetaData, String, Table
+
+VERSION = 6
+DESCRIPTION = 'listing_cards hashes for incremental scraper runs'
+
+metadata = MetaData()
+listing_cards = Table(
+    'listing_cards', metadata,
+    Column('job_id', String(50), primary_key=True),
+    Column('card_hash', String(40), nullable=False),
+    Column('seen_at', DateTime, nullable=False),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn)
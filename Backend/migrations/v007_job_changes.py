@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, MetaData, String, Table, insert, literal, select
+
+VERSION = 7
+DESCRIPTION = 'job_changes log for GET /jobs/changes, seeded with an insert per existing job'
+
+metadata = MetaData()
+jobs = Table('jobs', metadata, Column('id', Integer, primary_key=True))
+job_changes = Table(
+    'job_changes', metadata,
+    Column('seq', BigInteger().with_variant(Integer, 'sqlite'), primary_key=True, autoincrement=True),
+    Column('job_id', Integer, nullable=False),
+    Column('op', String(10), nullable=False),
+    Column('changed_at', DateTime, nullable=False),
+    Index('ix_job_changes_job_id_seq', 'job_id', 'seq'),
+    sqlite_autoincrement=True,
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, tables=[job_changes])
+    conn.execute(insert(job_changes).from_select(
+        ['job_id', 'op', 'changed_at'],
+        select(jobs.c.id, literal('insert'), literal(datetime.utcnow())).order_by(jobs.c.id)))
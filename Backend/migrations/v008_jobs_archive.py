@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, Text
+
+VERSION = 8
+DESCRIPTION = 'jobs_archive with its tag and location links, for postings moved out of the hot jobs table'
+
+metadata = MetaData()
+tags = Table('tags', metadata, Column('id', Integer, primary_key=True))
+jobs_archive = Table(
+    'jobs_archive', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('title', String(255)),
+    Column('company', String(255)),
+    Column('city', String(255)),
+    Column('country', String(255)),
+    Column('posting_date', Date),
+    Column('job_type', String(255)),
+    Column('tags', Text),
+    Column('link', String(255)),
+    Column('job_id', String(50), unique=True),
+    Column('archived_at', DateTime, nullable=False),
+    Index('ix_jobs_archive_type_date_id', 'job_type', 'posting_date', 'id'),
+    Index('ix_jobs_archive_date_id', 'posting_date', 'id'),
+)
+job_archive_tags = Table(
+    'job_archive_tags', metadata,
+    Column('job_id', Integer, ForeignKey('jobs_archive.id', ondelete='CASCADE'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_job_archive_tags_tag_job', 'tag_id', 'job_id'),
+)
+job_archive_locations = Table(
+    'job_archive_locations', metadata,
+    Column('job_id', Integer, ForeignKey('jobs_archive.id', ondelete='CASCADE'), primary_key=True),
+    Column('location', String(100), primary_key=True),
+    Index('ix_job_archive_locations_location_job', 'location', 'job_id'),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, tables=[jobs_archive, job_archive_tags, job_archive_locations])
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, LargeBinary, MetaData, Table, text
+
+from . import create_missing_indexes
+
+VERSION = 9
+DESCRIPTION = 'jobs.canonical_id and job_signatures for near-duplicate detection'
+
+metadata = MetaData()
+jobs = Table(
+    'jobs', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('posting_date', Date),
+    Column('canonical_id', Integer),
+    # collapse_duplicates=true: canonical_id IS NULL, then ORDER BY posting_date, id
+    Index('ix_jobs_canonical_date_id', 'canonical_id', 'posting_date', 'id'),
+)
+job_signatures = Table(
+    'job_signatures', metadata,
+    Column('job_id', Integer, ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    Column('signature', LargeBinary(264), nullable=False),
+)
+
+
+def upgrade(conn):
+    conn.execute(text('ALTER TABLE jobs ADD COLUMN canonical_id INTEGER'))
+    create_missing_indexes(conn, jobs, {'ix_jobs_canonical_date_id'})
+    metadata.create_all(conn, tables=[job_signatures])
@@ -0,0 +1,13 @@
+from ..db import db
+
+
+class CacheGeneration(db.Model):
+    """
+    Counter bumped by every write to a cached resource. Response cache keys
+    include it, so one increment (from the API or the scraper) retires every
+    cached page at once.
+    """
+    __tablename__ = 'cache_generations'
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
@@ -0,0 +1,22 @@
+from ..db import db
+
+
+class FacetCount(db.Model):
+    """
+    Pre-aggregated job counts for GET /jobs/facets. One row per facet value,
+    split by the job_type filter and by one tag or one location filter;
+    filter_tag and filter_location are '' for the unfiltered totals. Kept
+    current by the write paths and rebuilt by 'flask rebuild-facets'.
+    """
+    __tablename__ = 'job_facet_counts'
+
+    facet = db.Column(db.String(20), primary_key=True)
+    value = db.Column(db.String(255), primary_key=True)
+    job_type = db.Column(db.String(255), primary_key=True)
+    filter_tag = db.Column(db.String(100), primary_key=True)
+    filter_location = db.Column(db.String(100), primary_key=True)
+    n = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_job_facet_counts_filter', 'filter_tag', 'filter_location', 'job_type'),
+    )
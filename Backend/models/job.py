@@ -1,8 +1,19 @@
 from ..db import db
+from .tag import job_tags
 from datetime import datetime
 
 class Job(db.Model):
     __tablename__ = 'jobs'
+    # Match the get_jobs query shapes: optional job_type equality, then
+    # ORDER BY posting_date, id. The location filter goes through job_locations.
+    __table_args__ = (
+        db.Index('ix_jobs_type_date_id', 'job_type', 'posting_date', 'id'),
+        db.Index('ix_jobs_date_id', 'posting_date', 'id'),
+        # collapse_duplicates=true: canonical_id IS NULL, then the same ORDER BY
+        db.Index('ix_jobs_canonical_date_id', 'canonical_id', 'posting_date', 'id'),
+        # Archived jobs keep their id, so SQLite must never hand one out again
+        {'sqlite_autoincrement': True},
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     title = db.Column(db.String(255))
@@ -14,6 +25,10 @@ class Job(db.Model):
     tags = db.Column(db.Text)
     link = db.Column(db.String(255))
     job_id = db.Column(db.String(50), unique=True)
+    # Set on a near-duplicate to the earlier posting it repeats (Backend/utils/dedup.py)
+    canonical_id = db.Column(db.Integer)
+
+    tag_list = db.relationship('Tag', secondary=job_tags, lazy='select')
 
     def __init__(self, **kwargs):
         for key, value in kwargs.items():
@@ -0,0 +1,42 @@
+from ..db import db
+
+# job_tags for archived jobs, so tag filters work the same with include_archived=true
+job_archive_tags = db.Table(
+    'job_archive_tags',
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs_archive.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_job_archive_tags_tag_job', 'tag_id', 'job_id'),
+)
+
+# job_locations for archived jobs, likewise for the location filter
+job_archive_locations = db.Table(
+    'job_archive_locations',
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs_archive.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('location', db.String(100), primary_key=True),
+    db.Index('ix_job_archive_locations_location_job', 'location', 'job_id'),
+)
+
+
+class JobArchive(db.Model):
+    """
+    Cold storage for postings older than JOB_ARCHIVE_AFTER_DAYS, moved here
+    by 'flask archive-jobs'. Rows keep their jobs.id, so GET /jobs/<id> can
+    fall through to this table; it is read-only through the API.
+    """
+    __tablename__ = 'jobs_archive'
+    __table_args__ = (
+        db.Index('ix_jobs_archive_type_date_id', 'job_type', 'posting_date', 'id'),
+        db.Index('ix_jobs_archive_date_id', 'posting_date', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(255))
+    company = db.Column(db.String(255))
+    city = db.Column(db.String(255))
+    country = db.Column(db.String(255))
+    posting_date = db.Column(db.Date)
+    job_type = db.Column(db.String(255))
+    tags = db.Column(db.Text)
+    link = db.Column(db.String(255))
+    job_id = db.Column(db.String(50), unique=True)
+    archived_at = db.Column(db.DateTime, nullable=False)
@@ -0,0 +1,22 @@
+from ..db import db
+
+
+class JobChange(db.Model):
+    """
+    Append-only log of job inserts, updates and deletes for GET
+    /jobs/changes. seq only grows and is the sync token clients resume from.
+    Superseded entries and old tombstones are dropped by 'flask
+    compact-changes'.
+    """
+    __tablename__ = 'job_changes'
+    __table_args__ = (
+        db.Index('ix_job_changes_job_id_seq', 'job_id', 'seq'),
+        # Never hand out a seq again, even after the newest rows are deleted
+        {'sqlite_autoincrement': True},
+    )
+
+    seq = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True, autoincrement=True)
+    # No foreign key: tombstones outlive their job
+    job_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False)
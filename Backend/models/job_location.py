@@ -0,0 +1,20 @@
+from ..db import db
+
+# Inverted index from location to job, like job_tags: the job's country and
+# each city of a multi-city string, as facets.location_key. The location
+# filter is then an index lookup instead of an ILIKE scan.
+job_locations = db.Table(
+    'job_locations',
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('location', db.String(100), primary_key=True),
+    db.Index('ix_job_locations_location_job', 'location', 'job_id'),
+)
+
+# Every location key ever written, a few thousand rows: a substring location
+# filter is matched against these, then looked up in job_locations, rather
+# than scanning every job_locations row. Keys are never removed; one no job
+# uses any more simply finds nothing.
+locations = db.Table(
+    'locations',
+    db.Column('location', db.String(100), primary_key=True),
+)
@@ -0,0 +1,14 @@
+from ..db import db
+
+
+class JobSignature(db.Model):
+    """
+    Near-duplicate signature of each job (Backend/utils/dedup.py): a hash of
+    its normalized company followed by the MinHash of its title, locations
+    and tags. Stored so the in-memory LSH index is reloaded at startup
+    instead of re-hashing every posting.
+    """
+    __tablename__ = 'job_signatures'
+
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+    signature = db.Column(db.LargeBinary(264), nullable=False)
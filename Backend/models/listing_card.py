@@ -0,0 +1,14 @@
+from ..db import db
+
+
+class ListingCard(db.Model):
+    """
+    Content hash of each job's card on the scraper's listing pages. An
+    incremental crawl skips the detail page of a known job unless its card
+    hash has changed since it was last fetched.
+    """
+    __tablename__ = 'listing_cards'
+
+    job_id = db.Column(db.String(50), primary_key=True)
+    card_hash = db.Column(db.String(40), nullable=False)
+    seen_at = db.Column(db.DateTime, nullable=False)
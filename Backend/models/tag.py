@@ -0,0 +1,21 @@
+from ..db import db
+
+# Inverted index from tag to job. Job.tags keeps the display string; these
+# rows exist so tag filters are exact index lookups instead of ILIKE scans.
+job_tags = db.Table(
+    'job_tags',
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_job_tags_tag_job', 'tag_id', 'job_id'),
+)
+
+
+class Tag(db.Model):
+    __tablename__ = 'tags'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    # Lowercased (utils.tags.tag_key), so lookups match the same way on every dialect
+    name = db.Column(db.String(100), nullable=False, unique=True)
+
+    def __repr__(self):
+        return f'<Tag {self.name}>'
@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, request
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+from .db import db, read_bind
+
+log = logging.getLogger(__name__)
+
+STICKY_COOKIE = 'read_primary_until'
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+class ReplicaRouter:
+    """
+    Spreads the reads of views decorated with @replica_router.reads round-robin
+    over the 'replica_N' binds, falling back to the primary when none is
+    healthy. A replica is pinged at most every REPLICA_HEALTH_CHECK_SECONDS,
+    and one that fails a ping or drops a connection mid-request is skipped
+    for REPLICA_RETRY_SECONDS; a request that hit the failure is rerun on the
+    primary. Successful writes set a cookie that keeps that client's reads on
+    the primary for READ_YOUR_WRITES_SECONDS, so it sees its own changes
+    despite replication lag.
+    """
+
+    def __init__(self, app=None):
+        self.replicas = ()
+        self.sticky_seconds = 0
+        self.check_interval = 10
+        self.retry_seconds = 30
+        self._health = {}
+        self._turn = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Call after db.init_app, which creates the bind engines."""
+        app.extensions['replica_router'] = self
+        self.replicas = tuple(sorted(name for name in app.config.get('SQLALCHEMY_BINDS') or {}
+                                     if name.startswith('replica_')))
+        if not self.replicas:
+            return
+        self.sticky_seconds = app.config.get('READ_YOUR_WRITES_SECONDS', 5)
+        self.check_interval = app.config.get('REPLICA_HEALTH_CHECK_SECONDS', 10)
+        self.retry_seconds = app.config.get('REPLICA_RETRY_SECONDS', 30)
+        # [down until, last checked], on the monotonic clock
+        self._health = {name: [0.0, 0.0] for name in self.replicas}
+        with app.app_context():
+            for name in self.replicas:
+                event.listen(db.engines[name], 'handle_error', self._error_handler(name))
+        app.after_request(self._mark_writer)
+
+    def reads(self, view):
+        """Decorator for read-only views: run their queries on a replica unless the client wrote recently."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            name = self._pick() if self.replicas and not self._sticky() else None
+            if name is None:
+                return view(*args, **kwargs)
+            token = read_bind.set(name)
+            try:
+                response = view(*args, **kwargs)
+            finally:
+                read_bind.reset(token)
+            if self._health[name][0] > time.monotonic():
+                # The replica failed under this request (the view has turned that into an error
+                # response); answer from the primary instead
+                db.session.rollback()
+                return view(*args, **kwargs)
+            return response
+        # A read served over POST (e.g. a batch fetch) must not pin the client to the primary
+        wrapper.replica_reads = True
+        return wrapper
+
+    def status(self):
+        now = time.monotonic()
+        return {name: 'down' if down_until > now else 'up' for name, (down_until, _) in self._health.items()}
+
+    def _pick(self):
+        with self._lock:
+            start = self._turn
+            self._turn += 1
+        for offset in range(len(self.replicas)):
+            name = self.replicas[(start + offset) % len(self.replicas)]
+            if self._healthy(name):
+                return name
+        return None
+
+    def _healthy(self, name):
+        now = time.monotonic()
+        health = self._health[name]
+        if health[0] > now:
+            return False
+        if now - health[1] < self.check_interval:
+            return True
+        health[1] = now
+        try:
+            with db.engines[name].connect() as conn:
+                conn.execute(text('SELECT 1'))
+        except DBAPIError as e:
+            # The handle_error hook has usually marked it down already
+            if health[0] <= now:
+                self._mark_down(name, e)
+            return False
+        return True
+
+    def _mark_down(self, name, error):
+        self._health[name][0] = time.monotonic() + self.retry_seconds
+        log.warning('Replica %s is unavailable, skipping it for %ss: %s',
+                    name, self.retry_seconds, error)
+
+    def _error_handler(self, name):
+        def handle_error(context):
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+                self._mark_down(name, context.original_exception)
+        return handle_error
+
+    def _sticky(self):
+        try:
+            return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def _mark_writer(self, response):
+        if request.method not in WRITE_METHODS or response.status_code >= 400 or not self.sticky_seconds:
+            return response
+        if not getattr(current_app.view_functions.get(request.endpoint), 'replica_reads', False):
+            response.set_cookie(STICKY_COOKIE, str(int(time.time()) + self.sticky_seconds + 1),
+                                max_age=self.sticky_seconds + 1, httponly=True, samesite='Lax')
+        return response
+
+
+replica_router = ReplicaRouter()
@@ -1,14 +1,42 @@
-from flask import Blueprint, request, jsonify
-from sqlalchemy import or_, desc, asc
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from sqlalchemy import desc, asc, func, select
 from sqlalchemy.exc import IntegrityError
 from ..db import db
+from ..cache import bump_generation, response_cache
+from ..metrics import serialize_rows
+from ..replicas import replica_router
 from ..models.job import Job
-from marshmallow import Schema, fields, validates, ValidationError, post_load
+from ..models.job_archive import JobArchive, job_archive_locations, job_archive_tags
+from ..models.job_location import job_locations
+from ..models.tag import Tag, job_tags
+from ..config import Config
+from ..utils.pagination import CountCache, InvalidCursor, decode_cursor, encode_cursor, keyset_ranges
+from ..utils.tags import parse_tags, sync_job_tags, tag_key
+from ..utils.search import get_search_backend
+from ..utils import change_log, dedup, facets, suggest
+from ..utils.bulk import upsert_jobs
+from ..utils.locations import location_key, matching_keys, only_match, replace_job_locations
+from ..utils.export import CONTENT_TYPES, ENCODERS, export_query, gzip_chunks, stream_rows
+from ..utils.serializers import InvalidFields, item_etag, lean_query, parse_fields
+from marshmallow import Schema, fields, validates, validates_schema, ValidationError, post_load
+import json
+import time
 import uuid
 from datetime import datetime
 
 job_bp = Blueprint('jobs', __name__)
 
+# Cached totals for cursor mode when the client opts in with include_total=true
+_count_cache = CountCache(ttl=Config.JOB_COUNT_CACHE_TTL)
+_suggest_index = suggest.SuggestIndex(refresh_seconds=Config.SUGGEST_REFRESH_SECONDS)
+_duplicate_index = dedup.DuplicateIndex(threshold=Config.DEDUP_THRESHOLD, refresh_seconds=Config.DEDUP_REFRESH_SECONDS)
+
+# Column widths: an oversized value fails validation for its own row, instead of
+# failing the statement (and a whole bulk chunk) on MySQL strict mode
+MAX_LENGTHS = {'title': 255, 'company': 255, 'city': 255, 'country': 255, 'job_type': 255, 'link': 255}
+MAX_TAG_LENGTH = 100
+
+
 # Marshmallow Schema for Job Validation (Input/Output)
 class JobSchema(Schema):
     
@@ -30,6 +58,17 @@ class JobSchema(Schema):
         if value and value not in ['Full-Time', 'Part-Time', 'Contract', 'Internship']:
             raise ValidationError('Invalid job_type. Must be one of: Full-Time, Part-Time, Contract, Internship')
 
+    @validates_schema
+    def validate_lengths(self, data, **kwargs):
+        errors = {name: [f'Must be at most {limit} characters'] for name, limit in MAX_LENGTHS.items()
+                  if isinstance(data.get(name), str) and len(data[name]) > limit}
+        tags = data.get('tags')
+        names = tags.split(',') if isinstance(tags, str) else tags if isinstance(tags, list) else []
+        if any(len(str(name).strip()) > MAX_TAG_LENGTH for name in names):
+            errors['tags'] = [f'Each tag must be at most {MAX_TAG_LENGTH} characters']
+        if errors:
+            raise ValidationError(errors)
+
     @post_load
     def process_tags(self, data, **kwargs):
         if 'tags' in data and isinstance(data['tags'], list):
@@ -48,45 +87,255 @@ class JobSchema(Schema):
         return data
 
 
+# Bulk rows are upserted on the caller's job_id, and partner feeds carry the posting link
+class BulkJobSchema(JobSchema):
+    job_id = fields.String(required=True, validate=lambda x: 0 < len(x.strip()) <= 50,
+                           error_messages={"required": "job_id is required", "invalid": "job_id must be 1-50 characters"})
+    link = fields.String(allow_none=True)
+
+
 # Instantiate schema for single and multiple jobs
 job_schema = JobSchema()
 jobs_schema = JobSchema(many=True)
+bulk_jobs_schema = BulkJobSchema(many=True)
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+class InvalidBulkPayload(ValueError):
+    pass
+
+
+class InvalidBatch(ValueError):
+    pass
+
+
+def _tag_filter(tags, mode, model=Job):
+    """Match jobs through the job_tags index: any of the tags, or all of them."""
+    links = job_archive_tags if model is JobArchive else job_tags
+    matching = (select(links.c.job_id)
+                .join(Tag, Tag.id == links.c.tag_id)
+                .where(Tag.name.in_([tag_key(name) for name in tags])))
+    if mode == 'all' and len(tags) > 1:
+        matching = (matching.group_by(links.c.job_id)
+                    .having(func.count(links.c.tag_id) == len(tags)))
+    return model.id.in_(matching)
+
+
+def _location_filter(location, model=Job, exact=False):
+    """
+    Match jobs whose country or one of whose cities contains `location`, or
+    with exact=True is it, ignoring case. Matching keys come from the small
+    locations table, and their jobs from the job_locations index.
+    """
+    links = job_archive_locations if model is JobArchive else job_locations
+    keys = [location_key(location)] if exact else matching_keys(location)
+    return model.id.in_(select(links.c.job_id).where(links.c.location.in_(keys)))
+
+
+def _filtered_query(args, model=Job):
+    """Apply the job_type/location/tag filters shared by the list endpoints, to jobs or jobs_archive."""
+    job_type = args.get('job_type')
+    location = args.get('location')
+    tags = parse_tags(args.getlist('tag'))
+    tag_mode = args.get('tag_mode', 'any')
+
+    if tag_mode not in ('any', 'all'):
+        raise InvalidFilter('Invalid tag_mode parameter. Supported: any, all')
+
+    query = model.query
+
+    if job_type:
+        query = query.filter(model.job_type == job_type)
+
+    if location:
+        query = query.filter(_location_filter(location, model, _location_exact(args)))
+
+    if tags:
+        query = query.filter(_tag_filter(tags, tag_mode, model))
+
+    # Archived postings keep no duplicate links
+    if _collapse_duplicates(args) and model is Job:
+        query = query.filter(Job.canonical_id.is_(None))
+
+    return query
+
+
+def _filter_key(args):
+    return (args.get('job_type'), args.get('location'), _location_exact(args),
+            tuple(sorted(parse_tags(args.getlist('tag')))), args.get('tag_mode', 'any'), _include_archived(args),
+            _collapse_duplicates(args))
+
+
+def _location_exact(args):
+    return args.get('location_exact', '').lower() == 'true'
+
+
+def _include_archived(args):
+    return args.get('include_archived', '').lower() == 'true'
+
+
+def _collapse_duplicates(args):
+    return args.get('collapse_duplicates', '').lower() == 'true'
+
+
+def _lean_jobs(args, fields):
+    """
+    The filtered get_jobs rows as plain tuples: the hot jobs table, plus
+    jobs_archive with include_archived=true. ORDER BY and keyset filters on
+    Job columns are adapted onto the UNION ALL by the ORM.
+    """
+    lean, serialize = lean_query(_filtered_query(args), fields)
+    if _include_archived(args):
+        archived, _ = lean_query(_filtered_query(args, JobArchive), fields, JobArchive)
+        lean = lean.union_all(archived)
+    return lean, serialize
+
+
+def _order_by_date(query, ascending):
+    """ORDER BY posting_date, id — the column order of the ix_jobs_*_date_id indexes."""
+    order = asc if ascending else desc
+    return query.order_by(order(Job.posting_date), order(Job.id))
+
+
+def _keyset_queries(query, ascending, token):
+    """Build the keyset page queries, to be read in order. Returns (queries, direction)."""
+    direction = 'next'
+    scan_ascending = ascending
+    ranges = [None]
+    if token:
+        posting_date, job_pk, direction = decode_cursor(token)
+        # Walking backwards means scanning the opposite way and flipping the page
+        if direction == 'prev':
+            scan_ascending = not ascending
+        ranges = keyset_ranges(Job.posting_date, Job.id, posting_date, job_pk, scan_ascending)
+    queries = [_order_by_date(query if clause is None else query.filter(clause), scan_ascending)
+               for clause in ranges]
+    return queries, direction
+
+
+def _paginate_by_cursor(query, ascending, per_page, token):
+    """
+    Keyset pagination on (posting_date, id). Avoids OFFSET scans and the
+    COUNT(*) that paginate() issues, so deep pages cost the same as page 1.
+    """
+    queries, direction = _keyset_queries(query, ascending, token)
+    rows = []
+    for keyset in queries:
+        rows += keyset.limit(per_page + 1 - len(rows)).all()
+        if len(rows) > per_page:
+            break
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == 'prev':
+        rows.reverse()
+
+    next_cursor = prev_cursor = None
+    if rows:
+        first, last = rows[0], rows[-1]
+        if direction == 'prev' or has_more:
+            next_cursor = encode_cursor(last.posting_date, last.id, 'next')
+        if token and (direction == 'next' or has_more):
+            prev_cursor = encode_cursor(first.posting_date, first.id, 'prev')
+    return rows, next_cursor, prev_cursor
 
 
 @job_bp.route('/jobs', methods=['GET'])
+@replica_router.reads
+@response_cache.cached()
 def get_jobs():
     try:
-        job_type = request.args.get('job_type')
-        location = request.args.get('location')
-        tag = request.args.get('tag')
         sort = request.args.get('sort', 'posting_date_desc')
         page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 10))
+        # Larger pages are clamped rather than rejected; meta.per_page shows what was used
+        per_page = min(int(request.args.get('per_page', 10)), Config.MAX_PER_PAGE)
 
-        query = Job.query
+        try:
+            fields = parse_fields(request.args.get('fields'))
+            # Rows come back as plain tuples and skip ORM hydration and marshmallow
+            lean, serialize = _lean_jobs(request.args, fields)
+        except (InvalidFilter, InvalidFields) as inv:
+            return jsonify({'error': str(inv)}), 400
 
-        if job_type:
-            query = query.filter(Job.job_type == job_type)
+        # Sort by date field (now properly works with DATE type)
+        if sort not in ('posting_date_desc', 'posting_date_asc'):
+            return jsonify({'error': 'Invalid sort parameter. Supported: posting_date_desc, posting_date_asc'}), 400
+        ascending = sort == 'posting_date_asc'
 
-        if location:
-            query = query.filter(or_(Job.city.ilike(f'%{location}%'), Job.country.ilike(f'%{location}%')))
+        # Cursor mode: pass cursor= (empty for the first page) instead of page=
+        if 'cursor' in request.args:
+            if per_page < 1:
+                return jsonify({'error': 'per_page must be a positive integer'}), 400
+            try:
+                rows, next_cursor, prev_cursor = _paginate_by_cursor(
+                    lean, ascending, per_page, request.args.get('cursor'))
+            except InvalidCursor as ic:
+                return jsonify({'error': str(ic)}), 400
+
+            meta = {
+                "per_page": per_page,
+                "next_cursor": next_cursor,
+                "prev_cursor": prev_cursor
+            }
+            # The exact count is a full scan on large tables, so it is opt-in and cached briefly
+            if request.args.get('include_total', '').lower() == 'true':
+                total = _count_cache.get_or_compute(_filter_key(request.args), lean.count)
+                meta["total_jobs"] = total
+                meta["total_pages"] = -(-total // per_page)
+            return jsonify({"jobs": serialize_rows(serialize, rows), "meta": meta}), 200
+
+        if (page - 1) * per_page > Config.MAX_OFFSET:
+            return jsonify({'error': f'page goes past the first {Config.MAX_OFFSET} jobs; '
+                                     'use cursor= pagination to read further'}), 400
+        pagination = _order_by_date(lean, ascending).paginate(page=page, per_page=per_page, error_out=False)
 
-        if tag:
-            query = query.filter(Job.tags.ilike(f'%{tag}%'))
+        return jsonify({
+            "jobs": serialize_rows(serialize, pagination.items),
+            "meta": {
+                "page": pagination.page,
+                "per_page": pagination.per_page,
+                "total_jobs": pagination.total,
+                "total_pages": pagination.pages
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
 
-        # Sort by date field (now properly works with DATE type)
-        if sort == 'posting_date_desc':
-            query = query.order_by(desc(Job.posting_date))
-        elif sort == 'posting_date_asc':
-            query = query.order_by(asc(Job.posting_date))
-        else:
-            return jsonify({'error': 'Invalid sort parameter. Supported: posting_date_desc, posting_date_asc'}), 400
 
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+@job_bp.route('/jobs/search', methods=['GET'])
+@replica_router.reads
+@response_cache.cached()
+def search_jobs():
+    try:
+        q = (request.args.get('q') or '').strip()
+        page = int(request.args.get('page', 1))
+        # Larger pages are clamped rather than rejected; meta.per_page shows what was used
+        per_page = min(int(request.args.get('per_page', 10)), Config.MAX_PER_PAGE)
+        if not q:
+            return jsonify({'error': 'Query parameter q is required'}), 400
+        if (page - 1) * per_page > Config.MAX_OFFSET:
+            return jsonify({'error': f'page goes past the first {Config.MAX_OFFSET} results; '
+                                     'narrow the query instead'}), 400
+
+        try:
+            query = _filtered_query(request.args)
+            fields = parse_fields(request.args.get('fields'))
+        except (InvalidFilter, InvalidFields) as inv:
+            return jsonify({'error': str(inv)}), 400
+
+        # Most relevant first; id breaks ties so pages are stable
+        matches = get_search_backend().match(q)
+        query = (query.join(matches, matches.c.id == Job.id)
+                 .order_by(desc(matches.c.score), desc(Job.id)))
+        lean, serialize = lean_query(query, fields)
+        pagination = lean.paginate(page=page, per_page=per_page, error_out=False)
 
         return jsonify({
-            "jobs": jobs_schema.dump(pagination.items),
+            "jobs": serialize_rows(serialize, pagination.items),
             "meta": {
+                "q": q,
                 "page": pagination.page,
                 "per_page": pagination.per_page,
                 "total_jobs": pagination.total,
@@ -97,13 +346,245 @@ def get_jobs():
         return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
 
 
+@job_bp.route('/jobs/facets', methods=['GET'])
+@response_cache.cached()
+def get_facets():
+    try:
+        limit = int(request.args.get('limit', 100))
+        try:
+            query = _filtered_query(request.args)
+        except InvalidFilter as inv:
+            return jsonify({'error': str(inv)}), 400
+
+        # The summary table answers job_type plus one tag or one exact location,
+        # counting duplicates; anything else, including a location term that also
+        # matches other locations, is aggregated over the (indexed) filtered query,
+        # as long as it matches at most FACETS_LIVE_MAX_JOBS jobs
+        tags = parse_tags(request.args.getlist('tag'))
+        location = request.args.get('location')
+        exact_location = not location or _location_exact(request.args) or only_match(location)
+        if (location and tags) or len(tags) > 1 or _collapse_duplicates(request.args) or not exact_location:
+            try:
+                result = facets.live_facets(query, limit, Config.FACETS_LIVE_MAX_JOBS)
+            except facets.TooManyJobs as many:
+                return jsonify({'error': str(many)}), 400
+            source = 'live'
+        else:
+            result = facets.summary_facets(request.args.get('job_type'), tags[0] if tags else None, location, limit)
+            source = 'summary'
+
+        return jsonify({"facets": result, "meta": {"source": source, "limit": limit}}), 200
+    except Exception as e:
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+
+@job_bp.route('/suggest', methods=['GET'])
+def suggest_values():
+    try:
+        field = request.args.get('field')
+        prefix = request.args.get('prefix', '')
+        limit = int(request.args.get('limit', 10))
+        if field not in suggest.SUGGEST_FIELDS:
+            return jsonify({'error': f"Invalid field. Supported: {', '.join(suggest.SUGGEST_FIELDS)}"}), 400
+        if not 1 <= limit <= suggest.MAX_LIMIT:
+            return jsonify({'error': f'limit must be between 1 and {suggest.MAX_LIMIT}'}), 400
+
+        return jsonify({
+            "suggestions": _suggest_index.suggest(field, prefix, limit),
+            "meta": {"field": field, "prefix": prefix, "limit": limit}
+        }), 200
+    except Exception as e:
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+
+@job_bp.route('/jobs/export', methods=['GET'])
+def export_jobs():
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        sort = request.args.get('sort', 'posting_date_desc')
+        if export_format not in ENCODERS:
+            return jsonify({'error': 'Invalid format parameter. Supported: ndjson, csv'}), 400
+        if sort not in ('posting_date_desc', 'posting_date_asc'):
+            return jsonify({'error': 'Invalid sort parameter. Supported: posting_date_desc, posting_date_asc'}), 400
+        try:
+            query = export_query(_filtered_query(request.args))
+            # The same hot/archive union as get_jobs
+            if _include_archived(request.args):
+                query = query.union_all(export_query(_filtered_query(request.args, JobArchive), JobArchive))
+            query = _order_by_date(query, sort == 'posting_date_asc')
+        except InvalidFilter as inv:
+            return jsonify({'error': str(inv)}), 400
+
+        # A generator body is sent with chunked transfer encoding; memory stays
+        # at one batch regardless of how many rows match
+        chunks = ENCODERS[export_format](stream_rows(query, Config.EXPORT_BATCH_SIZE))
+        headers = {'Content-Disposition': f'attachment; filename=jobs.{export_format}', 'Vary': 'Accept-Encoding'}
+        if 'gzip' in request.accept_encodings:
+            chunks = gzip_chunks(chunks)
+            headers['Content-Encoding'] = 'gzip'
+
+        return Response(stream_with_context(chunks), mimetype=CONTENT_TYPES[export_format], headers=headers)
+    except Exception as e:
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+
+def _change_entries(entries, fields):
+    """Change log entries with the current row of each inserted or updated job (None for delete and archive)."""
+    ids = [job_pk for _, job_pk, op in entries if op in ('insert', 'update')]
+    rows = {}
+    if ids:
+        lean, serialize = lean_query(Job.query.filter(Job.id.in_(ids)), fields)
+        found = lean.all()
+        rows = dict(zip((row[0] for row in found), serialize_rows(serialize, found)))
+    return [{'seq': seq, 'op': op, 'id': job_pk, 'job': rows.get(job_pk)} for seq, job_pk, op in entries]
+
+
+@job_bp.route('/jobs/changes', methods=['GET'])
+def get_job_changes():
+    try:
+        limit = int(request.args.get('limit', 100))
+        if not 1 <= limit <= change_log.MAX_LIMIT:
+            return jsonify({'error': f'limit must be between 1 and {change_log.MAX_LIMIT}'}), 400
+        try:
+            since = change_log.parse_token(request.args.get('since'))
+            fields = parse_fields(request.args.get('fields'))
+            entries, next_token, has_more = change_log.changes_since(since, limit)
+        except (change_log.InvalidToken, InvalidFields) as inv:
+            return jsonify({'error': str(inv)}), 400
+        except change_log.TokenExpired:
+            return jsonify({'error': 'since token is older than the change log; resync from GET /jobs'}), 410
+
+        return jsonify({
+            "changes": _change_entries(entries, fields),
+            "meta": {"since": str(since), "next": str(next_token), "has_more": has_more, "limit": limit}
+        }), 200
+    except Exception as e:
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+
+@job_bp.route('/jobs/changes/stream', methods=['GET'])
+def stream_job_changes():
+    try:
+        try:
+            since = change_log.parse_token(request.headers.get('Last-Event-ID') or request.args.get('since'))
+            fields = parse_fields(request.args.get('fields'))
+            if 0 < since < change_log.horizon():
+                raise change_log.TokenExpired()
+        except (change_log.InvalidToken, InvalidFields) as inv:
+            return jsonify({'error': str(inv)}), 400
+        except change_log.TokenExpired:
+            return jsonify({'error': 'since token is older than the change log; resync from GET /jobs'}), 410
+
+        # One event per change with its seq as the id, so EventSource resumes through Last-Event-ID
+        def events(since):
+            # Streams end after a while so sync workers are freed; EventSource reconnects by itself
+            deadline = time.monotonic() + Config.CHANGE_STREAM_MAX_SECONDS
+            idle_since = time.monotonic()
+            yield 'retry: 1000\n\n'
+            while time.monotonic() < deadline:
+                try:
+                    entries, since, has_more = change_log.changes_since(since, change_log.MAX_LIMIT)
+                except change_log.TokenExpired:
+                    yield 'event: resync\ndata: {}\n\n'
+                    return
+                payload = _change_entries(entries, fields)
+                # End the read transaction, or later polls would keep seeing its snapshot
+                db.session.rollback()
+                for entry in payload:
+                    yield f"id: {entry['seq']}\ndata: {json.dumps(entry)}\n\n"
+                if payload:
+                    idle_since = time.monotonic()
+                elif time.monotonic() - idle_since >= 15:
+                    yield ': keep-alive\n\n'
+                    idle_since = time.monotonic()
+                if not has_more:
+                    # Woken early by commits in this process; writes from elsewhere are picked up by the poll
+                    change_log.wait_for_commit(Config.CHANGE_STREAM_POLL_SECONDS)
+
+        return Response(stream_with_context(events(since)), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    except Exception as e:
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+
 @job_bp.route('/jobs/<int:id>', methods=['GET'])
+@replica_router.reads
+@response_cache.cached()
 def get_job(id):
     try:
-        job = Job.query.get(id)
-        if not job:
+        try:
+            fields = parse_fields(request.args.get('fields'))
+        except InvalidFields as inv:
+            return jsonify({'error': str(inv)}), 400
+        lean, serialize = lean_query(Job.query.filter(Job.id == id), fields)
+        row = lean.first()
+        if not row:
+            # Archived postings keep their id
+            lean, serialize = lean_query(JobArchive.query.filter(JobArchive.id == id), fields, JobArchive)
+            row = lean.first()
+        if not row:
             return jsonify({'error': 'Job not found'}), 404
-        return jsonify(job_schema.dump(job)), 200
+        return jsonify(serialize_rows(serialize, [row])[0]), 200
+    except Exception as e:
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+
+def _batch_request(data):
+    """Validate a POST /jobs/batch body. Returns (ids without duplicates, fields, {id: known etag})."""
+    if not isinstance(data, dict):
+        raise InvalidBatch('Expected a JSON object with an ids list')
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids or not all(type(job_pk) is int for job_pk in ids):
+        raise InvalidBatch('ids must be a non-empty list of integer job ids')
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > Config.BATCH_GET_MAX_IDS:
+        raise InvalidBatch(f'At most {Config.BATCH_GET_MAX_IDS} ids per request')
+    known = data.get('known') or {}
+    if not isinstance(known, dict):
+        raise InvalidBatch('known must map job ids to the etags the client holds')
+    fields = data.get('fields')
+    if isinstance(fields, list):
+        fields = ','.join(str(name) for name in fields)
+    return ids, parse_fields(fields), {str(job_pk): etag for job_pk, etag in known.items()}
+
+
+@job_bp.route('/jobs/batch', methods=['POST'])
+@replica_router.reads
+def batch_get_jobs():
+    try:
+        try:
+            ids, fields, known = _batch_request(request.get_json(silent=True))
+        except (InvalidBatch, InvalidFields) as inv:
+            return jsonify({'error': str(inv)}), 400
+
+        # One IN query; only ids it misses are looked up in the archive
+        found = {}
+        for model in (Job, JobArchive):
+            remaining = [job_pk for job_pk in ids if job_pk not in found]
+            if not remaining:
+                break
+            lean, serialize = lean_query(model.query.filter(model.id.in_(remaining)), fields, model)
+            rows = lean.all()
+            found.update(zip((row[0] for row in rows), serialize_rows(serialize, rows)))
+
+        items = []
+        not_modified = 0
+        for job_pk in ids:
+            item = found.get(job_pk)
+            if item is None:
+                continue
+            etag = item_etag(item)
+            if known.get(str(job_pk)) == etag:
+                items.append({'id': job_pk, 'etag': etag, 'not_modified': True})
+                not_modified += 1
+            else:
+                items.append({'id': job_pk, 'etag': etag, 'job': item})
+
+        return jsonify({
+            "jobs": items,
+            "missing": [job_pk for job_pk in ids if job_pk not in found],
+            "meta": {"requested": len(ids), "found": len(found), "not_modified": not_modified}
+        }), 200
     except Exception as e:
         return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
 
@@ -117,12 +598,22 @@ def create_job():
 
         # Validate and deserialize input
         result = job_schema.load(data)
+        search = get_search_backend()
 
         
         result['job_id'] = str(uuid.uuid4())
 
         job = Job(**result)
         db.session.add(job)
+        sync_job_tags(job)
+        db.session.flush()
+        replace_job_locations([job])
+        search.index_job(job)
+        dedup.link_duplicates(_duplicate_index, [job])
+        facets.record_change(after=facets.snapshot(job))
+        suggest.record_change(after=suggest.snapshot(job))
+        bump_generation()
+        change_log.record([(job.id, 'insert')])
         db.session.commit()
         return jsonify(job_schema.dump(job)), 201
     except ValidationError as ve:
@@ -135,10 +626,121 @@ def create_job():
         return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
 
 
+def _bulk_items():
+    """Yield the rows of a bulk request: a JSON array, or NDJSON read line by line."""
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        for line in request.stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield InvalidBulkPayload('Invalid JSON line')
+        return
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        raise InvalidBulkPayload('Expected a JSON array of jobs or an application/x-ndjson body')
+    yield from data
+
+
+def _bulk_chunks(chunk_size):
+    chunk = []
+    for item in _bulk_items():
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _ingest_chunk(offset, items):
+    """Validate and upsert one chunk in its own transaction. Returns per-row results."""
+    results = [{'index': offset + i, 'status': 'error'} for i in range(len(items))]
+    candidates = [i for i, item in enumerate(items) if not isinstance(item, InvalidBulkPayload)]
+    for i, item in enumerate(items):
+        if isinstance(item, InvalidBulkPayload):
+            results[i]['errors'] = {'_schema': [str(item)]}
+
+    # Report the failing rows and re-load the rest until a load passes, so one bad row
+    # doesn't sink the chunk. Schema validators only run once every field loads, so a
+    # later pass can fail rows an earlier one let through; messages are keyed by
+    # position in that pass's rows.
+    loaded = []
+    while candidates:
+        try:
+            loaded = bulk_jobs_schema.load([items[i] for i in candidates])
+            break
+        except ValidationError as ve:
+            failed = {candidates[position]: messages for position, messages in ve.messages.items()
+                      if isinstance(position, int)}
+            if not failed:
+                for i in candidates:
+                    results[i]['errors'] = ve.messages
+                return results
+            for i, messages in failed.items():
+                results[i]['errors'] = messages
+            candidates = [i for i in candidates if i not in failed]
+
+    for i, row in zip(candidates, loaded):
+        results[i]['job_id'] = row['job_id']
+    if not loaded:
+        return results
+
+    try:
+        written = upsert_jobs(loaded, _duplicate_index)
+        bump_generation()
+        change_log.record([(job_pk, 'insert' if created else 'update') for job_pk, created, _ in written.values()])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        for i in candidates:
+            results[i]['errors'] = {'_database': [str(e)]}
+        return results
+
+    for i in candidates:
+        job_pk, created, canonical = written[results[i]['job_id']]
+        results[i].update(status='created' if created else 'updated', id=job_pk, duplicate_of=canonical)
+    return results
+
+
+@job_bp.route('/jobs/bulk', methods=['POST'])
+def bulk_upsert_jobs():
+    started = time.perf_counter()
+    try:
+        # Resolve the search backend before any chunk takes the write lock
+        get_search_backend()
+        results = []
+        try:
+            for chunk in _bulk_chunks(Config.BULK_CHUNK_SIZE):
+                results += _ingest_chunk(len(results), chunk)
+        except InvalidBulkPayload as inv:
+            return jsonify({'error': str(inv)}), 400
+
+        elapsed = time.perf_counter() - started
+        statuses = [result['status'] for result in results]
+        written = statuses.count('created') + statuses.count('updated')
+        return jsonify({
+            "results": results,
+            "meta": {
+                "received": len(results),
+                "created": statuses.count('created'),
+                "updated": statuses.count('updated'),
+                "failed": statuses.count('error'),
+                "elapsed_seconds": round(elapsed, 3),
+                "rows_per_sec": round(written / elapsed, 1) if elapsed > 0 else None
+            }
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+
 @job_bp.route('/jobs/<int:id>', methods=['PUT', 'PATCH'])
 def update_job(id):
     try:
-        job = Job.query.get(id)
+        job = db.session.get(Job, id)
         if not job:
             return jsonify({'error': 'Job not found'}), 404
 
@@ -148,9 +750,22 @@ def update_job(id):
 
         # Validate and deserialize input (partial=True for PATCH)
         result = job_schema.load(data, partial=(request.method == 'PATCH'))
+        search = get_search_backend()
+        before = facets.snapshot(job)
+        suggest_before = suggest.snapshot(job)
 
         for key, value in result.items():
             setattr(job, key, value)
+        if 'tags' in result:
+            sync_job_tags(job)
+        db.session.flush()
+        replace_job_locations([job])
+        search.index_job(job)
+        dedup.link_duplicates(_duplicate_index, [job])
+        facets.record_change(before, facets.snapshot(job))
+        suggest.record_change(suggest_before, suggest.snapshot(job))
+        bump_generation()
+        change_log.record([(job.id, 'update')])
 
         db.session.commit()
         return jsonify(job_schema.dump(job)), 200
@@ -167,13 +782,24 @@ def update_job(id):
 @job_bp.route('/jobs/<int:id>', methods=['DELETE'])
 def delete_job(id):
     try:
-        job = Job.query.get(id)
+        job = db.session.get(Job, id)
         if not job:
             return jsonify({'error': 'Job not found'}), 404
 
+        get_search_backend().remove_job(job.id)
+        facets.record_change(before=facets.snapshot(job))
+        suggest.record_change(before=suggest.snapshot(job))
+        dedup.release([job.id], _duplicate_index)
+        db.session.execute(job_locations.delete().where(job_locations.c.job_id == job.id))
         db.session.delete(job)
+        bump_generation()
+        change_log.record([(id, 'delete')])
         db.session.commit()
         return '', 204
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
\ No newline at end of file
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+@job_bp.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(response_cache.stats()), 200
@@ -0,0 +1,43 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# The app reads its configuration at import, so point it at a scratch SQLite
+# database (and turn off the response cache and admission limits) first
+_DB_DIR = tempfile.mkdtemp(prefix='jobs-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_DB_DIR, 'jobs.db')}"
+os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+os.environ['ADMISSION_ENABLED'] = 'false'
+
+# Enough rows that a full scan or a buffered result set stands out
+SEED_ROWS = 300_000
+
+
+@pytest.fixture(scope='session')
+def app():
+    from Backend import migrations
+    from Backend.app import app
+    from Backend.db import db
+
+    with app.app_context():
+        migrations.upgrade(db.engine)
+    yield app
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope='session')
+def seeded(app):
+    """Fill the database once with Backend.benchmarks.seed data. Returns the row count."""
+    from Backend.benchmarks.seed import seed
+    from Backend.db import db
+
+    with app.app_context():
+        seed(db.engine, SEED_ROWS, log=lambda message: None)
+    return SEED_ROWS
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,17 @@
+import pytest
+from flask import request
+
+from Backend.admission import classify
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('per_page=10&page=50', 'list'),
+    ('per_page=100000', 'list'),
+    ('per_page=100000&page=2', 'list'),
+    ('per_page=100&page=12', 'expensive'),
+    ('per_page=10&include_total=true', 'expensive'),
+    ('include_archived=true', 'expensive'),
+])
+def test_get_jobs_cost_uses_the_served_page_size(app, query, expected):
+    with app.test_request_context(f'/jobs?{query}'):
+        assert classify(request) == expected
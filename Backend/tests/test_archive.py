@@ -0,0 +1,25 @@
+from datetime import date
+
+from Backend.utils.archive import archive_batch
+
+
+def _create(client, title, posting_date):
+    response = client.post('/jobs', json={'title': title, 'company': 'Archive Mutual', 'city': 'Hartford',
+                                          'posting_date': posting_date})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def test_archived_ids_are_never_handed_out_again(app, client):
+    # The newest job is archived, then its id is the highest rowid nowhere in jobs
+    archived = _create(client, 'Retired Actuary', '2000-01-01')
+    with app.app_context():
+        assert archive_batch(date(2001, 1, 1)) == 1
+
+    created = _create(client, 'Pricing Actuary', date.today().isoformat())
+    try:
+        assert created > archived
+        assert client.get(f'/jobs/{archived}').get_json()['title'] == 'Retired Actuary'
+        assert client.get(f'/jobs/{created}').get_json()['title'] == 'Pricing Actuary'
+    finally:
+        client.delete(f'/jobs/{created}')
@@ -0,0 +1,69 @@
+from datetime import date
+
+import pytest
+
+from Backend.config import Config
+from Backend.utils.archive import archive_batch
+
+
+def _create(client, title, posting_date='2024-03-01'):
+    response = client.post('/jobs', json={'title': title, 'company': 'Batchco', 'city': 'Batchford',
+                                          'posting_date': posting_date})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+@pytest.fixture
+def jobs(client):
+    ids = [_create(client, title) for title in ('Pricing Actuary', 'Reserving Actuary', 'Capital Actuary')]
+    yield ids
+    for job_pk in ids:
+        client.delete(f'/jobs/{job_pk}')
+
+
+def test_items_come_back_in_requested_order_with_missing_ids_listed(client, jobs):
+    first, second, third = jobs
+    client.delete(f'/jobs/{second}')
+    response = client.post('/jobs/batch', json={'ids': [third, 999_999_999, first, second, third], 'fields': 'title'})
+    assert response.status_code == 200
+    body = response.get_json()
+
+    assert [(item['id'], item['job']) for item in body['jobs']] == [
+        (third, {'title': 'Capital Actuary'}), (first, {'title': 'Pricing Actuary'})]
+    assert body['missing'] == [999_999_999, second]
+    assert body['meta'] == {'requested': 4, 'found': 2, 'not_modified': 0}
+
+
+def test_known_etags_skip_unchanged_jobs(client, jobs):
+    first, second, _ = jobs
+    items = client.post('/jobs/batch', json={'ids': [first, second]}).get_json()['jobs']
+    known = {str(item['id']): item['etag'] for item in items}
+    assert client.patch(f'/jobs/{second}', json={'title': 'Senior Reserving Actuary'}).status_code == 200
+
+    body = client.post('/jobs/batch', json={'ids': [first, second], 'known': known}).get_json()
+    assert body['jobs'][0] == {'id': first, 'etag': known[str(first)], 'not_modified': True}
+    assert body['jobs'][1]['job']['title'] == 'Senior Reserving Actuary'
+    assert body['jobs'][1]['etag'] != known[str(second)]
+    assert body['meta']['not_modified'] == 1
+
+
+def test_archived_jobs_are_found(app, client, jobs):
+    archived = _create(client, 'Retired Batch Actuary', '2000-01-01')
+    with app.app_context():
+        assert archive_batch(date(2001, 1, 1)) >= 1
+
+    body = client.post('/jobs/batch', json={'ids': [archived, jobs[0]], 'fields': ['title']}).get_json()
+    assert [item['job']['title'] for item in body['jobs']] == ['Retired Batch Actuary', 'Pricing Actuary']
+    assert body['missing'] == []
+
+
+@pytest.mark.parametrize('payload', [
+    [1, 2],
+    {'ids': []},
+    {'ids': ['1']},
+    {'ids': [1], 'known': ['etag']},
+    {'ids': [1], 'fields': 'salary'},
+    {'ids': list(range(1, Config.BATCH_GET_MAX_IDS + 2))},
+])
+def test_bad_batch_requests_are_rejected(client, payload):
+    assert client.post('/jobs/batch', json=payload).status_code == 400
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from Backend.config import Config
+
+
+def _job(job_id, **fields):
+    return {'job_id': job_id, 'title': 'Pricing Actuary', 'company': 'Bulk Mutual', 'city': 'Bulkington',
+            'country': 'United Kingdom', 'posting_date': '2024-05-01', 'job_type': 'Full-Time',
+            'tags': 'Pricing, Python', **fields}
+
+
+@pytest.fixture
+def cleanup(client):
+    ids = []
+    yield ids
+    for job_pk in ids:
+        client.delete(f'/jobs/{job_pk}')
+
+
+def _post(client, rows, cleanup):
+    response = client.post('/jobs/bulk', json=rows)
+    assert response.status_code == 200
+    body = response.get_json()
+    cleanup += [result['id'] for result in body['results'] if 'id' in result]
+    return body
+
+
+def test_mixed_chunk_fails_only_the_bad_rows(client, cleanup):
+    rows = [
+        _job('bulk-mixed-0'),
+        _job('bulk-mixed-1', title=''),
+        _job('bulk-mixed-2', job_type='Freelance'),
+        _job('bulk-mixed-3'),
+        _job('bulk-mixed-4', title='T' * 300),
+        _job('bulk-mixed-5', tags=['Pricing', 'x' * 101]),
+        'not an object',
+        _job('bulk-mixed-7'),
+    ]
+    body = _post(client, rows, cleanup)
+    results = body['results']
+
+    assert [result['status'] for result in results] == [
+        'created', 'error', 'error', 'created', 'error', 'error', 'error', 'created']
+    assert [result['index'] for result in results] == list(range(len(rows)))
+    # Each error is the row's own message, keyed by field
+    assert set(results[1]['errors']) == {'title'}
+    assert set(results[2]['errors']) == {'job_type'}
+    assert results[4]['errors'] == {'title': ['Must be at most 255 characters']}
+    assert set(results[5]['errors']) == {'tags'}
+    assert '_schema' in results[6]['errors']
+    assert body['meta'] == {**body['meta'], 'received': 8, 'created': 3, 'updated': 0, 'failed': 5}
+
+
+def test_same_job_id_updates_instead_of_creating(client, cleanup):
+    first = _post(client, [_job('bulk-upsert')], cleanup)['results'][0]
+    second = _post(client, [_job('bulk-upsert', title='Head of Pricing', tags='Pricing, Leadership')],
+                   cleanup)['results'][0]
+
+    assert first['status'] == 'created'
+    assert second['status'] == 'updated'
+    assert second['id'] == first['id']
+    job = client.get(f"/jobs/{first['id']}").get_json()
+    assert job['title'] == 'Head of Pricing'
+    listed = client.get('/jobs', query_string={'tag': 'leadership', 'location': 'Bulkington', 'cursor': ''})
+    assert [item['id'] for item in listed.get_json()['jobs']] == [first['id']]
+
+
+def test_ndjson_across_chunks(client, cleanup, monkeypatch):
+    monkeypatch.setattr(Config, 'BULK_CHUNK_SIZE', 2)
+    lines = [json.dumps(_job(f'bulk-ndjson-{i}')) for i in range(3)]
+    body = '\n'.join([lines[0], '', '{not json', lines[1], json.dumps(_job('bulk-ndjson-x', city='')), lines[2]])
+    response = client.post('/jobs/bulk', data=body + '\n', content_type='application/x-ndjson')
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    cleanup += [result['id'] for result in results if 'id' in result]
+
+    assert [result['status'] for result in results] == ['created', 'error', 'created', 'error', 'created']
+    assert results[1]['errors'] == {'_schema': ['Invalid JSON line']}
+    assert set(results[3]['errors']) == {'city'}
+    assert [result.get('job_id') for result in results if result['status'] == 'created'] == [
+        'bulk-ndjson-0', 'bulk-ndjson-1', 'bulk-ndjson-2']
+
+
+def test_body_that_is_not_an_array_is_rejected(client):
+    response = client.post('/jobs/bulk', json={'job_id': 'bulk-single'})
+    assert response.status_code == 400
@@ -0,0 +1,100 @@
+from fnmatch import fnmatchcase
+
+import pytest
+
+from Backend.cache import LRUCacheBackend, RedisCacheBackend, response_cache
+
+JOB = {'title': 'Cached Pricing Actuary', 'company': 'Etagco', 'city': 'Cacheton', 'country': 'UK',
+       'posting_date': '2024-03-01', 'job_type': 'Full-Time'}
+
+
+class FakeRedis:
+    """The slice of redis-py RedisCacheBackend uses, over a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def scan_iter(self, match='*', count=None):
+        return [key for key in list(self.data) if fnmatchcase(key, match)]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def cached(request, client, monkeypatch):
+    backend = LRUCacheBackend() if request.param == 'memory' else RedisCacheBackend(FakeRedis())
+    monkeypatch.setattr(response_cache, 'backend', backend)
+    monkeypatch.setattr(response_cache, 'ttl', 60)
+    response = client.post('/jobs', json=JOB)
+    assert response.status_code == 201
+    job_pk = response.get_json()['id']
+    yield client, job_pk
+    client.delete(f'/jobs/{job_pk}')
+
+
+def test_etag_answers_if_none_match_with_304(cached):
+    client, job_pk = cached
+    first = client.get(f'/jobs/{job_pk}')
+    assert first.status_code == 200 and first.headers['X-Cache'] == 'MISS'
+    etag = first.headers['ETag']
+
+    second = client.get(f'/jobs/{job_pk}')
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.headers['ETag'] == etag and second.get_data() == first.get_data()
+
+    revalidated = client.get(f'/jobs/{job_pk}', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b''
+
+
+def test_writes_retire_cached_responses(cached):
+    client, job_pk = cached
+    etag = client.get(f'/jobs/{job_pk}').headers['ETag']
+    client.get('/jobs?location=Cacheton')
+
+    assert client.patch(f'/jobs/{job_pk}', json={'title': 'Cached Reserving Actuary'}).status_code == 200
+    updated = client.get(f'/jobs/{job_pk}', headers={'If-None-Match': etag})
+    assert updated.status_code == 200 and updated.headers['X-Cache'] == 'MISS'
+    assert updated.get_json()['title'] == 'Cached Reserving Actuary'
+    listed = client.get('/jobs?location=Cacheton')
+    assert listed.headers['X-Cache'] == 'MISS'
+    assert [job['title'] for job in listed.get_json()['jobs']] == ['Cached Reserving Actuary']
+
+    # A rejected write commits nothing, so the cached pages stay
+    assert client.patch(f'/jobs/{job_pk}', json={'posting_date': 'soon'}).status_code == 400
+    assert client.get(f'/jobs/{job_pk}').headers['X-Cache'] == 'HIT'
+
+    assert client.delete(f'/jobs/{job_pk}').status_code == 204
+    assert client.get(f'/jobs/{job_pk}').status_code == 404
+
+
+def test_redis_generation_is_shared_between_backends():
+    redis = FakeRedis()
+    api, scraper = RedisCacheBackend(redis), RedisCacheBackend(redis)
+    assert api.generation('jobs') == 0
+    scraper.bump('jobs')
+    assert api.generation('jobs') == 1
+
+
+def test_redis_clear_deletes_only_its_own_keys():
+    redis = FakeRedis()
+    redis.set('sessions:abc', b'keep me')
+    backend = RedisCacheBackend(redis)
+    for i in range(5):
+        backend.set(f'jobs:0:/jobs/{i}?', (b'{}', 'application/json', 'etag'), ttl=60)
+    backend.bump('jobs')
+
+    backend.clear(batch_size=2)
+    assert redis.data == {'sessions:abc': b'keep me'}
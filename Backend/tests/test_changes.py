@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from Backend.config import Config
+from Backend.db import db
+from Backend.models.cache_generation import CacheGeneration
+from Backend.models.job_change import JobChange
+from Backend.utils import change_log
+
+JOB = {'title': 'Delta Pricing Actuary', 'company': 'Deltaco', 'city': 'Changeton', 'country': 'UK',
+       'posting_date': '2024-02-01', 'job_type': 'Full-Time'}
+
+
+@pytest.fixture
+def head(app):
+    """The newest token in the change log before the test writes anything."""
+    with app.app_context():
+        return db.session.execute(select(func.max(JobChange.seq))).scalar() or 0
+
+
+def _changes(client, **args):
+    response = client.get('/jobs/changes', query_string=args)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_changes_since_a_token_hold_each_jobs_latest_change(client, head):
+    first = client.post('/jobs', json=JOB).get_json()['id']
+    second = client.post('/jobs', json={**JOB, 'title': 'Delta Reserving Actuary'}).get_json()['id']
+    assert client.patch(f'/jobs/{first}', json={'title': 'Delta Capital Actuary'}).status_code == 200
+    assert client.delete(f'/jobs/{second}').status_code == 204
+
+    body = _changes(client, since=head, fields='title')
+    assert [(change['op'], change['id'], change['job']) for change in body['changes']] == [
+        ('update', first, {'title': 'Delta Capital Actuary'}),
+        ('delete', second, None),
+    ]
+    assert body['meta']['next'] == str(body['changes'][-1]['seq'])
+    assert body['meta']['has_more'] is False
+
+    # Paging: the insert is reported with the job's current row
+    page = _changes(client, since=head, limit=1, fields='title')
+    assert [(change['op'], change['job']) for change in page['changes']] == [('insert', {'title': 'Delta Capital Actuary'})]
+    assert page['meta']['next'] == str(head + 1) and page['meta']['has_more'] is True
+
+    caught_up = _changes(client, since=body['meta']['next'])
+    assert caught_up['changes'] == [] and caught_up['meta']['next'] == body['meta']['next']
+    client.delete(f'/jobs/{first}')
+
+
+@pytest.mark.parametrize('args', [{'since': 'abc'}, {'since': '-1'}, {'limit': 0}, {'limit': change_log.MAX_LIMIT + 1}])
+def test_bad_changes_arguments_are_rejected(client, args):
+    assert client.get('/jobs/changes', query_string=args).status_code == 400
+
+
+def test_tokens_older_than_the_horizon_must_resync(app, client, head):
+    ids = [client.post('/jobs', json=JOB).get_json()['id'] for _ in range(2)]
+    # As if compaction had dropped a tombstone at the second insert's seq
+    with app.app_context():
+        db.session.add(CacheGeneration(name=change_log.HORIZON, value=head + 2))
+        db.session.commit()
+    try:
+        assert client.get('/jobs/changes', query_string={'since': head + 1}).status_code == 410
+        assert client.get('/jobs/changes/stream', query_string={'since': head + 1}).status_code == 410
+        assert client.get('/jobs/changes', query_string={'since': head + 2}).status_code == 200
+    finally:
+        with app.app_context():
+            db.session.delete(db.session.get(CacheGeneration, change_log.HORIZON))
+            db.session.commit()
+        for job_pk in ids:
+            client.delete(f'/jobs/{job_pk}')
+
+
+def _events(body):
+    """Parse a server-sent event stream into one dict of fields per event."""
+    events = []
+    for block in body.split('\n\n'):
+        if block:
+            events.append(dict(line.split(': ', 1) for line in block.split('\n')))
+    return events
+
+
+def test_stream_sends_one_event_per_change_and_resumes_from_last_event_id(client, head, monkeypatch):
+    monkeypatch.setattr(Config, 'CHANGE_STREAM_MAX_SECONDS', 0.5)
+    monkeypatch.setattr(Config, 'CHANGE_STREAM_POLL_SECONDS', 0.1)
+    first = client.post('/jobs', json=JOB).get_json()['id']
+    second = client.post('/jobs', json={**JOB, 'title': 'Delta Reserving Actuary'}).get_json()['id']
+
+    response = client.get('/jobs/changes/stream', query_string={'since': head, 'fields': 'title'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream' and response.headers['Cache-Control'] == 'no-cache'
+    retry, *changes = _events(response.get_data(as_text=True))
+    assert retry == {'retry': '1000'}
+    assert [(json.loads(event['data'])['op'], json.loads(event['data'])['id']) for event in changes] == [
+        ('insert', first), ('insert', second)]
+    assert [event['id'] for event in changes] == [str(json.loads(event['data'])['seq']) for event in changes]
+
+    # EventSource reconnects with the last id it saw
+    resumed = client.get('/jobs/changes/stream', headers={'Last-Event-ID': changes[0]['id']})
+    _, *rest = _events(resumed.get_data(as_text=True))
+    assert [json.loads(event['data'])['id'] for event in rest] == [second]
+
+    client.delete(f'/jobs/{first}')
+    client.delete(f'/jobs/{second}')
@@ -0,0 +1,113 @@
+import threading
+from datetime import date
+
+from Backend.db import db
+from Backend.models.job import Job
+from Backend.routes.job_routes import _duplicate_index
+from Backend.utils import dedup
+from Backend.utils.archive import archive_batch
+
+JOB = {'title': 'Senior Reserving Actuary', 'company': 'Duplicate Re', 'city': 'Dedupton', 'country': 'Bermuda',
+       'posting_date': '2024-03-01', 'tags': 'Reserving, IFRS 17, Python'}
+
+
+def test_duplicate_links_show_in_bulk_results_and_collapse_only(client):
+    created = client.post('/jobs', json=JOB)
+    assert created.status_code == 201
+    original = created.get_json()
+    # POST /jobs returns the job as stored, nothing more
+    assert set(original) == {'id', 'title', 'company', 'city', 'country', 'posting_date', 'job_type', 'tags',
+                             'job_id'}
+
+    bulk = client.post('/jobs/bulk', json=[{**JOB, 'job_id': 'dedup-repeat', 'posting_date': '2024-03-08'}])
+    result, = bulk.get_json()['results']
+    try:
+        assert result['status'] == 'created'
+        assert result['duplicate_of'] == original['id']
+
+        listed = client.get('/jobs', query_string={'location': 'Dedupton', 'cursor': ''}).get_json()['jobs']
+        collapsed = client.get('/jobs', query_string={'location': 'Dedupton', 'cursor': '',
+                                                      'collapse_duplicates': 'true'}).get_json()['jobs']
+        assert {job['id'] for job in listed} == {original['id'], result['id']}
+        assert [job['id'] for job in collapsed] == [original['id']]
+    finally:
+        client.delete(f"/jobs/{result['id']}")
+        client.delete(f"/jobs/{original['id']}")
+
+
+def test_index_changes_wait_for_the_commit(app):
+    index = dedup.DuplicateIndex()
+    with app.app_context():
+        job = Job(**{**JOB, 'posting_date': date(2024, 3, 1)}, job_id='dedup-rolled-back')
+        db.session.add(job)
+        db.session.flush()
+        dedup.link_duplicates(index, [job])
+        assert job.id not in index.signatures
+        db.session.rollback()
+        assert job.id not in index.signatures
+
+        job = Job(**{**JOB, 'posting_date': date(2024, 3, 1)}, job_id='dedup-committed')
+        db.session.add(job)
+        db.session.flush()
+        dedup.link_duplicates(index, [job])
+        db.session.commit()
+        try:
+            assert job.id in index.signatures
+        finally:
+            dedup.release([job.id], index)
+            db.session.delete(job)
+            db.session.commit()
+        assert job.id not in index.signatures
+
+
+def test_deleted_and_archived_postings_leave_the_index(app, client):
+    deleted = client.post('/jobs', json=JOB).get_json()['id']
+    assert deleted in _duplicate_index.signatures
+    assert client.delete(f'/jobs/{deleted}').status_code == 204
+    assert deleted not in _duplicate_index.signatures
+
+    # Archived by another process (flask archive-jobs): dropped at the next refresh
+    archived = client.post('/jobs', json={**JOB, 'posting_date': '2000-02-01'}).get_json()['id']
+    assert archived in _duplicate_index.signatures
+    with app.app_context():
+        assert archive_batch(date(2001, 1, 1)) == 1
+        _duplicate_index._checked_at = 0.0
+        _duplicate_index.sync(db.session)
+        db.session.rollback()
+    assert archived not in _duplicate_index.signatures
+
+
+def test_lookups_do_not_wait_for_a_load(app):
+    index = dedup.DuplicateIndex()
+    reading = threading.Event()
+    release = threading.Event()
+
+    class SlowExecutor:
+        """Stalls the signature read, as a large table would."""
+
+        def __init__(self, session):
+            self.session = session
+
+        def execute(self, statement):
+            if 'job_signatures' in str(statement):
+                reading.set()
+                release.wait(5)
+            return self.session.execute(statement)
+
+    def load():
+        with app.app_context():
+            index.load(SlowExecutor(db.session))
+            db.session.rollback()
+
+    loader = threading.Thread(target=load)
+    loader.start()
+    try:
+        assert reading.wait(5)
+        sig = dedup.signature(JOB['title'], JOB['company'], JOB['city'], JOB['country'], JOB['tags'])
+        looked_up = threading.Thread(target=index.candidates, args=(sig,))
+        looked_up.start()
+        looked_up.join(1)
+        assert not looked_up.is_alive()
+    finally:
+        release.set()
+        loader.join()
@@ -0,0 +1,59 @@
+import gzip
+import json
+import tracemalloc
+from datetime import date
+
+from Backend.utils.archive import archive_batch
+
+# Far below the size of the full export (roughly 100 MB of NDJSON for the
+# seeded rows), so buffering the result set or the body would fail
+PEAK_BYTES = 20 * 1024 * 1024
+
+
+def _stream(client, **query):
+    response = client.get('/jobs/export', query_string=query, buffered=False)
+    assert response.status_code == 200
+    return response
+
+
+def test_export_streams_in_bounded_memory(client, seeded):
+    tracemalloc.start()
+    try:
+        response = _stream(client, format='ndjson')
+        rows = size = 0
+        for chunk in response.response:
+            rows += chunk.count(b'\n')
+            size += len(chunk)
+        response.close()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert rows == seeded
+    assert size > 2 * PEAK_BYTES
+    assert peak < PEAK_BYTES, f'peak {peak / 2**20:.1f} MiB while streaming {size / 2**20:.1f} MiB'
+
+
+def test_export_filters_and_compresses(client, seeded):
+    response = client.get('/jobs/export', query_string={'format': 'ndjson', 'job_type': 'Internship'},
+                          headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    jobs = [json.loads(line) for line in gzip.decompress(response.data).splitlines()]
+    assert jobs and all(job['job_type'] == 'Internship' for job in jobs)
+
+
+def test_export_includes_archived_jobs_on_request(app, client):
+    response = client.post('/jobs', json={'title': 'Archived Export', 'company': 'Cold Storage Life',
+                                          'city': 'Exportville', 'posting_date': '2000-06-01'})
+    job_pk = response.get_json()['id']
+    with app.app_context():
+        assert archive_batch(date(2001, 1, 1)) == 1
+
+    def exported(**query):
+        body = _stream(client, format='ndjson', location='Exportville', **query).get_data()
+        return [json.loads(line)['id'] for line in body.splitlines()]
+
+    assert exported() == []
+    assert exported(include_archived='true') == [job_pk]
+    csv_rows = _stream(client, format='csv', location='Exportville', include_archived='true').get_data()
+    assert len(csv_rows.splitlines()) == 2
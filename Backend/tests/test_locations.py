@@ -0,0 +1,61 @@
+import pytest
+
+from Backend.commands import rebuild_facets_command
+
+POSTINGS = [
+    {'title': 'Pricing Actuary', 'city': 'Substringham', 'country': 'Locatia', 'tags': 'Pricing'},
+    {'title': 'Reserving Actuary', 'city': 'Greater Substringham, Otherton', 'country': 'Locatia',
+     'tags': 'Reserving'},
+    {'title': 'Capital Actuary', 'city': 'Elsewhere', 'country': 'Locatia', 'tags': 'Capital'},
+]
+
+
+@pytest.fixture
+def located(client):
+    ids = []
+    for posting in POSTINGS:
+        response = client.post('/jobs', json={**posting, 'company': 'Located Re', 'posting_date': '2024-05-01',
+                                              'job_type': 'Contract'})
+        assert response.status_code == 201
+        ids.append(response.get_json()['id'])
+    yield ids
+    for job_pk in ids:
+        client.delete(f'/jobs/{job_pk}')
+
+
+def _titles(client, **args):
+    return sorted(job['title'] for job in client.get('/jobs', query_string=args).get_json()['jobs'])
+
+
+def test_location_matches_part_of_a_name_ignoring_case(client, located):
+    assert _titles(client, location='substringham') == ['Pricing Actuary', 'Reserving Actuary']
+    assert _titles(client, location='STRINGHAM') == ['Pricing Actuary', 'Reserving Actuary']
+    assert _titles(client, location='otherton') == ['Reserving Actuary']
+    assert _titles(client, location='Locatia') == ['Capital Actuary', 'Pricing Actuary', 'Reserving Actuary']
+    assert _titles(client, location='Nowhereville') == []
+
+
+def test_location_exact_matches_whole_names_only(client, located):
+    assert _titles(client, location='substringham', location_exact='true') == ['Pricing Actuary']
+    assert _titles(client, location='stringham', location_exact='true') == []
+
+
+@pytest.mark.parametrize('args, source, cities', [
+    # Contained in "greater substringham" too, so the summary can't answer it
+    ({'location': 'Substringham'}, 'live', {'Substringham': 1, 'Greater Substringham': 1, 'Otherton': 1}),
+    ({'location': 'Substringham', 'location_exact': 'true'}, 'summary', {'Substringham': 1}),
+    ({'location': 'Greater Substringham'}, 'summary', {'Greater Substringham': 1, 'Otherton': 1}),
+])
+def test_facets_use_the_summary_only_for_an_exact_location(client, located, args, source, cities):
+    body = client.get('/jobs/facets', query_string={**args, 'job_type': 'Contract'}).get_json()
+    assert body['meta']['source'] == source
+    assert {item['value']: item['count'] for item in body['facets']['city']} == cities
+
+
+def test_facet_summary_matches_rebuild_check(app, client, located):
+    assert client.patch(f'/jobs/{located[0]}', json={'city': 'Otherton', 'tags': 'Pricing, Capital'}).status_code == 200
+    assert client.delete(f'/jobs/{located[2]}').status_code == 204
+
+    result = app.test_cli_runner().invoke(rebuild_facets_command, ['--check'])
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith('0 of ')
@@ -0,0 +1,38 @@
+import statistics
+import time
+
+from Backend.metrics import request_metrics
+
+PATHS = ('/jobs?per_page=100&cursor=', '/jobs/1', '/jobs/500?fields=title,company')
+ROUNDS = 10
+REQUESTS = 20
+# Generous, so scheduler noise on a shared machine doesn't fail the build; the
+# benchmark (Backend.benchmarks.instrumentation) holds the tighter 5% budget
+MAX_RATIO = 1.5
+
+
+def _time_round(client, path):
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        client.get(path)
+    return time.perf_counter() - started
+
+
+def test_metrics_overhead_is_small(client, seeded):
+    instrumented = request_metrics.blueprints
+    assert 'Server-Timing' in client.get(PATHS[0]).headers, 'metrics are not enabled'
+    off, on = [], []
+    try:
+        # Interleaved, alternating which side goes first, so drift hits both equally
+        for i in range(ROUNDS):
+            sides = [((), off), (instrumented, on)]
+            for blueprints, timings in (sides if i % 2 else sides[::-1]):
+                request_metrics.blueprints = blueprints
+                timings.append(sum(_time_round(client, path) for path in PATHS))
+        request_metrics.blueprints = ()
+        assert 'Server-Timing' not in client.get(PATHS[0]).headers
+    finally:
+        request_metrics.blueprints = instrumented
+
+    ratio = statistics.median(on) / statistics.median(off)
+    assert ratio < MAX_RATIO, f'requests took {ratio:.2f}x as long with metrics on'
@@ -0,0 +1,53 @@
+from sqlalchemy import create_engine, inspect, text
+
+from Backend import migrations
+from Backend.db import db
+from Backend.models.listing_card import ListingCard
+
+
+def _schema(engine):
+    inspector = inspect(engine)
+    schema = {}
+    for name in inspector.get_table_names():
+        if name == 'schema_migrations' or name.startswith('jobs_fts'):
+            continue
+        schema[name] = (
+            sorted((column['name'], str(column['type']), column['nullable']) for column in inspector.get_columns(name)),
+            inspector.get_pk_constraint(name)['constrained_columns'],
+            sorted((index['name'], tuple(index['column_names'])) for index in inspector.get_indexes(name)),
+            sorted(tuple(unique['column_names']) for unique in inspector.get_unique_constraints(name)),
+            sorted((key['referred_table'], tuple(key['constrained_columns']))
+                   for key in inspector.get_foreign_keys(name)),
+        )
+    return schema
+
+
+def test_migrations_build_the_schema_the_models_declare(app, tmp_path):
+    migrated = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    migrations.upgrade(migrated)
+    declared = create_engine(f"sqlite:///{tmp_path / 'declared.db'}")
+    # Only the scraper imports ListingCard otherwise
+    assert ListingCard.__table__ in db.metadata.sorted_tables
+    db.metadata.create_all(declared)
+
+    assert _schema(migrated) == _schema(declared)
+
+
+def test_old_jobs_table_is_upgraded_in_place(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        # The jobs table as the app created it before migrations existed
+        conn.execute(text('CREATE TABLE jobs (id INTEGER NOT NULL PRIMARY KEY, title VARCHAR(255), '
+                          'company VARCHAR(255), city VARCHAR(255), country VARCHAR(255), posting_date DATE, '
+                          'job_type VARCHAR(255), tags TEXT, link VARCHAR(255), job_id VARCHAR(50), UNIQUE (job_id))'))
+        conn.execute(text("INSERT INTO jobs (id, title, city, country, job_id) "
+                          "VALUES (7, 'Pricing Actuary', 'London, Leeds', 'UK', 'old-7')"))
+
+    migrations.upgrade(engine)
+    with engine.connect() as conn:
+        created = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'jobs'")).scalar()
+        assert 'AUTOINCREMENT' in created
+        assert conn.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'jobs'")).scalar() == 7
+        assert sorted(conn.execute(text('SELECT location FROM job_locations WHERE job_id = 7')).scalars()) == \
+            ['leeds', 'london', 'uk']
+        assert conn.execute(text('SELECT job_id, op FROM job_changes')).all() == [(7, 'insert')]
@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+
+import pytest
+
+from Backend.db import db
+from Backend.models.job import Job
+
+CITY = 'Keysetville'
+
+
+@pytest.fixture
+def dated_jobs(app, client):
+    """A small set of jobs in one city, with repeated and missing posting dates."""
+    dates = [None, None, None] + [date(2024, 1, 1) + timedelta(days=i // 3) for i in range(20)]
+    ids = []
+    for i, posting_date in enumerate(dates):
+        response = client.post('/jobs', json={
+            'title': f'Keyset {i}', 'company': 'Paging Re', 'city': CITY,
+            'posting_date': posting_date.isoformat() if posting_date else None,
+        })
+        assert response.status_code == 201
+        ids.append(response.get_json()['id'])
+    yield ids
+    for job_pk in ids:
+        client.delete(f'/jobs/{job_pk}')
+
+
+def _walk(client, sort, cursor='', direction='next_cursor'):
+    pages = []
+    while cursor is not None:
+        body = client.get('/jobs', query_string={'location': CITY, 'sort': sort, 'per_page': 4,
+                                                 'cursor': cursor}).get_json()
+        pages.append([job['id'] for job in body['jobs']])
+        cursor = body['meta'][direction]
+        last_meta = body['meta']
+    return pages, last_meta
+
+
+@pytest.mark.parametrize('sort', ['posting_date_desc', 'posting_date_asc'])
+def test_cursor_walk_crosses_missing_dates(app, client, dated_jobs, sort):
+    with app.app_context():
+        jobs = db.session.query(Job.id, Job.posting_date).filter(Job.id.in_(dated_jobs)).all()
+    # NULL posting dates sort lowest: first ascending, last descending
+    expected = [job.id for job in sorted(jobs, key=lambda job: (job.posting_date or date.min, job.id),
+                                         reverse=sort == 'posting_date_desc')]
+
+    pages, meta = _walk(client, sort)
+    assert [job_pk for page in pages for job_pk in page] == expected
+    assert all(len(page) == 4 for page in pages[:-1])
+
+    # And back again from the last page
+    back, _ = _walk(client, sort, meta['prev_cursor'], 'prev_cursor')
+    assert [job_pk for page in reversed(back) for job_pk in page] == expected[:-len(pages[-1])]
@@ -0,0 +1,50 @@
+from Backend.utils.query_plans import check_get_jobs_plans, full_scan_problems
+
+
+def _plan(*details):
+    return [{'detail': detail} for detail in details]
+
+
+def test_every_get_jobs_shape_uses_an_index(app, seeded):
+    with app.app_context():
+        assert check_get_jobs_plans() == []
+
+
+def test_index_order_scan_without_lookup_is_a_problem():
+    plan = _plan('SCAN jobs USING INDEX ix_jobs_date_id')
+    assert full_scan_problems('sqlite', plan) == ['SCAN jobs USING INDEX ix_jobs_date_id']
+    assert full_scan_problems('sqlite', plan, filtered=False) == []
+
+
+def test_scan_that_is_sorted_afterwards_is_a_problem():
+    plan = _plan('SCAN jobs USING INDEX ix_jobs_type_date_id', 'USE TEMP B-TREE FOR ORDER BY')
+    assert full_scan_problems('sqlite', plan, filtered=False) == ['USE TEMP B-TREE FOR ORDER BY']
+
+
+def test_sorting_rows_found_by_lookup_is_fine():
+    plan = _plan('SEARCH jobs USING INTEGER PRIMARY KEY (rowid=?)', 'LIST SUBQUERY 1',
+                 'SEARCH job_tags USING COVERING INDEX ix_job_tags_tag_job (tag_id=?)',
+                 'USE TEMP B-TREE FOR ORDER BY')
+    assert full_scan_problems('sqlite', plan) == []
+
+
+def test_sorting_rows_found_by_index_range_is_a_problem():
+    plan = _plan('SEARCH jobs USING INDEX ix_jobs_canonical_id (canonical_id=?)', 'USE TEMP B-TREE FOR ORDER BY')
+    assert full_scan_problems('sqlite', plan, filtered=False) == ['USE TEMP B-TREE FOR ORDER BY']
+
+
+def test_union_branches_are_judged_separately():
+    plan = [
+        {'id': 1, 'parent': 0, 'detail': 'MERGE (UNION ALL)'},
+        {'id': 2, 'parent': 1, 'detail': 'LEFT'},
+        {'id': 3, 'parent': 2, 'detail': 'SEARCH jobs USING INDEX ix_jobs_canonical_date_id (canonical_id=?)'},
+        {'id': 4, 'parent': 1, 'detail': 'RIGHT'},
+        {'id': 5, 'parent': 4, 'detail': 'SEARCH jobs_archive USING INTEGER PRIMARY KEY (rowid=?)'},
+        {'id': 6, 'parent': 4, 'detail': 'LIST SUBQUERY 1'},
+        {'id': 7, 'parent': 6, 'detail': 'SEARCH job_archive_tags USING COVERING INDEX ix_job_archive_tags_tag_job (tag_id=?)'},
+        {'id': 8, 'parent': 4, 'detail': 'USE TEMP B-TREE FOR ORDER BY'},
+    ]
+    assert full_scan_problems('sqlite', plan) == []
+
+    plan[4]['detail'] = 'SCAN jobs_archive'
+    assert full_scan_problems('sqlite', plan) == ['SCAN jobs_archive', 'USE TEMP B-TREE FOR ORDER BY']
@@ -0,0 +1,96 @@
+import shutil
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from Backend import migrations
+from Backend.config import Config
+from Backend.db import db
+from Backend.replicas import STICKY_COOKIE, replica_router
+from Backend.routes.job_routes import job_bp
+
+
+@pytest.fixture
+def replicated(app, tmp_path):
+    """
+    A second app on two SQLite files: the replica is a copy of the primary
+    taken before the primary's row was renamed, so which file served a read
+    shows in the title. Restores the shared router afterwards.
+    """
+    primary, replica = tmp_path / 'primary.db', tmp_path / 'replica.db'
+    engine = create_engine(f'sqlite:///{primary}')
+    migrations.upgrade(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO jobs (id, title, company, city, country, posting_date, job_type) "
+                          "VALUES (1, 'Stale Replicated Title', 'Lagco', 'Replicaton', 'UK', '2024-01-01', 'Full-Time')"))
+        conn.execute(text("INSERT INTO jobs_fts (rowid, title, company, tags, city, country) "
+                          "VALUES (1, 'Stale Replicated Title', 'Lagco', NULL, 'Replicaton', 'UK')"))
+    shutil.copy(primary, replica)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE jobs SET title = 'Fresh Primary Title' WHERE id = 1"))
+    engine.dispose()
+
+    replicated_app = Flask('replicated')
+    replicated_app.config.from_object(Config)
+    replicated_app.config.update(
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{primary}',
+        SQLALCHEMY_ENGINE_OPTIONS={},
+        SQLALCHEMY_BINDS={'replica_0': f'sqlite:///{replica}'},
+        READ_YOUR_WRITES_SECONDS=60,
+    )
+    db.init_app(replicated_app)
+    saved = dict(vars(replica_router))
+    replica_router.init_app(replicated_app)
+    replicated_app.register_blueprint(job_bp)
+    try:
+        yield replicated_app
+    finally:
+        vars(replica_router).clear()
+        vars(replica_router).update(saved)
+        with replicated_app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+
+
+def test_reads_go_to_the_replica(replicated):
+    client = replicated.test_client()
+
+    assert client.get('/jobs/1').get_json()['title'] == 'Stale Replicated Title'
+    assert [job['title'] for job in client.get('/jobs').get_json()['jobs']] == \
+        ['Stale Replicated Title']
+    assert [job['title'] for job in client.get('/jobs/search?q=Lagco').get_json()['jobs']] == \
+        ['Stale Replicated Title']
+    response = client.post('/jobs/batch', json={'ids': [1]})
+    assert response.get_json()['jobs'][0]['job']['title'] == 'Stale Replicated Title'
+    # A read over POST doesn't pin the client to the primary
+    assert STICKY_COOKIE not in response.headers.get('Set-Cookie', '')
+
+
+def test_writes_and_reads_after_a_write_go_to_the_primary(replicated):
+    client = replicated.test_client()
+    response = client.post('/jobs', json={
+        'title': 'Written Through Router', 'company': 'Lagco', 'city': 'Replicaton', 'country': 'UK',
+        'posting_date': '2024-02-01', 'job_type': 'Full-Time'})
+    assert response.status_code == 201
+    job_pk = response.get_json()['id']
+
+    binds = {name: create_engine(url) for name, url in (
+        ('primary', replicated.config['SQLALCHEMY_DATABASE_URI']),
+        ('replica', replicated.config['SQLALCHEMY_BINDS']['replica_0']))}
+    try:
+        found = {name: engine.connect().execute(text('SELECT COUNT(*) FROM jobs WHERE id = :id'),
+                                                {'id': job_pk}).scalar() for name, engine in binds.items()}
+    finally:
+        for engine in binds.values():
+            engine.dispose()
+    assert found == {'primary': 1, 'replica': 0}
+
+    # The write set the sticky cookie, so this client now reads its own changes
+    assert client.get_cookie(STICKY_COOKIE) is not None
+    assert client.get('/jobs/1').get_json()['title'] == 'Fresh Primary Title'
+    assert client.get(f'/jobs/{job_pk}').status_code == 200
+
+    # Another client still reads from the replica
+    assert replicated.test_client().get('/jobs/1').get_json()['title'] == 'Stale Replicated Title'
@@ -0,0 +1,59 @@
+import pytest
+
+JOB = {'company': 'Searchco', 'city': 'Findham', 'country': 'UK', 'posting_date': '2024-05-01',
+       'job_type': 'Full-Time', 'tags': 'Pricing'}
+
+
+@pytest.fixture
+def postings(client):
+    created = {}
+    for name, overrides in (
+        ('strong', {'title': 'Quokka Quokka Pricing Actuary', 'tags': 'Quokka'}),
+        ('weak', {'title': 'Pricing Actuary', 'company': 'Quokka Re'}),
+        ('other', {'title': 'Wombat Analyst', 'job_type': 'Contract'}),
+    ):
+        response = client.post('/jobs', json={**JOB, **overrides})
+        assert response.status_code == 201
+        created[name] = response.get_json()['id']
+    yield created
+    for job_pk in created.values():
+        client.delete(f'/jobs/{job_pk}')
+
+
+def _search(client, q, **args):
+    response = client.get('/jobs/search', query_string={'q': q, 'fields': 'id', **args})
+    assert response.status_code == 200
+    return [job['id'] for job in response.get_json()['jobs']]
+
+
+def test_results_are_ranked_by_relevance(client, postings):
+    assert _search(client, 'quokka') == [postings['strong'], postings['weak']]
+    # Terms are ORed, like MySQL's natural language mode
+    assert set(_search(client, 'quokka wombat')) == set(postings.values())
+    assert _search(client, 'quokka wombat', job_type='Contract') == [postings['other']]
+
+
+def test_equally_relevant_results_are_newest_first(client, postings):
+    twin = client.post('/jobs', json={**JOB, 'title': 'Wombat Analyst', 'job_type': 'Contract'}).get_json()['id']
+    try:
+        assert _search(client, 'wombat') == [twin, postings['other']]
+    finally:
+        client.delete(f'/jobs/{twin}')
+
+
+def test_writes_update_the_search_index(client, postings):
+    assert client.patch(f"/jobs/{postings['other']}", json={'title': 'Quokka Analyst'}).status_code == 200
+    assert postings['other'] in _search(client, 'quokka')
+    assert _search(client, 'wombat') == []
+
+    assert client.delete(f"/jobs/{postings['strong']}").status_code == 204
+    assert postings['strong'] not in _search(client, 'quokka')
+
+
+@pytest.mark.parametrize('q', ['"quokka', 'quokka OR', 'NEAR(quokka', 'quokka*', 'title:quokka'])
+def test_query_syntax_in_q_is_treated_as_text(client, postings, q):
+    assert client.get('/jobs/search', query_string={'q': q}).status_code == 200
+
+
+def test_q_is_required(client):
+    assert client.get('/jobs/search', query_string={'q': '  '}).status_code == 400
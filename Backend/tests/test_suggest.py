@@ -0,0 +1,57 @@
+import random
+
+from Backend.utils.suggest import MAX_LIMIT, SCAN_LIMIT, PrefixIndex
+
+JOB = {'title': 'Zyxwv Pricing Actuary', 'company': 'Zyxwv Re', 'city': 'Zyxton, Qwerton', 'country': 'Zyxland',
+       'posting_date': '2024-06-01', 'job_type': 'Full-Time', 'tags': 'Zyxtag, Python'}
+
+
+def _suggest(client, field, prefix):
+    response = client.get('/suggest', query_string={'field': field, 'prefix': prefix})
+    assert response.status_code == 200
+    return [(item['value'], item['count']) for item in response.get_json()['suggestions']]
+
+
+def test_writes_update_suggestions_as_they_commit(client):
+    assert _suggest(client, 'company', 'zyxwv') == []
+
+    first = client.post('/jobs', json=JOB).get_json()['id']
+    second = client.post('/jobs', json={**JOB, 'city': 'Zyxton'}).get_json()['id']
+    try:
+        assert _suggest(client, 'company', 'zyxwv') == [('Zyxwv Re', 2)]
+        assert _suggest(client, 'city', 'zyx') == [('Zyxton', 2)]
+        assert _suggest(client, 'city', 'qwer') == [('Qwerton', 1)]
+        assert _suggest(client, 'tag', 'zyx') == [('Zyxtag', 2)]
+
+        assert client.patch(f'/jobs/{first}', json={'company': 'Zyxwv Life', 'city': 'Zyxton'}).status_code == 200
+        assert _suggest(client, 'company', 'ZYXWV') == [('Zyxwv Life', 1), ('Zyxwv Re', 1)]
+        assert _suggest(client, 'city', 'qwer') == []
+
+        # A rejected write commits nothing, so the index is unchanged
+        assert client.patch(f'/jobs/{second}', json={'company': 'Zyxwv Mutual', 'posting_date': 'soon'}).status_code == 400
+        assert _suggest(client, 'company', 'zyxwv') == [('Zyxwv Life', 1), ('Zyxwv Re', 1)]
+
+        assert client.delete(f'/jobs/{first}').status_code == 204
+        assert _suggest(client, 'company', 'zyxwv') == [('Zyxwv Re', 1)]
+        assert _suggest(client, 'city', 'zyx') == [('Zyxton', 1)]
+    finally:
+        client.delete(f'/jobs/{first}')
+        client.delete(f'/jobs/{second}')
+    assert _suggest(client, 'company', 'zyxwv') == []
+    assert _suggest(client, 'tag', 'zyx') == []
+
+
+def test_cached_top_list_follows_count_changes():
+    rnd = random.Random(3)
+    counts = {f'a{i:04d}': rnd.randint(1, 20) for i in range(SCAN_LIMIT * 2)}
+    index = PrefixIndex({key: [key, n] for key, n in counts.items()})
+
+    for _ in range(2000):
+        key = rnd.choice(list(counts) + ['a-new'])
+        n = rnd.choice([-3, -1, 1, 4])
+        index.add(key, n)
+        counts[key] = counts.get(key, 0) + n
+        if counts[key] <= 0:
+            del counts[key]
+        expected = sorted(((key, n) for key, n in counts.items()), key=lambda item: (-item[1], item[0]))
+        assert [(item['value'], item['count']) for item in index.suggest('a', MAX_LIMIT)] == expected[:MAX_LIMIT]
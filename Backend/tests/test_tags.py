@@ -0,0 +1,69 @@
+import pytest
+
+from Backend.models.tag import Tag
+from Backend.utils.tags import parse_tags
+
+JOB = {'company': 'Tagco', 'city': 'Tagton', 'country': 'UK', 'posting_date': '2024-04-01', 'job_type': 'Full-Time'}
+
+
+@pytest.fixture
+def tagged(client):
+    ids = []
+    for title, tags in (('Pricing Actuary', 'Normtag, Othertag'), ('Reserving Actuary', 'NORMTAG'),
+                        ('Capital Actuary', ['normtag', ' Thirdtag '])):
+        response = client.post('/jobs', json={**JOB, 'title': title, 'tags': tags})
+        assert response.status_code == 201
+        ids.append(response.get_json()['id'])
+    yield ids
+    for job_pk in ids:
+        client.delete(f'/jobs/{job_pk}')
+
+
+def _titles(client, *tags, **args):
+    response = client.get('/jobs', query_string={'tag': list(tags), 'fields': 'title', **args})
+    assert response.status_code == 200
+    return sorted(job['title'] for job in response.get_json()['jobs'])
+
+
+def test_tags_differing_only_in_case_are_one_tag(app, client, tagged):
+    with app.app_context():
+        names = Tag.query.filter(Tag.name.in_(['normtag', 'Normtag', 'NORMTAG', 'othertag', 'thirdtag'])).all()
+        assert sorted(tag.name for tag in names) == ['normtag', 'othertag', 'thirdtag']
+
+    everyone = ['Capital Actuary', 'Pricing Actuary', 'Reserving Actuary']
+    assert _titles(client, 'normtag') == everyone
+    assert _titles(client, 'NormTag') == everyone
+    assert _titles(client, 'othertag', 'THIRDTAG') == ['Capital Actuary', 'Pricing Actuary']
+    assert _titles(client, 'Normtag', 'othertag', tag_mode='all') == ['Pricing Actuary']
+
+
+def test_updates_and_bulk_upserts_relink_tags(client, tagged):
+    assert client.patch(f'/jobs/{tagged[1]}', json={'tags': 'Othertag'}).status_code == 200
+    assert _titles(client, 'normtag') == ['Capital Actuary', 'Pricing Actuary']
+    assert _titles(client, 'othertag') == ['Pricing Actuary', 'Reserving Actuary']
+
+    response = client.post('/jobs/bulk', json=[{**JOB, 'title': 'Bulk Actuary', 'job_id': 'tags-bulk-1',
+                                                 'tags': 'NormTag, Bulktag'}])
+    assert response.status_code == 200
+    bulk_pk = response.get_json()['results'][0]['id']
+    try:
+        assert _titles(client, 'normtag') == ['Bulk Actuary', 'Capital Actuary', 'Pricing Actuary']
+    finally:
+        client.delete(f'/jobs/{bulk_pk}')
+
+
+def test_overlong_tag_is_rejected(client):
+    response = client.post('/jobs', json={**JOB, 'title': 'Long Tag Actuary', 'tags': 'x' * 101})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('value, names', [
+    (None, []),
+    ('', []),
+    ('Python, SQL', ['Python', 'SQL']),
+    (' Python ,, python,PYTHON , SQL', ['Python', 'SQL']),
+    (['R', 'r', ' VBA '], ['R', 'VBA']),
+    ('x' * 150, ['x' * 100]),
+])
+def test_parse_tags_trims_and_drops_case_duplicates(value, names):
+    assert parse_tags(value) == names
@@ -0,0 +1,63 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, insert, literal, select
+
+from ..cache import bump_generation
+from ..db import db
+from ..models.job import Job
+from ..models.job_archive import JobArchive, job_archive_locations, job_archive_tags
+from ..models.job_location import job_locations
+from ..models.tag import job_tags
+from . import change_log, dedup, facets
+from .search import get_search_backend
+
+ARCHIVED_COLUMNS = ('id', 'title', 'company', 'city', 'country', 'posting_date', 'job_type', 'tags', 'link', 'job_id')
+
+
+def cutoff_for(days):
+    return date.today() - timedelta(days=days)
+
+
+def archive_batch(cutoff, batch_size=500):
+    """
+    Move up to batch_size jobs posted before `cutoff`, oldest first, into
+    jobs_archive in one short transaction, along with their tag and location links, and
+    take them out of the facet counts and search index. Returns the number
+    moved (0 when nothing is left).
+    """
+    search = get_search_backend()
+    # Archived rows keep their id; jobs.id is AUTOINCREMENT on SQLite (v001), so it is never reused
+    ids = db.session.execute(select(Job.id)
+                             .where(Job.posting_date < cutoff)
+                             .order_by(Job.posting_date, Job.id)
+                             .limit(batch_size)).scalars().all()
+    if not ids:
+        return 0
+
+    snapshots = db.session.execute(select(Job.job_type, Job.country, Job.city, Job.tags)
+                                   .where(Job.id.in_(ids))).all()
+    db.session.execute(insert(JobArchive).from_select(
+        list(ARCHIVED_COLUMNS) + ['archived_at'],
+        select(*(getattr(Job, name) for name in ARCHIVED_COLUMNS), literal(datetime.utcnow()))
+        .where(Job.id.in_(ids))))
+    db.session.execute(insert(job_archive_tags).from_select(
+        ['job_id', 'tag_id'], select(job_tags.c.job_id, job_tags.c.tag_id).where(job_tags.c.job_id.in_(ids))))
+    db.session.execute(insert(job_archive_locations).from_select(
+        ['job_id', 'location'],
+        select(job_locations.c.job_id, job_locations.c.location).where(job_locations.c.job_id.in_(ids))))
+    # Their duplicates stay in jobs, so the oldest of each takes over as canonical
+    dedup.release(ids)
+    db.session.execute(delete(job_tags).where(job_tags.c.job_id.in_(ids)))
+    db.session.execute(delete(job_locations).where(job_locations.c.job_id.in_(ids)))
+    db.session.execute(delete(Job).where(Job.id.in_(ids)))
+
+    deltas = Counter()
+    for snapshot in snapshots:
+        deltas.subtract(facets.facet_rows(*snapshot))
+    facets.apply_delta(deltas)
+    search.remove_jobs(ids)
+    bump_generation()
+    change_log.record([(job_pk, 'archive') for job_pk in ids])
+    db.session.commit()
+    return len(ids)
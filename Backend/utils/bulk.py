@@ -0,0 +1,61 @@
+from collections import Counter
+
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql, sqlite
+
+from ..db import db
+from ..models.job import Job
+from . import dedup, facets, suggest
+from .locations import replace_job_locations
+from .search import get_search_backend
+from .tags import replace_job_tags
+
+UPSERT_COLUMNS = ('title', 'company', 'city', 'country', 'posting_date', 'job_type', 'tags', 'link', 'job_id')
+
+
+def _upsert_statement():
+    table = Job.__table__
+    updated = [name for name in UPSERT_COLUMNS if name != 'job_id']
+    if db.session.get_bind().dialect.name == 'mysql':
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in updated})
+    stmt = sqlite.insert(table)
+    return stmt.on_conflict_do_update(index_elements=[table.c.job_id],
+                                      set_={name: stmt.excluded[name] for name in updated})
+
+
+def _load_by_job_id(job_ids):
+    columns = [Job.id] + [getattr(Job, name) for name in UPSERT_COLUMNS]
+    return {row.job_id: row for row in db.session.execute(select(*columns).where(Job.job_id.in_(job_ids)))}
+
+
+def upsert_jobs(rows, duplicates=None):
+    """
+    Insert-or-update validated job dicts keyed on job_id with one multi-row
+    statement, then bring the tag, location, search and facet indexes along in the same
+    transaction, and link near-duplicates through the `duplicates` index if
+    given. Returns {job_id: (id, created, canonical id)}. The caller commits.
+    """
+    # Later rows for the same job_id win, as they would in sequential writes
+    rows = list({row['job_id']: {name: row.get(name) for name in UPSERT_COLUMNS} for row in rows}.values())
+    job_ids = [row['job_id'] for row in rows]
+    for row in rows:
+        row['job_type'] = row['job_type'] or 'Full-Time'
+
+    before = _load_by_job_id(job_ids)
+    db.session.execute(_upsert_statement(), rows)
+    after = _load_by_job_id(job_ids)
+
+    deltas = Counter()
+    for job_id, job in after.items():
+        if job_id in before:
+            deltas.subtract(facets.facet_rows(*facets.snapshot(before[job_id])))
+        deltas.update(facets.facet_rows(*facets.snapshot(job)))
+        suggest.record_change(suggest.snapshot(before[job_id]) if job_id in before else None, suggest.snapshot(job))
+    facets.apply_delta(deltas)
+
+    replace_job_tags({job.id: job.tags for job in after.values()})
+    replace_job_locations(after.values())
+    get_search_backend().index_jobs(list(after.values()))
+    links = dedup.link_duplicates(duplicates, list(after.values()))
+    return {job_id: (job.id, job_id not in before, links.get(job.id)) for job_id, job in after.items()}
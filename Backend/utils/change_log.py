@@ -0,0 +1,148 @@
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, event, exists, insert, select, update
+from sqlalchemy.orm import aliased
+
+from ..db import RoutingSession, db
+from ..models.cache_generation import CacheGeneration
+from ..models.job_change import JobChange
+
+MAX_LIMIT = 1000
+# cache_generations row holding the highest seq compaction has dropped a tombstone at
+HORIZON = 'job_changes_horizon'
+# cache_generations row counting committed writes to jobs. record() bumps it
+# first, and its row lock, held until commit, is what makes appends commit
+# in seq order
+WRITES = 'jobs'
+
+_committed = threading.Condition()
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+class TokenExpired(Exception):
+    """The token predates tombstones compaction has dropped; the client must resync from GET /jobs."""
+
+
+def parse_token(value):
+    if not value:
+        return 0
+    try:
+        seq = int(value)
+    except ValueError:
+        raise InvalidToken('Invalid since token') from None
+    if seq < 0:
+        raise InvalidToken('Invalid since token')
+    return seq
+
+
+def record(changes, conn=None):
+    """
+    Append (job pk, op) pairs to the change log, on `conn` if given (the
+    scraper) or the request session, as the write's last statement. It
+    bumps the WRITES row first, whose lock is held until commit, so appends
+    commit in seq order and a reader never sees seq N+1 while N is still
+    in flight.
+    """
+    if not changes:
+        return
+    executor = conn if conn is not None else db.session
+    result = executor.execute(update(CacheGeneration)
+                              .where(CacheGeneration.name == WRITES)
+                              .values(value=CacheGeneration.value + 1))
+    if result.rowcount == 0:
+        executor.execute(insert(CacheGeneration.__table__).values(name=WRITES, value=1))
+    now = datetime.utcnow()
+    executor.execute(insert(JobChange.__table__),
+                     [{'job_id': job_pk, 'op': op, 'changed_at': now} for job_pk, op in changes])
+    if conn is None:
+        db.session.info['job_changes_recorded'] = True
+
+
+def write_count():
+    """Writes committed so far by any process, for in-memory indexes to tell whether they missed some."""
+    value = db.session.execute(select(CacheGeneration.value).where(CacheGeneration.name == WRITES)).scalar()
+    return value or 0
+
+
+def horizon():
+    value = db.session.execute(select(CacheGeneration.value).where(CacheGeneration.name == HORIZON)).scalar()
+    return value or 0
+
+
+def changes_since(since, limit):
+    """
+    Up to `limit` log entries after `since` as (seq, job pk, op), keeping
+    only the latest entry per job. Returns (entries, next token, has_more).
+    """
+    if 0 < since < horizon():
+        raise TokenExpired()
+    rows = db.session.execute(select(JobChange.seq, JobChange.job_id, JobChange.op)
+                              .where(JobChange.seq > since)
+                              .order_by(JobChange.seq)
+                              .limit(limit)).all()
+    if not rows:
+        return [], since, False
+    latest = {job_pk: (seq, job_pk, op) for seq, job_pk, op in rows}
+    return sorted(latest.values()), rows[-1].seq, len(rows) == limit
+
+
+def wait_for_commit(timeout):
+    """Block until a change is committed in this process, or timeout. Returns False on timeout."""
+    with _committed:
+        return _committed.wait(timeout)
+
+
+def compact(retention_days, batch_size=1000):
+    """
+    Drop entries superseded by a later one for the same job, which no
+    client can need, then tombstones older than retention_days. Tokens
+    before the newest dropped tombstone then get TokenExpired. Returns
+    (superseded, tombstones) removed.
+    """
+    newer = aliased(JobChange)
+    superseded = (select(JobChange.seq)
+                  .where(exists().where(newer.job_id == JobChange.job_id, newer.seq > JobChange.seq))
+                  .limit(batch_size))
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    expired = (select(JobChange.seq)
+               .where(JobChange.op == 'delete', JobChange.changed_at < cutoff)
+               .limit(batch_size))
+
+    return _delete_batches(superseded), _delete_batches(expired, on_batch=_raise_horizon)
+
+
+def _delete_batches(query, on_batch=None):
+    removed = 0
+    while True:
+        seqs = db.session.execute(query).scalars().all()
+        if not seqs:
+            return removed
+        db.session.execute(delete(JobChange).where(JobChange.seq.in_(seqs)))
+        if on_batch is not None:
+            on_batch(max(seqs))
+        db.session.commit()
+        removed += len(seqs)
+
+
+def _raise_horizon(seq):
+    row = db.session.get(CacheGeneration, HORIZON)
+    if row is None:
+        db.session.add(CacheGeneration(name=HORIZON, value=seq))
+    elif row.value < seq:
+        row.value = seq
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _notify(session):
+    if session.info.pop('job_changes_recorded', False):
+        with _committed:
+            _committed.notify_all()
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _discard(session):
+    session.info.pop('job_changes_recorded', None)
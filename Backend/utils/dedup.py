@@ -0,0 +1,359 @@
+import re
+import struct
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from hashlib import blake2b, shake_128
+
+from sqlalchemy import bindparam, delete, event, func, insert, select, update
+
+from ..db import RoutingSession, db
+from ..models.job import Job
+from ..models.job_change import JobChange
+from ..models.job_signature import JobSignature
+from .locations import split_cities
+from .tags import parse_tags
+
+NUM_PERM = 64
+# The LSH buckets cover the first BANDS bands of ROWS values: postings agreeing
+# on 80% of values share a band with probability ~0.95, on half of them ~0.15.
+# Candidates are then scored on all NUM_PERM values, for a tighter estimate.
+BANDS = 10
+ROWS = 6
+DEFAULT_THRESHOLD = 0.8
+# Most candidates scored per lookup, those sharing the most bands first, so
+# a lookup stays bounded however many similar postings a company has
+MAX_CANDIDATES = 50
+# Title tokens count this many times over places and tags: another title is
+# another role, while one more city or tag is usually the same one
+TITLE_WEIGHT = 3
+
+# Company hash, then the minimum of each hash function over the posting's tokens
+_SIGNATURE = struct.Struct(f'<Q{NUM_PERM}I')
+_TOKEN_HASHES = struct.Struct(f'<{NUM_PERM}I')
+_BAND_BYTES = ROWS * 4
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def _words(value):
+    return _NON_WORD.sub(' ', (value or '').casefold()).split()
+
+
+def shingles(title, city, country, tags):
+    """
+    The tokens two postings are compared on: title words and word pairs,
+    each city of a multi-city string, the country and each tag. Title
+    tokens stand for TITLE_WEIGHT copies each (see _token_hashes).
+    """
+    words = _words(title)
+    tokens = {f't:{word}' for word in words}
+    tokens.update(f't:{first} {second}' for first, second in zip(words, words[1:]))
+    for prefix, values in (('l', split_cities(city)), ('c', [country]), ('g', parse_tags(tags))):
+        for value in values:
+            value_words = _words(value)
+            if value_words:
+                tokens.add(f'{prefix}:{" ".join(value_words)}')
+    return tokens
+
+
+@lru_cache(maxsize=8192)
+def _token_hashes(token):
+    """
+    NUM_PERM independent 32-bit hashes of a token, read off one SHAKE digest
+    so they are stable across processes. A title token hashes as its
+    TITLE_WEIGHT copies would together: the minimum over each copy's values.
+    """
+    copies = TITLE_WEIGHT if token.startswith('t:') else 1
+    digest = shake_128(token.encode('utf-8')).digest(_TOKEN_HASHES.size * copies)
+    return tuple(map(min, *(_TOKEN_HASHES.unpack_from(digest, copy * _TOKEN_HASHES.size) for copy in range(copies)),
+                     [0xFFFFFFFF] * NUM_PERM))
+
+
+def signature(title, company, city, country, tags):
+    """A posting's packed signature, or None without a company or anything to compare on."""
+    company_words = _words(company)
+    tokens = shingles(title, city, country, tags)
+    if not company_words or not tokens:
+        return None
+    company_key = int.from_bytes(blake2b(' '.join(company_words).encode('utf-8'), digest_size=8).digest(), 'little')
+    # Tags, places and common title words repeat across postings, so their hashes are cached
+    return _SIGNATURE.pack(company_key, *map(min, *(_token_hashes(token) for token in tokens), [0xFFFFFFFF] * NUM_PERM))
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures' token sets (0 across companies)."""
+    return _similarity(_SIGNATURE.unpack(first), second)
+
+
+def _similarity(values, second):
+    other = _SIGNATURE.unpack(second)
+    if values[0] != other[0]:
+        return 0.0
+    return sum(map(int.__eq__, values[1:], other[1:])) / NUM_PERM
+
+
+def _band_keys(sig):
+    # Every band key carries the company hash, so only same-company postings collide
+    company = sig[:8]
+    return [hash(bytes((band,)) + company + sig[8 + band * _BAND_BYTES:8 + (band + 1) * _BAND_BYTES])
+            for band in range(BANDS)]
+
+
+class DuplicateIndex:
+    """
+    In-memory LSH index over the signatures of canonical postings. A lookup
+    reads BANDS buckets and scores only the postings found there, however
+    many are indexed; a candidate agreeing on at least `threshold` of its
+    signature is a near-duplicate. A threshold of 0 turns dedup off.
+
+    Loaded from job_signatures on first use. This process's writes change
+    it once their transaction commits (see apply). Every refresh_seconds it
+    picks up canonical postings other processes add (the scraper, other
+    workers) and drops those deleted or archived since, from the change log.
+    Database reads happen outside the lock lookups and updates share.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, refresh_seconds=30):
+        self.threshold = threshold
+        self.refresh_seconds = refresh_seconds
+        self.signatures = {}
+        # Band key -> pk, or a list of pks once several postings share it
+        self._buckets = {}
+        self._loaded_through = None
+        self._changes_through = 0
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+        # One load at a time, without blocking lookups while it reads
+        self._load_lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.threshold > 0
+
+    def load(self, executor, since=0):
+        """Index the stored signatures of canonical postings with a pk above `since`. Returns how many."""
+        with self._load_lock:
+            return self._load(executor, since)
+
+    def sync(self, executor):
+        if self._loaded_through is not None and time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+        with self._load_lock:
+            if self._loaded_through is None:
+                self._load(executor)
+            elif time.monotonic() - self._checked_at >= self.refresh_seconds:
+                self._drop_removed(executor)
+                self._load(executor, since=self._loaded_through)
+
+    def _load(self, executor, since=0):
+        if self._loaded_through is None:
+            # Removals logged after this point are dropped by the next refresh
+            self._changes_through = executor.execute(select(func.max(JobChange.seq))).scalar() or 0
+        query = (select(JobSignature.job_id, JobSignature.signature)
+                 .join(Job, Job.id == JobSignature.job_id)
+                 .where(Job.canonical_id.is_(None), JobSignature.job_id > since)
+                 .order_by(JobSignature.job_id)
+                 .execution_options(yield_per=10000))
+        loaded = 0
+        for rows in executor.execute(query).partitions():
+            with self._lock:
+                for job_pk, sig in rows:
+                    self.add(job_pk, sig)
+            since = rows[-1][0]
+            loaded += len(rows)
+        self._loaded_through = since
+        self._checked_at = time.monotonic()
+        return loaded
+
+    def _drop_removed(self, executor):
+        removed = executor.execute(select(JobChange.seq, JobChange.job_id)
+                                   .where(JobChange.seq > self._changes_through,
+                                          JobChange.op.in_(('delete', 'archive')))
+                                   .order_by(JobChange.seq)).all()
+        if not removed:
+            return
+        with self._lock:
+            for _, job_pk in removed:
+                self.remove(job_pk)
+        self._changes_through = removed[-1].seq
+
+    def apply(self, changes):
+        """Apply (pk, signature or None to drop it) changes once the transaction that made them has committed."""
+        with self._lock:
+            for job_pk, sig in changes:
+                if sig is None:
+                    self.remove(job_pk)
+                else:
+                    self.add(job_pk, sig)
+
+    def add(self, job_pk, sig):
+        with self._lock:
+            if job_pk in self.signatures:
+                self.remove(job_pk)
+            self.signatures[job_pk] = sig
+            for key in _band_keys(sig):
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    self._buckets[key] = job_pk
+                elif isinstance(bucket, list):
+                    bucket.append(job_pk)
+                else:
+                    self._buckets[key] = [bucket, job_pk]
+
+    def remove(self, job_pk):
+        with self._lock:
+            sig = self.signatures.pop(job_pk, None)
+            if sig is None:
+                return
+            for key in _band_keys(sig):
+                bucket = self._buckets.get(key)
+                if bucket == job_pk:
+                    del self._buckets[key]
+                elif isinstance(bucket, list) and job_pk in bucket:
+                    bucket.remove(job_pk)
+                    if len(bucket) == 1:
+                        self._buckets[key] = bucket[0]
+
+    def candidates(self, sig, pending=None):
+        """
+        Indexed postings at least `threshold` similar to sig, as (similarity,
+        pk), best then oldest first. `pending` maps pks not yet in the index
+        (a batch's uncommitted postings) to signatures to score as well.
+        """
+        values = _SIGNATURE.unpack(sig)
+        with self._lock:
+            hits = Counter()
+            for key in _band_keys(sig):
+                bucket = self._buckets.get(key)
+                if isinstance(bucket, list):
+                    hits.update(bucket)
+                elif bucket is not None:
+                    hits[bucket] += 1
+            scored = [(_similarity(values, self.signatures[job_pk]), job_pk)
+                      for job_pk, _ in hits.most_common(MAX_CANDIDATES)]
+        scored += [(_similarity(values, other), job_pk) for job_pk, other in (pending or {}).items()]
+        return sorted((item for item in scored if item[0] >= self.threshold), key=lambda item: (-item[0], item[1]))
+
+
+def _stage(index, changes, conn, staged):
+    """Hold index changes until the transaction commits: on the request session, or in the caller's `staged` list."""
+    if not changes:
+        return
+    if conn is None:
+        db.session.info.setdefault('dedup_changes', []).append((index, changes))
+    elif staged is not None:
+        staged.extend(changes)
+
+
+def _set_canonical(executor, links):
+    executor.execute(update(Job.__table__).where(Job.id == bindparam('job_pk'))
+                     .values(canonical_id=bindparam('canonical')),
+                     [{'job_pk': job_pk, 'canonical': canonical} for job_pk, canonical in links])
+
+
+def _live_canonical(executor, candidates):
+    """The first candidate still stored and canonical: the index may hold postings another process changed."""
+    if not candidates:
+        return None
+    live = set(executor.execute(select(Job.id).where(Job.id.in_(candidates), Job.canonical_id.is_(None))).scalars())
+    return next((job_pk for job_pk in candidates if job_pk in live), None)
+
+
+def link_duplicates(index, jobs, conn=None, staged=None):
+    """
+    Store the signature of each written job (rows with id, title, company,
+    city, country and tags) and link it to the canonical posting it
+    repeats, in the caller's transaction: on `conn` if given (the scraper)
+    or the request session. Jobs others already link to stay canonical.
+
+    The index only changes once that transaction commits, so a rollback
+    leaves it alone: its changes wait on the session, or with `conn` are
+    appended to `staged` for the caller to apply() after committing. Copies
+    written by two concurrent transactions can both stay canonical.
+    Returns {pk: canonical pk or None}.
+    """
+    if index is None or not index.enabled or not jobs:
+        return {}
+    executor = conn if conn is not None else db.session
+    jobs = sorted(jobs, key=lambda job: job.id)
+    ids = [job.id for job in jobs]
+    signatures = {job.id: signature(job.title, job.company, job.city, job.country, job.tags) for job in jobs}
+
+    index.sync(executor)
+    table = JobSignature.__table__
+    executor.execute(delete(table).where(table.c.job_id.in_(ids)))
+    stored = [{'job_id': job_pk, 'signature': sig} for job_pk, sig in signatures.items() if sig is not None]
+    if stored:
+        executor.execute(insert(table), stored)
+    current = dict(executor.execute(select(Job.id, Job.canonical_id).where(Job.id.in_(ids))).all())
+    referenced = set(executor.execute(select(Job.canonical_id).where(Job.canonical_id.in_(ids))).scalars())
+
+    # This batch's canonical postings so far, which later ones in it may repeat
+    links, alternatives, canonical_sigs = {}, {}, {}
+    for job_pk in ids:
+        sig = signatures[job_pk]
+        found = []
+        if sig is not None and job_pk not in referenced:
+            found = [pk for _, pk in index.candidates(sig, canonical_sigs) if pk != job_pk]
+        links[job_pk], alternatives[job_pk] = (found[0], found[1:]) if found else (None, [])
+        if not found and sig is not None:
+            canonical_sigs[job_pk] = sig
+
+    # The index may hold postings another process has since deleted, archived or
+    # linked: check the chosen ones in one query and fall back for any that are gone
+    chosen = {canonical for canonical in links.values() if canonical is not None and canonical not in canonical_sigs}
+    live = set(executor.execute(select(Job.id).where(Job.id.in_(chosen), Job.canonical_id.is_(None)))
+               .scalars()) if chosen else set()
+    for job_pk, canonical in links.items():
+        if canonical is not None and canonical not in canonical_sigs and canonical not in live:
+            links[job_pk] = _live_canonical(executor, alternatives[job_pk])
+            if links[job_pk] is None and signatures[job_pk] is not None:
+                canonical_sigs[job_pk] = signatures[job_pk]
+
+    # Linked postings, and those with nothing to compare on, leave the index
+    _stage(index, [(job_pk, canonical_sigs.get(job_pk)) for job_pk in ids], conn, staged)
+    changed = [(job_pk, canonical) for job_pk, canonical in links.items() if current.get(job_pk) != canonical]
+    if changed:
+        _set_canonical(executor, changed)
+    return links
+
+
+def release(ids, index=None, conn=None, staged=None):
+    """
+    Call before jobs are deleted or archived: the oldest remaining
+    duplicate of each becomes canonical and the others are pointed at it,
+    and the jobs' signatures are dropped. `index` changes wait for the
+    commit as in link_duplicates. Returns the promoted pks.
+    """
+    executor = conn if conn is not None else db.session
+    duplicates = executor.execute(select(Job.id, Job.canonical_id)
+                                  .where(Job.canonical_id.in_(ids), Job.id.notin_(ids))
+                                  .order_by(Job.id)).all()
+    promoted = {}
+    for job_pk, canonical in duplicates:
+        promoted.setdefault(canonical, job_pk)
+    if duplicates:
+        _set_canonical(executor, [(job_pk, None if promoted[canonical] == job_pk else promoted[canonical])
+                                  for job_pk, canonical in duplicates])
+    table = JobSignature.__table__
+    executor.execute(delete(table).where(table.c.job_id.in_(ids)))
+
+    if index is not None:
+        changes = [(job_pk, None) for job_pk in ids]
+        if promoted:
+            changes += executor.execute(select(table.c.job_id, table.c.signature)
+                                        .where(table.c.job_id.in_(list(promoted.values())))).all()
+        _stage(index, [tuple(change) for change in changes], conn, staged)
+    return list(promoted.values())
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _apply_committed(session):
+    for index, changes in session.info.pop('dedup_changes', ()):
+        index.apply(changes)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('dedup_changes', None)
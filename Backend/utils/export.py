@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+import zlib
+
+from ..db import db
+from ..models.job import Job
+
+EXPORT_COLUMNS = ('id', 'title', 'company', 'city', 'country', 'posting_date', 'job_type', 'tags', 'link', 'job_id')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def export_query(query, model=Job):
+    """Narrow an ORM Job (or JobArchive) query to the exported columns."""
+    return query.with_entities(*(getattr(model, name) for name in EXPORT_COLUMNS))
+
+
+def stream_rows(query, batch_size=1000):
+    """
+    Yield batches of plain row tuples of an export_query() through a
+    server-side cursor, so only one batch is ever held in memory and no ORM
+    objects are built.
+    """
+    result = db.session.execute(query.statement.execution_options(stream_results=True, yield_per=batch_size))
+    for batch in result.partitions():
+        yield batch
+
+
+def _plain(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def encode_ndjson(batches):
+    for batch in batches:
+        yield ''.join(json.dumps(dict(zip(EXPORT_COLUMNS, map(_plain, row))), ensure_ascii=False) + '\n'
+                      for row in batch).encode('utf-8')
+
+
+def encode_csv(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows(map(lambda row: [_plain(value) for value in row], batch))
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+ENCODERS = {
+    'ndjson': encode_ndjson,
+    'csv': encode_csv,
+}
+
+
+def gzip_chunks(chunks, level=6):
+    """Compress a chunk stream incrementally into a single gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,130 @@
+from collections import Counter
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import mysql, sqlite
+
+from ..db import db
+from ..models.facet_count import FacetCount
+from ..models.job import Job
+from .locations import location_key, location_keys, split_cities
+from .tags import parse_tags, tag_key
+
+FACETS = ('job_type', 'country', 'city', 'tag')
+
+
+class TooManyJobs(ValueError):
+    pass
+
+
+def job_facets(job_type, country, city, tags):
+    """The (facet, value) pairs a job counts towards, plus its normalized job_type and tags."""
+    job_type = (job_type or '')[:255]
+    tag_names = parse_tags(tags)
+    pairs = [('job_type', job_type)] if job_type else []
+    if country and country.strip():
+        pairs.append(('country', country.strip()[:255]))
+    pairs += [('city', name) for name in split_cities(city)]
+    pairs += [('tag', name) for name in tag_names]
+    return pairs, job_type, tag_names
+
+
+def facet_rows(job_type, country, city, tags):
+    """
+    Summary keys for one job: every facet value, once unfiltered (filter_tag
+    and filter_location ''), once under each of the job's own tags (as
+    tag_key) and once under each of its locations (as location_key).
+    """
+    pairs, job_type, tag_names = job_facets(job_type, country, city, tags)
+    filters = ([('', '')] + [(tag_key(name), '') for name in tag_names]
+               + [('', key) for key in location_keys(city, country)])
+    return [(facet, value, job_type, filter_tag, filter_location)
+            for filter_tag, filter_location in filters
+            for facet, value in pairs]
+
+
+def snapshot(job):
+    return (job.job_type, job.country, job.city, job.tags)
+
+
+def apply_delta(deltas, conn=None):
+    """
+    Add a {summary key: delta} mapping to job_facet_counts with a single
+    upsert, on `conn` if given (the scraper's engine) or the request session.
+    """
+    deltas = {key: n for key, n in deltas.items() if n}
+    if not deltas:
+        return
+    executor = conn if conn is not None else db.session
+    dialect = conn.dialect.name if conn is not None else db.session.get_bind().dialect.name
+    values = [{'facet': facet, 'value': value, 'job_type': job_type, 'filter_tag': filter_tag,
+               'filter_location': filter_location, 'n': n}
+              for (facet, value, job_type, filter_tag, filter_location), n in deltas.items()]
+    table = FacetCount.__table__
+    if dialect == 'mysql':
+        stmt = mysql.insert(table)
+        stmt = stmt.on_duplicate_key_update(n=table.c.n + stmt.inserted.n)
+    else:
+        stmt = sqlite.insert(table)
+        stmt = stmt.on_conflict_do_update(index_elements=list(table.primary_key.columns),
+                                          set_={'n': table.c.n + stmt.excluded.n})
+    executor.execute(stmt, values)
+
+
+def record_change(before=None, after=None):
+    """Move a job's counts from its old snapshot to its new one (None for insert/delete)."""
+    deltas = Counter()
+    if before is not None:
+        deltas.subtract(facet_rows(*before))
+    if after is not None:
+        deltas.update(facet_rows(*after))
+    apply_delta(deltas)
+
+
+def summary_facets(job_type=None, tag=None, location=None, limit=100):
+    """Facet counts served from the summary table, optionally narrowed by job_type and one tag or location."""
+    query = (select(FacetCount.facet, FacetCount.value, func.sum(FacetCount.n).label('n'))
+             .where(FacetCount.filter_tag == (tag_key(tag) if tag else ''),
+                    FacetCount.filter_location == location_key(location))
+             .group_by(FacetCount.facet, FacetCount.value)
+             .having(func.sum(FacetCount.n) > 0))
+    if job_type:
+        query = query.where(FacetCount.job_type == job_type)
+    return _format(db.session.execute(query).all(), limit)
+
+
+def live_facets(query, limit=100, max_jobs=None):
+    """
+    Aggregate facets over an arbitrary filtered Job query, for filters the
+    summary can't answer. Raises TooManyJobs rather than read more than
+    max_jobs matching rows.
+    """
+    counts = Counter()
+    rows = query.with_entities(Job.job_type, Job.country, Job.city, Job.tags)
+    if max_jobs is not None:
+        rows = rows.limit(max_jobs + 1)
+    for seen, row in enumerate(rows.yield_per(1000), 1):
+        if max_jobs is not None and seen > max_jobs:
+            raise TooManyJobs(f'More than {max_jobs} jobs match; narrow the filters to count facets')
+        pairs, _, _ = job_facets(*row)
+        counts.update(pairs)
+    return _format([(facet, value, n) for (facet, value), n in counts.items()], limit)
+
+
+def expected_counts(conn=None):
+    """Recompute every summary row from the jobs table, on `conn` if given (migrations) or the session."""
+    executor = conn if conn is not None else db.session
+    counts = Counter()
+    rows = executor.execute(select(Job.job_type, Job.country, Job.city, Job.tags).execution_options(yield_per=1000))
+    for row in rows:
+        counts.update(facet_rows(*row))
+    return counts
+
+
+def _format(rows, limit):
+    facets = {name: [] for name in FACETS}
+    for facet, value, n in rows:
+        facets[facet].append({'value': value, 'count': int(n)})
+    for name in FACETS:
+        facets[name].sort(key=lambda item: (-item['count'], item['value']))
+        del facets[name][limit:]
+    return facets
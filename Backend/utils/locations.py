@@ -0,0 +1,53 @@
+from sqlalchemy import delete, insert, select
+
+from ..db import db
+from ..models.job_location import job_locations, locations
+
+
+def split_cities(city):
+    """The scraper stores multi-city postings as one comma-joined string."""
+    return [name.strip()[:255] for name in (city or '').split(',') if name.strip()]
+
+
+def location_key(value):
+    """How a location is stored in job_locations and matched by the location filter: trimmed, lowercased."""
+    return (value or '').strip().lower()[:100]
+
+
+def location_keys(city, country):
+    """The keys a job is found under: its country and each of its cities."""
+    keys = [location_key(country)] + [location_key(name) for name in split_cities(city)]
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+def matching_keys(term):
+    """The stored location keys containing `term` (ignoring case), as a subquery."""
+    return select(locations.c.location).where(locations.c.location.contains(location_key(term), autoescape=True))
+
+
+def only_match(term):
+    """Whether `term` matches exactly one stored location key, itself."""
+    return db.session.execute(matching_keys(term).limit(2)).scalars().all() == [location_key(term)]
+
+
+def replace_job_locations(jobs, conn=None, links=job_locations):
+    """
+    Rebuild the location rows of written jobs (rows with id, city and
+    country) on `conn` if given (the scraper) or the request session, and
+    add keys not seen before to the locations table.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    executor = conn if conn is not None else db.session
+    executor.execute(delete(links).where(links.c.job_id.in_([job.id for job in jobs])))
+    rows = [{'job_id': job.id, 'location': key} for job in jobs for key in location_keys(job.city, job.country)]
+    if not rows:
+        return
+    executor.execute(insert(links), rows)
+    keys = {row['location'] for row in rows}
+    keys -= set(executor.execute(select(locations.c.location).where(locations.c.location.in_(keys))).scalars())
+    if keys:
+        # IGNORE: a concurrent writer may add the same new key
+        executor.execute(insert(locations).prefix_with('IGNORE', dialect='mysql')
+                         .prefix_with('OR IGNORE', dialect='sqlite'), [{'location': key} for key in sorted(keys)])
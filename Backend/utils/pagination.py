@@ -0,0 +1,78 @@
+import base64
+import json
+import threading
+import time
+from datetime import date
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(posting_date, job_pk, direction='next'):
+    """Pack a (posting_date, id) position into an opaque url-safe token."""
+    payload = [posting_date.isoformat() if posting_date else None, job_pk, direction]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor. Returns (posting_date, id, direction)."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        posting_date, job_pk, direction = json.loads(base64.urlsafe_b64decode(padded))
+        if posting_date is not None:
+            posting_date = date.fromisoformat(posting_date)
+        if not isinstance(job_pk, int) or direction not in ('next', 'prev'):
+            raise ValueError
+        return posting_date, job_pk, direction
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise InvalidCursor('Invalid cursor')
+
+
+def keyset_ranges(date_col, id_col, posting_date, job_pk, ascending):
+    """
+    Filter clauses selecting the rows strictly after (posting_date, id) in
+    the given scan order, as a list to read in turn. NULL posting dates sort
+    lowest on both MySQL and SQLite, so they come first ascending and last
+    descending; an OR across the NULL boundary would stop the index seek, so
+    each clause stays on one side of it and is a single index range.
+    """
+    if ascending:
+        if posting_date is None:
+            return [and_(date_col.is_(None), id_col > job_pk), date_col.isnot(None)]
+        return [and_(date_col >= posting_date, or_(date_col > posting_date, id_col > job_pk))]
+    if posting_date is None:
+        return [and_(date_col.is_(None), id_col < job_pk)]
+    return [and_(date_col <= posting_date, or_(date_col < posting_date, id_col < job_pk)),
+            date_col.is_(None)]
+
+
+class CountCache:
+    """Tiny TTL cache for COUNT(*) results keyed on the applied filters."""
+
+    def __init__(self, ttl=30, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        now = time.monotonic()
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit and hit[1] > now:
+                return hit[0]
+        value = compute()
+        if self.ttl > 0:
+            with self._lock:
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+                self._entries[key] = (value, now + self.ttl)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
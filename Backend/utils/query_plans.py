@@ -0,0 +1,141 @@
+import itertools
+import re
+from datetime import date
+
+from werkzeug.datastructures import MultiDict
+
+from ..db import db
+from ..utils.pagination import encode_cursor
+from ..utils.serializers import parse_fields
+
+FILTER_VALUES = {
+    'job_type': [None, 'Full-Time'],
+    'location': [None, 'London'],
+    'location_exact': [None, 'true'],
+    'tag': [None, ['Python'], ['Python', 'Pricing']],
+    'tag_mode': [None, 'all'],
+    'collapse_duplicates': [None, 'true'],
+    'include_archived': [None, 'true'],
+}
+# The filters that narrow which rows match. collapse_duplicates keeps nearly every
+# row (and none of jobs_archive's), and include_archived only adds jobs_archive.
+NARROWING = ('job_type', 'location', 'tag')
+SAMPLE_CURSOR = (date(2024, 1, 1), 1000)
+
+
+def get_jobs_statements():
+    """Yield (label, select, filtered) for every filter/sort/pagination shape get_jobs can issue."""
+    from ..routes.job_routes import _keyset_queries, _lean_jobs, _order_by_date
+
+    for values in itertools.product(*FILTER_VALUES.values()):
+        chosen = dict(zip(FILTER_VALUES, values))
+        if chosen['tag_mode'] and not (chosen['tag'] and len(chosen['tag']) > 1):
+            continue
+        if chosen['location_exact'] and not chosen['location']:
+            continue
+        args = MultiDict()
+        for key, value in chosen.items():
+            for item in value if isinstance(value, list) else [value] if value else []:
+                args.add(key, item)
+        label = '&'.join(f'{key}={value}' for key, value in args.items(multi=True)) or 'no filters'
+        filtered = any(chosen[key] for key in NARROWING)
+
+        for ascending in (False, True):
+            sort = 'asc' if ascending else 'desc'
+            # The statements get_jobs runs: plain tuples, with jobs_archive UNIONed in when asked
+            lean, _ = _lean_jobs(args, parse_fields(None))
+            yield (f'{label} sort={sort} page=2',
+                   _order_by_date(lean, ascending).limit(10).offset(10).statement, filtered)
+            for direction in ('next', 'prev'):
+                token = encode_cursor(*SAMPLE_CURSOR, direction)
+                keysets, _ = _keyset_queries(lean, ascending, token)
+                for part, keyset in enumerate(keysets, 1):
+                    yield (f'{label} sort={sort} cursor={direction} range={part}',
+                           keyset.limit(11).statement, filtered)
+
+
+def explain(conn, statement):
+    """Return the plan rows for a statement as a list of dicts."""
+    compiled = statement.compile(dialect=conn.dialect, compile_kwargs={'render_postcompile': True})
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+    prefix = 'EXPLAIN QUERY PLAN ' if conn.dialect.name == 'sqlite' else 'EXPLAIN '
+    result = conn.exec_driver_sql(prefix + str(compiled), params)
+    return [dict(row._mapping) for row in result]
+
+
+def full_scan_problems(dialect, plan, filtered=True):
+    """
+    Problems in a plan that indicate jobs (or jobs_archive) is read in full
+    or sorted wholesale: a scan (even in index order) that no index lookup
+    narrows, or a sort of the rows an index range search found, since a
+    range like canonical_id IS NULL can match most of the table. Sorting
+    only the rows reached by primary key through a link index (the tag and
+    location subqueries), or only the ties on the leading ORDER BY column,
+    is fine. An unfiltered statement may walk an index in ORDER BY order,
+    since its LIMIT stops the walk after the page; pass filtered=False for
+    those.
+    """
+    problems = []
+    if dialect == 'sqlite':
+        # Each side of a UNION ALL (jobs, jobs_archive) is read and sorted on its own
+        for details in _union_branches(plan):
+            scans = [detail for detail in details if re.match(r'SCAN (jobs|jobs_archive)\b', detail)]
+            searches = [detail for detail in details if re.match(r'SEARCH (jobs|jobs_archive)\b', detail)]
+            ranges = [detail for detail in searches if 'USING INTEGER PRIMARY KEY' not in detail]
+            sorts = [detail for detail in details if detail == 'USE TEMP B-TREE FOR ORDER BY']
+            if filtered and not searches:
+                problems += scans
+            else:
+                problems += [detail for detail in scans if detail in ('SCAN jobs', 'SCAN jobs_archive')]
+            if sorts and (scans or ranges):
+                problems += sorts
+    else:
+        for row in plan:
+            if row.get('table') not in ('jobs', 'jobs_archive'):
+                continue
+            filesort = 'Using filesort' in (row.get('Extra') or '')
+            if row.get('type') == 'ALL':
+                problems.append('full table scan (type=ALL)')
+            elif row.get('type') == 'index' and filesort:
+                problems.append('full index scan with filesort')
+            elif row.get('type') == 'index' and filtered:
+                problems.append(f"full index scan of {row.get('key')}")
+            elif row.get('type') in ('ref', 'ref_or_null', 'range', 'index_merge') and filesort:
+                problems.append(f"filesort of a {row.get('type')} lookup on {row.get('key')}")
+    return problems
+
+
+def _union_branches(plan):
+    """
+    Split SQLite plan details into the LEFT/RIGHT subtrees of a MERGE (UNION
+    ALL), in plan order. A plan with no union, or rows without ids, is one
+    branch; rows outside every branch (e.g. a sort of the whole union) are
+    judged with all of them.
+    """
+    rows = {row['id']: row for row in plan if 'id' in row}
+    branches, outside = {}, []
+    for row in plan:
+        node = row
+        while node is not None and node['detail'] not in ('LEFT', 'RIGHT'):
+            node = rows.get(node.get('parent'))
+        if node is None:
+            outside.append(row['detail'])
+        else:
+            branches.setdefault(node['id'], []).append(row['detail'])
+    if not branches:
+        return [outside]
+    return [details + outside for details in branches.values()]
+
+
+def check_get_jobs_plans():
+    """Explain every get_jobs query shape. Returns [(label, problems)] for failing ones."""
+    failures = []
+    with db.engine.connect() as conn:
+        for label, statement, filtered in get_jobs_statements():
+            problems = full_scan_problems(conn.dialect.name, explain(conn, statement), filtered)
+            if problems:
+                failures.append((label, problems))
+    return failures
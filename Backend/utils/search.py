@@ -0,0 +1,130 @@
+from sqlalchemy import column, func, inspect, literal_column, select, table, text
+from sqlalchemy.dialects.mysql import match
+
+from ..db import db
+from ..models.job import Job
+
+SEARCH_COLUMNS = ('title', 'company', 'tags', 'city', 'country')
+
+
+class SearchBackend:
+    """
+    Full-text index over the searchable job columns. match() returns a
+    subquery of (id, score) rows, higher score meaning more relevant, which
+    callers join against their filtered Job query.
+    """
+
+    def create_index(self, conn):
+        raise NotImplementedError
+
+    def ensure_index(self):
+        pass
+
+    def index_job(self, job):
+        pass
+
+    def index_jobs(self, jobs, conn=None):
+        for job in jobs:
+            self.index_job(job)
+
+    def remove_job(self, job_pk):
+        pass
+
+    def remove_jobs(self, job_pks):
+        for job_pk in job_pks:
+            self.remove_job(job_pk)
+
+    def match(self, q):
+        raise NotImplementedError
+
+
+class MySQLFullTextBackend(SearchBackend):
+    """InnoDB FULLTEXT index. MySQL maintains it on every write, including the scraper's."""
+
+    INDEX_NAME = 'ft_jobs_search'
+
+    def create_index(self, conn):
+        indexes = inspect(conn).get_indexes(Job.__tablename__)
+        if not any(index['name'] == self.INDEX_NAME for index in indexes):
+            conn.execute(text(f"ALTER TABLE jobs ADD FULLTEXT INDEX {self.INDEX_NAME} "
+                              f"({', '.join(SEARCH_COLUMNS)})"))
+
+    def match(self, q):
+        score = match(*(getattr(Job, name) for name in SEARCH_COLUMNS), against=q).in_natural_language_mode()
+        return select(Job.id.label('id'), score.label('score')).where(score > 0).subquery()
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    """FTS5 shadow table keyed by jobs.id, used for local development and tests."""
+
+    fts = table('jobs_fts', column('rowid'), *(column(name) for name in SEARCH_COLUMNS))
+
+    def create_index(self, conn):
+        conn.execute(text(f"CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5({', '.join(SEARCH_COLUMNS)})"))
+        conn.execute(text("DELETE FROM jobs_fts"))
+        conn.execute(text(f"INSERT INTO jobs_fts (rowid, {', '.join(SEARCH_COLUMNS)}) "
+                          f"SELECT id, {', '.join(SEARCH_COLUMNS)} FROM jobs"))
+
+    def ensure_index(self):
+        # Build lazily on its own connection, before the caller's session holds
+        # SQLite's write lock, so local databases work without init-search
+        if not inspect(db.engine).has_table('jobs_fts'):
+            with db.engine.begin() as conn:
+                self.create_index(conn)
+
+    def index_job(self, job):
+        db.session.execute(self.fts.delete().where(self.fts.c.rowid == job.id))
+        db.session.execute(self.fts.insert().values(
+            rowid=job.id, **{name: getattr(job, name) for name in SEARCH_COLUMNS}))
+
+    def index_jobs(self, jobs, conn=None):
+        if not jobs:
+            return
+        executor = conn if conn is not None else db.session
+        executor.execute(self.fts.delete().where(self.fts.c.rowid.in_([job.id for job in jobs])))
+        executor.execute(self.fts.insert(), [
+            {'rowid': job.id, **{name: getattr(job, name) for name in SEARCH_COLUMNS}} for job in jobs])
+
+    def remove_job(self, job_pk):
+        db.session.execute(self.fts.delete().where(self.fts.c.rowid == job_pk))
+
+    def remove_jobs(self, job_pks):
+        db.session.execute(self.fts.delete().where(self.fts.c.rowid.in_(job_pks)))
+
+    def match(self, q):
+        # Quote every term so user input can't inject FTS5 query syntax; OR them
+        # together to mirror MySQL's natural language mode
+        terms = ' OR '.join('"' + term.replace('"', '""') + '"' for term in q.split())
+        fts_table = literal_column('jobs_fts')
+        return (select(self.fts.c.rowid.label('id'), (-func.bm25(fts_table)).label('score'))
+                .select_from(self.fts)
+                .where(fts_table.op('MATCH')(terms))
+                .subquery())
+
+
+_backend_classes = {
+    'mysql': MySQLFullTextBackend,
+    'sqlite': SQLiteFTS5Backend,
+}
+_backends = {}
+
+
+def backend_for_dialect(dialect):
+    """Instantiate the search backend for a dialect name, or None if unsupported."""
+    backend_class = _backend_classes.get(dialect)
+    return backend_class() if backend_class else None
+
+
+def get_search_backend():
+    """
+    Return the search backend for the configured database. Call it before
+    writing in a request so a missing SQLite index is built up front.
+    """
+    url = str(db.engine.url)
+    if url not in _backends:
+        backend = backend_for_dialect(db.engine.dialect.name)
+        if backend is None:
+            raise RuntimeError(f'Full-text search is not supported on {db.engine.dialect.name}')
+        backend.ensure_index()
+        _backends[url] = backend
+    return _backends[url]
@@ -0,0 +1,63 @@
+import hashlib
+import json
+from functools import lru_cache
+
+from ..models.job import Job
+
+# JobSchema's dump fields, in its declaration order
+JOB_FIELDS = ('id', 'title', 'company', 'city', 'country', 'posting_date', 'job_type', 'tags', 'job_id')
+# Columns the list endpoints read from each row themselves (keyset cursors)
+_ALWAYS_SELECTED = ('id', 'posting_date')
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def parse_fields(value):
+    """Validate a fields= projection. Returns the requested names in JobSchema order."""
+    if not value:
+        return JOB_FIELDS
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = requested - set(JOB_FIELDS)
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(sorted(unknown))}. Supported: {', '.join(JOB_FIELDS)}")
+    return tuple(name for name in JOB_FIELDS if name in requested)
+
+
+def selected_columns(fields):
+    """Column names to SELECT for a projection: the fields plus whatever pagination needs."""
+    return tuple(name for name in JOB_FIELDS if name in fields or name in _ALWAYS_SELECTED)
+
+
+@lru_cache(maxsize=None)
+def row_serializer(fields, columns):
+    """
+    Compile a function turning a row tuple (in `columns` order) into the dict
+    JobSchema would dump for those fields, without ORM objects or per-field
+    marshmallow dispatch.
+    """
+    items = []
+    for name in fields:
+        index = columns.index(name)
+        if name == 'posting_date':
+            expr = f'(row[{index}].strftime("%Y-%m-%d") if row[{index}] is not None else None)'
+        elif name == 'id':
+            expr = f'(int(row[{index}]) if row[{index}] is not None else None)'
+        else:
+            expr = f'row[{index}]'
+        items.append(f'{name!r}: {expr}')
+    namespace = {}
+    exec(f"def serialize(row):\n    return {{{', '.join(items)}}}\n", namespace)
+    return namespace['serialize']
+
+
+def lean_query(query, fields, model=Job):
+    """Narrow an ORM Job (or JobArchive) query to plain tuples of the columns a projection needs."""
+    columns = selected_columns(fields)
+    return query.with_entities(*(getattr(model, name) for name in columns)), row_serializer(fields, columns)
+
+
+def item_etag(item):
+    """Strong validator for one serialized job: a hash of its canonical JSON, so any field change moves it."""
+    return hashlib.sha1(json.dumps(item, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
@@ -0,0 +1,208 @@
+import heapq
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+
+from flask import current_app
+from sqlalchemy import event
+
+from ..db import RoutingSession, db
+from ..models.job import Job
+from .change_log import write_count
+from .locations import split_cities
+from .tags import parse_tags
+
+log = logging.getLogger(__name__)
+
+SUGGEST_FIELDS = ('title', 'company', 'city', 'country', 'tag')
+MAX_LIMIT = 50
+# Prefixes matching more distinct values than this keep their top MAX_LIMIT
+# cached; narrower ones are ranked on each request
+SCAN_LIMIT = 256
+_END = '\U0010ffff'
+
+
+def _rank(entry):
+    return -entry[1], entry[0]
+
+
+def suggest_values(title, company, city, country, tags):
+    """The (field, value) pairs a job counts towards, with multi-city strings split."""
+    pairs = [(field, value.strip()[:255]) for field, value in
+             (('title', title), ('company', company), ('country', country)) if value and value.strip()]
+    pairs += [('city', name) for name in split_cities(city)]
+    pairs += [('tag', name) for name in parse_tags(tags)]
+    return pairs
+
+
+def snapshot(job):
+    return (job.title, job.company, job.city, job.country, job.tags)
+
+
+def record_change(before=None, after=None):
+    """
+    Queue a job's suggestion changes (snapshots, None for insert/delete) on
+    the request session. SuggestIndex applies them once the transaction
+    commits; a rollback drops them.
+    """
+    deltas = db.session.info.setdefault('suggest_changes', Counter())
+    if before is not None:
+        deltas.subtract(suggest_values(*before))
+    if after is not None:
+        deltas.update(suggest_values(*after))
+
+
+class PrefixIndex:
+    """
+    One field's distinct values as a sorted list of casefolded keys plus a
+    [display value, job count] entry per key. A prefix matches the key range
+    found by two bisects. Top lists of wide ranges are cached as entry
+    references and kept in order as counts change, so a write rarely forces
+    a full rescan.
+    """
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+        self.keys = sorted(self.entries)
+        self._top = {}
+
+    def suggest(self, prefix, limit):
+        key = prefix.casefold()
+        top = self._top.get(key)
+        if top is None:
+            lo = bisect_left(self.keys, key)
+            hi = bisect_left(self.keys, key + _END, lo)
+            wide = hi - lo > SCAN_LIMIT
+            entries = self.entries
+            top = heapq.nsmallest(MAX_LIMIT if wide else limit, (entries[k] for k in self.keys[lo:hi]), key=_rank)
+            if wide:
+                self._top[key] = top
+        return [{'value': value, 'count': count} for value, count in top[:limit]]
+
+    def add(self, value, n):
+        key = value.casefold()
+        entry = self.entries.get(key)
+        if entry is None:
+            if n <= 0:
+                return
+            entry = self.entries[key] = [value, 0]
+            insort(self.keys, key)
+        entry[1] += n
+        if entry[1] <= 0:
+            del self.entries[key]
+            del self.keys[bisect_left(self.keys, key)]
+        for i in range(len(key) + 1):
+            top = self._top.get(key[:i])
+            if top is not None and not self._adjust(top, entry, n):
+                del self._top[key[:i]]
+
+    @staticmethod
+    def _adjust(top, entry, n):
+        """Update a cached top list after entry's count moved by n. False if it must be recomputed."""
+        present = any(item is entry for item in top)
+        if entry[1] <= 0:
+            return not present
+        if present:
+            top.sort(key=_rank)
+            # A value outside the list may now outrank one that dropped to last place
+            return n > 0 or len(top) < MAX_LIMIT or top[-1] is not entry
+        if len(top) < MAX_LIMIT:
+            top.append(entry)
+            top.sort(key=_rank)
+        elif _rank(entry) < _rank(top[-1]):
+            top[-1] = entry
+            top.sort(key=_rank)
+        return True
+
+
+class SuggestIndex:
+    """
+    In-memory typeahead over job titles, companies, cities, countries and
+    tags, ranked by how many jobs use each value. Built from the jobs table
+    on first use, then kept current from the write routes' record_change
+    calls as their transactions commit.
+
+    Every committed write bumps change_log's write count once, so the index
+    knows which count it should be at. Writes it did not see (the scraper,
+    other workers) leave the stored count ahead; that is checked at most
+    every refresh_seconds and triggers a rebuild in a background thread
+    while the old index keeps serving.
+    """
+
+    def __init__(self, refresh_seconds=30):
+        self.refresh_seconds = refresh_seconds
+        self.fields = None
+        self.generation = None
+        self._checked_at = 0.0
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        event.listen(RoutingSession, 'after_commit', self._after_commit)
+        event.listen(RoutingSession, 'after_rollback', _discard_changes)
+
+    def suggest(self, field, prefix, limit=10):
+        if self.fields is None:
+            with self._build_lock:
+                if self.fields is None:
+                    self._build()
+        else:
+            self._maybe_refresh()
+        with self._lock:
+            return self.fields[field].suggest(prefix, limit)
+
+    def _build(self):
+        started = time.perf_counter()
+        generation = write_count()
+        entries = {field: {} for field in SUGGEST_FIELDS}
+        rows = db.session.query(Job.title, Job.company, Job.city, Job.country, Job.tags).yield_per(5000)
+        for row in rows:
+            for field, value in suggest_values(*row):
+                entry = entries[field].get(value.casefold())
+                if entry is None:
+                    entries[field][value.casefold()] = [value, 1]
+                else:
+                    entry[1] += 1
+        db.session.rollback()
+        fields = {field: PrefixIndex(values) for field, values in entries.items()}
+        with self._lock:
+            self.fields, self.generation = fields, generation
+        self._checked_at = time.monotonic()
+        log.info('Built suggestion index (%s) in %.1fs', ', '.join(
+            f'{len(index.keys)} {field}' for field, index in fields.items()), time.perf_counter() - started)
+
+    def _maybe_refresh(self):
+        now = time.monotonic()
+        if self._rebuilding or now - self._checked_at < self.refresh_seconds:
+            return
+        self._checked_at = now
+        if write_count() == self.generation:
+            return
+        self._rebuilding = True
+        threading.Thread(target=self._rebuild, args=(current_app._get_current_object(),), daemon=True).start()
+
+    def _rebuild(self, app):
+        try:
+            with app.app_context(), self._build_lock:
+                self._build()
+        except Exception:
+            log.exception('Rebuilding the suggestion index failed')
+        finally:
+            self._rebuilding = False
+
+    def _after_commit(self, session):
+        changes = session.info.pop('suggest_changes', None)
+        if changes is None:
+            return
+        with self._lock:
+            if self.fields is None:
+                return
+            for (field, value), n in changes.items():
+                if n:
+                    self.fields[field].add(value, n)
+            self.generation += 1
+
+
+def _discard_changes(session):
+    session.info.pop('suggest_changes', None)
@@ -0,0 +1,55 @@
+from ..db import db
+from ..models.tag import Tag, job_tags
+
+
+def parse_tags(value):
+    """Split a comma-joined tag string (or list) into unique, trimmed names."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    seen = {}
+    for tag in value:
+        name = str(tag).strip()[:100]
+        if name and name.lower() not in seen:
+            seen[name.lower()] = name
+    return list(seen.values())
+
+
+def tag_key(name):
+    """How a tag name is stored and matched: tags that differ only in case are one tag."""
+    return name.lower()
+
+
+def get_or_create_tags(names):
+    """Resolve tag names to Tag rows, creating the missing ones in the current session."""
+    keys = list(dict.fromkeys(tag_key(name) for name in names))
+    if not keys:
+        return []
+    existing = {tag.name: tag for tag in Tag.query.filter(Tag.name.in_(keys)).all()}
+    for key in keys:
+        if key not in existing:
+            existing[key] = Tag(name=key)
+            db.session.add(existing[key])
+    return [existing[key] for key in keys]
+
+
+def sync_job_tags(job):
+    """Rebuild the job_tags rows for a job from its Job.tags string."""
+    job.tag_list = get_or_create_tags(parse_tags(job.tags))
+
+
+def replace_job_tags(tags_by_job):
+    """Set-based variant of sync_job_tags for bulk writes: {job pk: tag string}."""
+    if not tags_by_job:
+        return
+    names_by_job = {job_pk: parse_tags(tags) for job_pk, tags in tags_by_job.items()}
+    tags = get_or_create_tags([name for names in names_by_job.values() for name in names])
+    db.session.flush()
+    tag_ids = {tag.name: tag.id for tag in tags}
+
+    db.session.execute(job_tags.delete().where(job_tags.c.job_id.in_(list(names_by_job))))
+    links = [{'job_id': job_pk, 'tag_id': tag_ids[tag_key(name)]}
+             for job_pk, names in names_by_job.items() for name in names]
+    if links:
+        db.session.execute(job_tags.insert(), links)
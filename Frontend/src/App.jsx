@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { getJobs, createJob, updateJob, deleteJob } from './api';
+import { getJobs, getFacets, createJob, updateJob, deleteJob } from './api';
 import JobBoard from './Pages/JobBoard';
 import AddEditJob from './Components/AddEditJob';
 import DeleteJob from './Components/DeleteJob';
@@ -15,6 +15,7 @@ function App() {
   const [isLoading, setIsLoading] = useState(true);
   const [jobTypeFilter, setJobTypeFilter] = useState('All Job Types');
   const [locationFilter, setLocationFilter] = useState('All Locations');
+  const [locations, setLocations] = useState([]);
   const [sortBy, setSortBy] = useState('posting_date_desc');
   const [pagination, setPagination] = useState({
     page: 1,
@@ -28,10 +29,25 @@ function App() {
     fetchJobs();
   }, [jobTypeFilter, locationFilter, sortBy, pagination.page]);
 
+  useEffect(() => {
+    fetchLocations();
+  }, [jobTypeFilter]);
+
   useEffect(() => {
     filterJobs();
   }, [jobs, searchTerm]);
 
+  // Countries and cities with jobs of the selected type, most jobs first
+  const fetchLocations = async () => {
+    try {
+      const response = await getFacets({ jobType: jobTypeFilter });
+      const { country, city } = response.data.facets;
+      setLocations([...country, ...city].map(item => item.value));
+    } catch (error) {
+      console.error('Error fetching locations:', error);
+    }
+  };
+
   const fetchJobs = async () => {
     try {
       setIsLoading(true);
@@ -209,7 +225,7 @@ const filterJobs = () => {
         setLocationFilter={setLocationFilter}
         sortBy={sortBy}
         setSortBy={setSortBy}
-        jobs={jobs}
+        locations={locations}
       />
       
       <JobBoard 
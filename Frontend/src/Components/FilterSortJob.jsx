@@ -9,10 +9,9 @@ const FilterSortJob = ({
   setLocationFilter, 
   sortBy,
   setSortBy,
-  jobs 
+  locations
 }) => {
-  // Extract unique locations from jobs
-  const locations = ['All Locations', ...new Set(jobs.map(job => `${job.city}, ${job.country}`))];
+  const locationOptions = ['All Locations', ...new Set(locations)];
   
   return (
     <div className="px-4 py-4 sm:px-6 lg:px-8">
@@ -44,7 +43,7 @@ const FilterSortJob = ({
               value={locationFilter}
               onChange={(e) => setLocationFilter(e.target.value)}
             >
-              {locations.map((location, index) => (
+              {locationOptions.map((location, index) => (
                 <option key={index}>{location}</option>
               ))}
             </select>
@@ -24,6 +24,18 @@ export const getJobs = (params = {}) => {
   return api.get(`/jobs?${queryParams.toString()}`);
 };
 
+// GET /jobs/facets - counts per job type, country, city and tag under the given filters
+export const getFacets = (params = {}) => {
+  const { jobType, location, tag } = params;
+  const queryParams = new URLSearchParams();
+
+  if (jobType && jobType !== 'All Job Types') queryParams.append('job_type', jobType);
+  if (location && location !== 'All Locations') queryParams.append('location', location);
+  if (tag) queryParams.append('tag', tag);
+
+  return api.get(`/jobs/facets?${queryParams.toString()}`);
+};
+
 // GET /jobs/:id
 export const getJob = (id) => api.get(`/jobs/${id}`);
 
@@ -0,0 +1,59 @@
+"""
+Time each installed extraction backend over saved HTML pages, parsing the
+whole page and only the job-card region, and check every combination builds
+the same record as the original full-page html.parser path.
+
+    python benchmark_parsers.py [page.html ...] [--repeat 20]
+
+With no files it uses fixtures/listing_page.html, a trimmed listing page.
+"""
+import argparse
+import os
+import time
+
+from extract import BACKENDS, available_backends, extract_job
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'listing_page.html')
+URL = 'https://www.actuarylist.com/actuarial-jobs/1-fixture'
+
+
+def pages_per_sec(pages, backend, region, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            extract_job(html, URL, backend, region)
+    return repeat * len(pages) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('files', nargs='*', default=[DEFAULT_FIXTURE])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = []
+    for path in args.files:
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    expected = [extract_job(html, URL, 'bs4', region=False) for html in pages]
+
+    installed = available_backends()
+    missing = [name for name in BACKENDS if name not in installed]
+    print(f"{len(pages)} page(s), {sum(map(len, pages)) // 1024} KiB" +
+          (f"; not installed: {', '.join(missing)}" if missing else ''))
+    print(f"{'backend':>12} {'full page/s':>12} {'region page/s':>14} {'speedup':>8}")
+    baseline = None
+    for backend in BACKENDS:
+        if backend not in installed:
+            continue
+        for region in (False, True):
+            got = [extract_job(html, URL, backend, region) for html in pages]
+            assert got == expected, f'{backend} (region={region}) output differs from the html.parser reference'
+        full = pages_per_sec(pages, backend, False, args.repeat)
+        cut = pages_per_sec(pages, backend, True, args.repeat)
+        baseline = baseline or full
+        print(f'{backend:>12} {full:>12.1f} {cut:>14.1f} {cut / baseline:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+import calendar
+import re
+from datetime import datetime, timedelta
+
+from bs4 import BeautifulSoup
+
+TITLE_CLASS = 'Job_job-card__position__ic1rc'
+COMPANY_CLASS = 'Job_job-card__company__7T9qY'
+LOCATIONS_CLASS = 'Job_job-card__locations__x1exr'
+COUNTRY_CLASS = 'Job_job-card__country__GRVhK'
+LOCATION_CLASS = 'Job_job-card__location__bq7jX'
+POSTED_CLASS = 'Job_job-card__posted-on__NCZaJ'
+TAGS_CLASS = 'Job_mobile-tag-container__PE6K3'
+
+# Each field's first element ends at the first matching close tag after its
+# class: none of them nest another element of the same tag name
+_REGION_MARKERS = (
+    (TITLE_CLASS, '</p>'),
+    (COMPANY_CLASS, '</p>'),
+    (LOCATIONS_CLASS, '</div>'),
+    (POSTED_CLASS, '</p>'),
+    (TAGS_CLASS, '</div>'),
+)
+
+
+def extract_job_id(url):
+    """Extract jobId from URL (e.g., 33794 from /actuarial-jobs/33794-metlife)."""
+    match = re.search(r'/actuarial-jobs/(\d+)-', url)
+    return match.group(1) if match else None
+
+def convert_relative_date(relative_date):
+    """
+    Convert relative date strings like '8d ago', '2h ago', '3m ago', '1y ago' to actual dates.
+    Returns a date string in 'YYYY-MM-DD' format.
+    """
+    if not relative_date:
+        return datetime.now().strftime('%Y-%m-%d')
+
+
+    match = re.match(r'(\d+)\s*([dhmy])\s*ago', relative_date.lower())
+    if not match:
+        return datetime.now().strftime('%Y-%m-%d')
+
+    number, unit = match.groups()
+    number = int(number)
+
+
+    current_date = datetime.now()
+
+
+    if unit == 'd':  # days
+        result_date = current_date - timedelta(days=number)
+    elif unit == 'h':  # hours
+        result_date = current_date - timedelta(hours=number)
+    elif unit == 'm':  # months
+
+        month = current_date.month - number
+        year = current_date.year
+        while month <= 0:
+            month += 12
+            year -= 1
+
+
+        _, last_day = calendar.monthrange(year, month)
+        day = min(current_date.day, last_day)
+
+        result_date = datetime(year, month, day)
+    elif unit == 'y':  # years
+        result_date = current_date.replace(year=current_date.year - number)
+    else:
+        result_date = current_date
+
+    return result_date.strftime('%Y-%m-%d')
+
+def card_region(html):
+    """
+    Cut the page down to the span holding the first job card's fields, so the
+    parser never walks the <head>, the scripts or the rest of the page. Falls
+    back to the whole page when no card is found.
+    """
+    starts = [html.find(marker) for marker, _ in _REGION_MARKERS]
+    starts = [i for i in starts if i >= 0]
+    if not starts:
+        return html
+    start = html.rfind('<', 0, min(starts))
+    end = 0
+    for marker, close in _REGION_MARKERS:
+        i = html.find(marker)
+        if i >= 0:
+            j = html.find(close, i)
+            end = max(end, j + len(close) if j >= 0 else len(html))
+    return html[start:end]
+
+
+# Each backend returns (title, company, country, cities, posted, tags) with
+# the text of the first matching elements, stripped as the original parser did
+
+def _fields_bs4(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    title = soup.find('p', class_=TITLE_CLASS)
+    company = soup.find('p', class_=COMPANY_CLASS)
+    country = ''
+    cities = []
+    location_div = soup.find('div', class_=LOCATIONS_CLASS)
+    if location_div:
+        country_elem = location_div.find('a', class_=COUNTRY_CLASS)
+        country = country_elem.text.strip() if country_elem else ''
+        cities = [elem.text.strip() for elem in location_div.find_all('a', class_=LOCATION_CLASS)]
+    posted = soup.find('p', class_=POSTED_CLASS)
+    tags_div = soup.find('div', class_=TAGS_CLASS)
+    tags = [tag.text.strip() for tag in tags_div.find_all('a', class_=LOCATION_CLASS)] if tags_div else None
+    return (title.text.strip() if title else None, company.text.strip() if company else None,
+            country, cities, posted.text.strip() if posted else None, tags)
+
+
+def _fields_lxml(html):
+    import lxml.html
+
+    def has_class(name):
+        return f'[contains(concat(" ", normalize-space(@class), " "), " {name} ")]'
+
+    def first(nodes):
+        return nodes[0].text_content().strip() if nodes else None
+
+    root = lxml.html.document_fromstring(html)
+    country = ''
+    cities = []
+    location_div = root.xpath(f'(//div{has_class(LOCATIONS_CLASS)})[1]')
+    if location_div:
+        country = first(location_div[0].xpath(f'.//a{has_class(COUNTRY_CLASS)}')) or ''
+        cities = [a.text_content().strip() for a in location_div[0].xpath(f'.//a{has_class(LOCATION_CLASS)}')]
+    tags_div = root.xpath(f'(//div{has_class(TAGS_CLASS)})[1]')
+    tags = [a.text_content().strip() for a in tags_div[0].xpath(f'.//a{has_class(LOCATION_CLASS)}')] if tags_div else None
+    return (first(root.xpath(f'(//p{has_class(TITLE_CLASS)})[1]')),
+            first(root.xpath(f'(//p{has_class(COMPANY_CLASS)})[1]')),
+            country, cities, first(root.xpath(f'(//p{has_class(POSTED_CLASS)})[1]')), tags)
+
+
+def _fields_selectolax(html):
+    from selectolax.lexbor import LexborHTMLParser
+
+    def text(node):
+        return node.text(deep=True).strip() if node is not None else None
+
+    tree = LexborHTMLParser(html)
+    country = ''
+    cities = []
+    location_div = tree.css_first(f'div.{LOCATIONS_CLASS}')
+    if location_div is not None:
+        country = text(location_div.css_first(f'a.{COUNTRY_CLASS}')) or ''
+        cities = [text(a) for a in location_div.css(f'a.{LOCATION_CLASS}')]
+    tags_div = tree.css_first(f'div.{TAGS_CLASS}')
+    tags = [text(a) for a in tags_div.css(f'a.{LOCATION_CLASS}')] if tags_div is not None else None
+    return (text(tree.css_first(f'p.{TITLE_CLASS}')), text(tree.css_first(f'p.{COMPANY_CLASS}')),
+            country, cities, text(tree.css_first(f'p.{POSTED_CLASS}')), tags)
+
+
+BACKENDS = {
+    'bs4': ('bs4', _fields_bs4),
+    'lxml': ('lxml', _fields_lxml),
+    'selectolax': ('selectolax', _fields_selectolax),
+}
+# Fastest first; 'auto' picks the first one installed
+PREFERRED = ('selectolax', 'lxml', 'bs4')
+
+
+def available_backends():
+    import importlib.util
+    return [name for name in PREFERRED if importlib.util.find_spec(BACKENDS[name][0]) is not None]
+
+
+def resolve_backend(name='auto'):
+    if name == 'auto':
+        return available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser '{name}'. Choose from: auto, {', '.join(BACKENDS)}")
+    if name not in available_backends():
+        raise ValueError(f"Parser '{name}' is not installed (pip install {BACKENDS[name][0]})")
+    return name
+
+
+def extract_job(html, url, backend='bs4', region=True):
+    """
+    Build a job record from a job posting page. A pure function of its
+    arguments, so it can run in a worker process. `region=False` parses the
+    whole page, as the scraper originally did.
+    """
+    fields = BACKENDS[backend][1]
+    title, company, country, cities, posted, tags = fields(card_region(html) if region else html)
+    cities = [city for city in cities if city]
+    return {
+        'title': title or '',
+        'company': company or '',
+        'city': ', '.join(cities),
+        'country': country,
+        'posting_date': convert_relative_date(posted) if posted else None,
+        'posting_date_relative': posted,
+        'job_type': 'Full-Time',
+        'tags': ', '.join(tags) if tags else '',
+        'link': url,
+        'job_id': extract_job_id(url)
+    }
@@ -0,0 +1,191 @@
+import logging
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from webdriver_manager.chrome import ChromeDriverManager
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36"
+
+
+class RateLimiter:
+    """Spaces requests to the same host at least 1/rate seconds apart, across threads."""
+
+    def __init__(self, rate_per_host):
+        self.interval = 1.0 / rate_per_host if rate_per_host > 0 else 0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class HttpFetcher:
+    """Plain HTTP GETs with one requests.Session per worker thread."""
+
+    def __init__(self, timeout=20):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        if not hasattr(self._local, 'session'):
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            self._local.session = session
+        return self._local.session
+
+    def fetch(self, url):
+        response = self._session().get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+
+def setup_driver(headless=True):
+    """Initialize Selenium WebDriver with Chrome."""
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument(f"user-agent={USER_AGENT}")
+    options.add_argument("--log-level=3")
+    options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+
+def handle_popup(driver):
+    """Close any popups if present."""
+    try:
+        close_popup = WebDriverWait(driver, 5).until(
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Cancel') or contains(text(), 'Close')]"))
+        )
+        driver.execute_script("arguments[0].click();", close_popup)
+        logging.info("Closed popup.")
+    except Exception:
+        logging.info("No popup detected.")
+
+
+class DriverPool:
+    """
+    A small pool of headless Chrome drivers for pages that need JavaScript.
+    Drivers are started lazily, so a crawl that never falls back to the
+    browser never launches one.
+    """
+
+    def __init__(self, size=2, headless=True, wait_selector=None, acquire_timeout=120):
+        self.size = size
+        self.headless = headless
+        self.wait_selector = wait_selector
+        self.acquire_timeout = acquire_timeout
+        self._idle = queue.Queue()
+        self._created = 0
+        self._all = []
+        self._lock = threading.Lock()
+
+    def _new_driver(self, url):
+        driver = setup_driver(self.headless)
+        try:
+            # Suppress the site's sign-up popup for every page this driver loads
+            driver.get(url)
+            driver.execute_script("localStorage.setItem('showPopupForm', 'false');")
+        except Exception:
+            driver.quit()
+            raise
+        return driver
+
+    def _acquire(self, url):
+        """
+        Take an idle driver, or start one while the pool is below size.
+        Raises the start-up error if a driver can't be started, and
+        TimeoutError if none comes free within acquire_timeout.
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            with self._lock:
+                create = self._idle.empty() and self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    driver = self._new_driver(url)
+                except Exception:
+                    # Give the slot back, or later fetches would wait for a driver that never comes
+                    with self._lock:
+                        self._created -= 1
+                    raise
+                with self._lock:
+                    self._all.append(driver)
+                return driver
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No browser driver came free within {self.acquire_timeout:g}s")
+            # Wake up now and then in case a failed start-up freed a slot
+            try:
+                return self._idle.get(timeout=min(remaining, 1.0))
+            except queue.Empty:
+                pass
+
+    def fetch(self, url, wait_time=20):
+        driver = self._acquire(url)
+        try:
+            driver.get(url)
+            if self.wait_selector:
+                WebDriverWait(driver, wait_time).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self.wait_selector)))
+            handle_popup(driver)
+            return driver.page_source
+        finally:
+            self._idle.put(driver)
+
+    def close(self):
+        with self._lock:
+            drivers, self._all = self._all, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+class Fetcher:
+    """
+    Rate-limited page fetches: plain HTTP first, and the browser pool only
+    when the caller's `usable` check says the HTML lacks the content.
+    """
+
+    def __init__(self, rate_per_host=2.0, driver_pool_size=2, use_browser=True, timeout=20, wait_selector=None):
+        self.limiter = RateLimiter(rate_per_host)
+        self.http = HttpFetcher(timeout)
+        self.drivers = DriverPool(driver_pool_size, wait_selector=wait_selector) if use_browser else None
+
+    def fetch(self, url, usable=lambda html: True):
+        self.limiter.wait(url)
+        try:
+            html = self.http.fetch(url)
+            if usable(html) or self.drivers is None:
+                return html
+            logging.info(f"HTTP response for {url} lacks content; falling back to browser")
+        except requests.RequestException as e:
+            logging.warning(f"HTTP fetch failed for {url}: {e}")
+            html = None
+        if self.drivers is None:
+            return html
+        self.limiter.wait(url)
+        return self.drivers.fetch(url)
+
+    def close(self):
+        if self.drivers is not None:
+            self.drivers.close()
@@ -0,0 +1,134 @@
+import logging
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    page INTEGER,
+    card_hash TEXT,
+    refresh INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    retries INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_urls_state ON urls (state, kind, next_attempt);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class Frontier:
+    """
+    Durable crawl state in a local SQLite file: every discovered URL with
+    its state (pending, in_flight, done or failed), retry count and next
+    attempt time, plus the last listing page fully processed. A run with
+    resume=True carries on from there; otherwise the file starts over.
+
+    Detail URLs go pending -> in_flight when fetched, and -> done once their
+    record is committed to the jobs database. A failed fetch, or a write
+    the database rejects, goes back to pending with exponential backoff
+    until max_retries, then to failed. URLs in flight when a run died are
+    pending again on resume.
+    """
+
+    def __init__(self, path, resume=False, max_retries=3, backoff=30.0):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        with self._lock:
+            if resume:
+                self._conn.execute("UPDATE urls SET state = 'pending' WHERE state = 'in_flight'")
+            else:
+                self._conn.execute("DELETE FROM urls")
+                self._conn.execute("DELETE FROM meta")
+        if resume:
+            logging.info(f"Resuming crawl after listing page {self.last_page}: {self.counts()}")
+
+    @property
+    def last_page(self):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'last_page'").fetchone()
+        return int(row[0]) if row else 0
+
+    def add(self, entries, kind='detail', page=None):
+        """Record newly discovered URLs as pending: {url: (card_hash, refresh)}. Known URLs are left alone."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO urls (url, kind, page, card_hash, refresh, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(url, kind, page, card_hash, int(refresh), now) for url, (card_hash, refresh) in entries.items()])
+
+    def claim_due(self):
+        """Move every detail URL whose (re)try is due to in_flight. Returns {url: (card_hash, refresh)}."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                "SELECT url, card_hash, refresh FROM urls WHERE state = 'pending' AND kind = 'detail' "
+                "AND next_attempt <= ? ORDER BY page, rowid", (now,)).fetchall()
+            self._conn.executemany("UPDATE urls SET state = 'in_flight', updated_at = ? WHERE url = ?",
+                                   [(now, url) for url, _, _ in rows])
+            self._conn.execute("COMMIT")
+        return {url: (card_hash, bool(refresh)) for url, card_hash, refresh in rows}
+
+    def mark_done(self, urls):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany("UPDATE urls SET state = 'done', last_error = NULL, updated_at = ? WHERE url = ?",
+                                   [(now, url) for url in urls])
+
+    def fail(self, url, error):
+        """
+        Count a failed attempt. Returns the backoff in seconds before the URL
+        is due again, or None once it has used up its retries.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT retries FROM urls WHERE url = ?", (url,)).fetchone()
+            retries = (row[0] if row else 0) + 1
+            if retries > self.max_retries:
+                state, delay = 'failed', None
+            else:
+                state, delay = 'pending', self.backoff * 2 ** (retries - 1)
+            self._conn.execute(
+                "UPDATE urls SET state = ?, retries = ?, next_attempt = ?, last_error = ?, updated_at = ? WHERE url = ?",
+                (state, retries, now + (delay or 0), str(error)[:500], now, url))
+        return delay
+
+    def fail_all(self, urls, error):
+        """fail() each URL, e.g. those of a batch the jobs database would not take."""
+        for url in urls:
+            self.fail(url, error)
+
+    def page_done(self, page, url):
+        """Checkpoint a listing page once all its detail URLs are in the frontier."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("UPDATE urls SET state = 'done', updated_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_page', ?)", (str(page),))
+            self._conn.execute("COMMIT")
+
+    def next_retry_in(self):
+        """Seconds until the earliest pending detail retry is due, or None if nothing is waiting."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt) FROM urls WHERE state = 'pending' AND kind = 'detail'").fetchone()
+        return max(0.0, row[0] - time.time()) if row[0] is not None else None
+
+    def counts(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall())
+
+    def close(self):
+        self._conn.close()
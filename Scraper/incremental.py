@@ -0,0 +1,63 @@
+import logging
+import threading
+from collections import Counter
+
+from sqlalchemy import select
+
+from Backend.models.job import Job
+from Backend.models.job_archive import JobArchive
+from Backend.models.listing_card import ListingCard
+
+
+class KnownJobs:
+    """
+    The job_ids already stored, each with the hash of its listing card when
+    it was last fetched, loaded once at startup. Decides which detail pages
+    an incremental crawl can skip and counts what it saved.
+    """
+
+    def __init__(self, card_hashes):
+        self.card_hashes = card_hashes
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, engine):
+        card_hashes = {}
+        # Archived postings count as known too, so they aren't fetched and stored again
+        with engine.connect() as conn:
+            for model in (JobArchive, Job):
+                card_hashes.update(conn.execute(select(model.job_id, ListingCard.card_hash)
+                                                .outerjoin(ListingCard, ListingCard.job_id == model.job_id)
+                                                .where(model.job_id.is_not(None))).all())
+        logging.info(f"Loaded {len(card_hashes)} known job ids")
+        return cls(card_hashes)
+
+    def __contains__(self, job_id):
+        return job_id in self.card_hashes
+
+    def check(self, job_id, card_hash):
+        """
+        Classify a listing card: 'new' (never stored), 'changed' (stored but
+        its card differs, so re-fetch), 'unhashed' (stored before hashes were
+        kept; adopt the hash without a fetch) or 'unchanged'.
+        """
+        if job_id is None or job_id not in self.card_hashes:
+            status = 'new'
+        elif self.card_hashes[job_id] is None:
+            status = 'unhashed'
+        elif self.card_hashes[job_id] != card_hash:
+            status = 'changed'
+        else:
+            status = 'unchanged'
+        with self._lock:
+            self.stats[status] += 1
+            # A card repeated on a later page of the same run is not fetched twice
+            if job_id is not None:
+                self.card_hashes[job_id] = card_hash
+        return status
+
+    def report(self):
+        skipped = self.stats['unchanged'] + self.stats['unhashed']
+        logging.info(f"Incremental crawl: {self.stats['new']} new, {self.stats['changed']} changed and re-fetched, "
+                     f"{skipped} detail fetches saved, {self.stats['pages_saved']} listing pages not visited")
@@ -1,16 +1,27 @@
+import argparse
+import hashlib
 import logging
+import os
+import sys
 import time
-import re
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
+from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 import mysql.connector
-from datetime import datetime, timedelta
-import calendar
+from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError
+
+# The scraper shares the backend's schema and migrations instead of keeping its own DDL
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from Backend import migrations
+from Backend.cache import RedisCacheBackend
+from Backend.utils.dedup import DEFAULT_THRESHOLD, DuplicateIndex
+from extract import PREFERRED, extract_job, extract_job_id, resolve_backend
+from fetcher import Fetcher
+from frontier import Frontier
+from incremental import KnownJobs
+from writer import BatchWriter
 
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -23,341 +34,300 @@ DB_NAME = 'actuary_jobs_dbb'
 
 JOBS_URL = "https://www.actuarylist.com"
 
-def setup_database():
+def setup_database(database_url=None, pool_size=2):
+    """
+    Return a pooled engine for the jobs database, creating the MySQL database
+    if needed and bringing it to the backend's schema via its migrations.
+    Pass a sqlite:/// URL to write to a local file instead (used for testing).
+    """
     try:
-        conn = mysql.connector.connect(host=DB_HOST, user=DB_USER, password=DB_PASSWORD)
-        cursor = conn.cursor()
-        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}")
-        conn.database = DB_NAME
-        
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jobs (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                title VARCHAR(255),
-                company VARCHAR(255),
-                city VARCHAR(255),
-                country VARCHAR(255),
-                posting_date DATE,  -- Changed to DATE type
-                job_type VARCHAR(255) DEFAULT 'Full-Time',
-                tags TEXT,
-                link VARCHAR(255),
-                job_id VARCHAR(50),
-                UNIQUE KEY unique_job (job_id)
-            )
-        """)
-        
-        conn.commit()
+        if database_url is None:
+            conn = mysql.connector.connect(host=DB_HOST, user=DB_USER, password=DB_PASSWORD)
+            cursor = conn.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}")
+            cursor.close()
+            conn.close()
+            database_url = f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+            engine = create_engine(database_url, pool_size=pool_size, pool_pre_ping=True)
+        else:
+            engine = create_engine(database_url)
+
+        applied = migrations.upgrade(engine)
+        if applied:
+            logging.info(f"Applied schema migrations: {applied}")
+
         logging.info("Database and table ready.")
-        return conn, cursor
-    except mysql.connector.Error as err:
+        return engine
+    except (mysql.connector.Error, SQLAlchemyError) as err:
         logging.error(f"Database error: {err}")
         exit(1)
 
-def setup_driver():
-    """Initialize Selenium WebDriver with Chrome."""
-    options = webdriver.ChromeOptions()
-    # options.add_argument("--headless") 
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36")
-    options.add_argument("--log-level=3")
-    options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    return driver
-
-def handle_popup(driver):
-    """Close any popups if present."""
-    try:
-        close_popup = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Cancel') or contains(text(), 'Close')]"))
-        )
-        driver.execute_script("arguments[0].click();", close_popup)
-        logging.info("Closed popup.")
-    except:
-        logging.info("No popup detected.")
-
-def extract_job_id(url):
-    """Extract jobId from URL (e.g., 33794 from /actuarial-jobs/33794-metlife)."""
-    match = re.search(r'/actuarial-jobs/(\d+)-', url)
-    return match.group(1) if match else None
-
-def convert_relative_date(relative_date):
+def parse_job_details(html, url, parser='bs4', pool=None):
     """
-    Convert relative date strings like '8d ago', '2h ago', '3m ago', '1y ago' to actual dates.
-    Returns a date string in 'YYYY-MM-DD' format.
+    Extract a job record from a job posting page's HTML with the given
+    extract.py backend, in a worker process when a `pool` is given.
     """
-    if not relative_date:
-        return datetime.now().strftime('%Y-%m-%d')
-    
-    
-    match = re.match(r'(\d+)\s*([dhmy])\s*ago', relative_date.lower())
-    if not match:
-        return datetime.now().strftime('%Y-%m-%d')
-    
-    number, unit = match.groups()
-    number = int(number)
-    
-    
-    current_date = datetime.now()
-    
-   
-    if unit == 'd':  # days
-        result_date = current_date - timedelta(days=number)
-    elif unit == 'h':  # hours
-        result_date = current_date - timedelta(hours=number)
-    elif unit == 'm':  # months
-        
-        month = current_date.month - number
-        year = current_date.year
-        while month <= 0:
-            month += 12
-            year -= 1
-        
-        
-        _, last_day = calendar.monthrange(year, month)
-        day = min(current_date.day, last_day)
-        
-        result_date = datetime(year, month, day)
-    elif unit == 'y':  # years
-        result_date = current_date.replace(year=current_date.year - number)
-    else:
-        result_date = current_date
-    
-    return result_date.strftime('%Y-%m-%d')
-
-def scrape_job_details(driver, url):
-    """Scrape job details from a job posting page."""
     try:
-        
-        driver.execute_script("window.location.href = arguments[0];", url)
-        WebDriverWait(driver, 20).until(EC.url_contains("/actuarial-jobs/"))
-        
-        
-        if len(driver.window_handles) > 1:
-            driver.switch_to.window(driver.window_handles[0])
-            for handle in driver.window_handles[1:]:
-                driver.switch_to.window(handle)
-                driver.close()
-            driver.switch_to.window(driver.window_handles[0])
-        
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-        # Extract fields
-        job_title = soup.find('p', class_='Job_job-card__position__ic1rc')
-        job_title = job_title.text.strip() if job_title else ''
-
-        company = soup.find('p', class_='Job_job-card__company__7T9qY')
-        company = company.text.strip() if company else ''
-
-        location_div = soup.find('div', class_='Job_job-card__locations__x1exr')
-        city = ''
-        country = ''
-        if location_div:
-            country_elem = location_div.find('a', class_='Job_job-card__country__GRVhK')
-            country = country_elem.text.strip() if country_elem else ''
-            
-            city_elems = location_div.find_all('a', class_='Job_job-card__location__bq7jX')
-            cities = [elem.text.strip() for elem in city_elems if elem.text.strip()]
-            city = ', '.join(cities) if cities else ''
-
-        posting_date_elem = soup.find('p', class_='Job_job-card__posted-on__NCZaJ')
-        posting_date_relative = posting_date_elem.text.strip() if posting_date_elem else None
-        
-        # Convert relative date to actual date
-        posting_date_actual = convert_relative_date(posting_date_relative) if posting_date_relative else None
-
-        tags_div = soup.find('div', class_='Job_mobile-tag-container__PE6K3')
-        tags_str = ''
-        if tags_div:
-            tags = [tag.text.strip() for tag in tags_div.find_all('a', class_='Job_job-card__location__bq7jX')]
-            tags_str = ', '.join(tags)
-
-        job_id = extract_job_id(url)
-        job_type = 'Full-Time'  
-
-        return {
-            'title': job_title,
-            'company': company,
-            'city': city,
-            'country': country,
-            'posting_date': posting_date_actual,  
-            'posting_date_relative': posting_date_relative,  
-            'job_type': job_type,
-            'tags': tags_str,
-            'link': url,
-            'job_id': job_id
-        }
+        if pool is not None:
+            return pool.submit(extract_job, html, url, parser).result()
+        return extract_job(html, url, parser)
     except Exception as e:
         logging.error(f"Error scraping job details for {url}: {e}")
         return None
 
-def save_job_to_db(cursor, conn, job_data):
-    """Save job data to MySQL database."""
-    if not job_data:
-        return
-    try:
-        cursor.execute("""
-            INSERT IGNORE INTO jobs 
-            (title, company, city, country, posting_date, job_type, tags, link, job_id)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            job_data['title'],
-            job_data['company'],
-            job_data['city'],
-            job_data['country'],
-            job_data['posting_date'], 
-            job_data['job_type'],
-            job_data['tags'],
-            job_data['link'],
-            job_data['job_id']
-        ))
-        conn.commit()
-        logging.info(f"Saved job: {job_data['title']} at {job_data['company']} (Posted: {job_data['posting_date']})")
-    except mysql.connector.Error as err:
-        logging.error(f"Database error saving job {job_data['title']}: {err}")
-
-def wait_for_job_cards(driver, max_attempts=3, wait_time=10):
-    """Wait for job cards to load with retries."""
-    for attempt in range(max_attempts):
-        try:
-            section = WebDriverWait(driver, wait_time).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "section.Job_grid-section__kgIsR"))
-            )
-            cards = section.find_elements(By.CSS_SELECTOR, ".Job_job-card__YgDAV.Job_job-card-active__6V_ep")
-            if len(cards) > 0:
-                return cards
-            logging.info(f"No job cards found on attempt {attempt + 1}. Retrying...")
-            time.sleep(5)  
-        except:
-            logging.info(f"Attempt {attempt + 1} failed to find job section. Retrying...")
-            time.sleep(5)
-    logging.error("Failed to find job cards after retries. Saving page source for debugging.")
-    with open(f"page_source_page_{attempt}.html", "w", encoding="utf-8") as f:
-        f.write(driver.page_source)
-    return []
-
-def get_page_url(page):
-    """Get the URL for a specific page."""
-    return f"{JOBS_URL}?page={page}"
+def has_job_card(html):
+    """True when a page's HTML already contains the rendered job card."""
+    return bool(html) and 'Job_job-card__position__ic1rc' in html
 
-def main():
-    """Main function to scrape jobs from Actuary List."""
-    conn, cursor = setup_database()
-    driver = setup_driver()
+def scrape_job_details(fetcher, url, parse=parse_job_details):
+    """Fetch a job posting page (HTTP first, browser if needed) and parse it."""
+    html = fetcher.fetch(url, usable=has_job_card)
+    if not has_job_card(html):
+        logging.error(f"No job card found for {url}")
+        return None
+    return parse(html, url)
 
-    try:
-        
-        driver.get(JOBS_URL)
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        driver.execute_script("localStorage.setItem('showPopupForm', 'false');")
-        driver.refresh()
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        handle_popup(driver)
-
-        
-        driver.get(get_page_url(1))
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        with open("page_source.html", "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
-        logging.info("Saved page source to page_source.html")
-
-        page = 1
-        max_pages = 5  
-
-        while page <= max_pages:
-            logging.info(f"Scraping page {page}")
-            try:
-               
-                if driver.current_url != get_page_url(page):
-                    logging.warning(f"Unexpected URL: {driver.current_url}. Navigating to {get_page_url(page)}")
-                    driver.get(get_page_url(page))
-                    WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-
-                
-                cards = wait_for_job_cards(driver)
-                logging.info(f"Found {len(cards)} job cards on page {page}")
-
-                if len(cards) == 0:
-                    logging.error(f"No job cards found on page {page}. Skipping to next page or exiting.")
-                    break
-
-                for idx in range(len(cards)):
-                    try:
-                        
-                        section = WebDriverWait(driver, 20).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "section.Job_grid-section__kgIsR"))
-                        )
-                        cards = wait_for_job_cards(driver)
-                        if idx >= len(cards):
-                            logging.warning(f"Index {idx} exceeds available cards on page {page}. Skipping.")
-                            continue
-                        card = cards[idx]
-                        a = WebDriverWait(card, 10).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "a.Job_job-page-link__a5I5g"))
-                        )
-                        link = a.get_attribute('href')
-                        if not link or link.startswith("data:"):
-                            logging.warning(f"Invalid link for job {idx}: {link}. Skipping.")
-                            continue
-                        logging.info(f"Processing job link: {link}")
-
-                        
-                        job_data = scrape_job_details(driver, link)
-                        save_job_to_db(cursor, conn, job_data)
-
-                        
-                        driver.get(get_page_url(page))
-                        WebDriverWait(driver, 20).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "section.Job_grid-section__kgIsR"))
-                        )
-                        time.sleep(2)
-
-                    except Exception as e:
-                        logging.error(f"Error processing job {idx} on page {page}: {e}")
-                        try:
-                            if len(driver.window_handles) > 1:
-                                driver.switch_to.window(driver.window_handles[0])
-                                for handle in driver.window_handles[1:]:
-                                    driver.switch_to.window(handle)
-                                    driver.close()
-                                driver.switch_to.window(driver.window_handles[0])
-                            driver.get(get_page_url(page))
-                            WebDriverWait(driver, 20).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, "section.Job_grid-section__kgIsR"))
-                            )
-                        except:
-                            logging.error("Failed to return to listings page. Continuing to next job.")
-                        continue
-
-                
-                try:
-                    next_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Next')]"))
-                    )
-                    driver.execute_script("arguments[0].click();", next_button)
-                    time.sleep(10)  
-                    WebDriverWait(driver, 20).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "section.Job_grid-section__kgIsR"))
-                    )
-                    page += 1
-                except:
-                    logging.info("No more pages or Next button disabled.")
-                    break
+def card_hash(card):
+    """
+    Fingerprint a listing card's content: title, company, locations and tags.
+    The relative 'posted' age is left out, since it changes every day.
+    """
+    parts = [el.get_text(' ', strip=True) for el in card.find_all(['p', 'a'])
+             if 'Job_job-card__posted-on__NCZaJ' not in el.get('class', [])]
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+def harvest_job_links(html, base_url=JOBS_URL):
+    """
+    Collect every job detail link on a listing page in one pass, in page
+    order, as {link: hash of its listing card}.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    links = {}
+    for a in soup.select('a.Job_job-page-link__a5I5g'):
+        href = a.get('href')
+        if not href or href.startswith("data:"):
+            logging.warning(f"Invalid job link: {href}. Skipping.")
+            continue
+        link = urljoin(base_url, href)
+        if link not in links:
+            links[link] = card_hash(a.parent)
+    return links
+
+def has_job_links(html):
+    return bool(html) and 'Job_job-page-link__a5I5g' in html
+
+def get_page_url(page, base_url=JOBS_URL):
+    """Get the URL for a specific page."""
+    return f"{base_url}?page={page}"
 
+def fetch_job_details(fetcher, links, concurrency, parse=parse_job_details):
+    """
+    Fetch and parse detail pages on a bounded worker pool, yielding
+    (link, record, error) as they finish; record is None on failure.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(scrape_job_details, fetcher, link, parse): link for link in links}
+        for future in as_completed(futures):
+            link = futures[future]
+            try:
+                job_data = future.result()
             except Exception as e:
-                logging.error(f"Error on page {page}: {e}")
-                break
+                logging.error(f"Error processing job link {link}: {e}")
+                yield link, None, e
+                continue
+            yield link, job_data, None if job_data else 'no job record extracted'
+
+def fetch_pending(fetcher, save, frontier, concurrency, parse=parse_job_details):
+    """Fetch every detail URL the frontier has due, saving the records. Returns how many were saved."""
+    entries = frontier.claim_due()
+    saved = 0
+    for link, job_data, error in fetch_job_details(fetcher, list(entries), concurrency, parse):
+        if job_data is None:
+            delay = frontier.fail(link, error)
+            if delay is not None:
+                logging.info(f"Will retry {link} in {delay:g}s")
+            continue
+        job_data['card_hash'], job_data['refresh'] = entries[link]
+        save(job_data)
+        saved += 1
+    return saved
+
+def fetch_listing(fetcher, frontier, url):
+    """Fetch a listing page, retrying with the frontier's backoff. Returns None once retries run out."""
+    while True:
+        try:
+            html = fetcher.fetch(url, usable=has_job_links)
+            if html is not None:
+                return html
+            error = 'no response'
+        except Exception as e:
+            error = e
+        delay = frontier.fail(url, error)
+        if delay is None:
+            return None
+        logging.warning(f"Error fetching {url}: {error}; retrying in {delay:g}s")
+        time.sleep(delay)
+
+def select_links(links, known, incremental, save):
+    """
+    Decide which harvested links need their detail page fetched. Returns
+    ({link: is_refresh}, all_known); with incremental=False every link is
+    fetched, but known jobs whose card changed are still marked for refresh.
+    """
+    to_fetch = {}
+    all_known = True
+    for link, link_hash in links.items():
+        job_id = extract_job_id(link)
+        status = known.check(job_id, link_hash)
+        if status == 'new':
+            all_known = False
+        elif status == 'unhashed' and incremental:
+            # Stored before card hashes were kept: record one, skip the fetch
+            save({'job_id': job_id, 'card_hash': link_hash, 'card_only': True})
+            continue
+        elif status == 'unchanged' and incremental:
+            continue
+        to_fetch[link] = status == 'changed'
+    return to_fetch, all_known
+
+def crawl(fetcher, save, base_url=JOBS_URL, max_pages=5, concurrency=4,
+          known=None, incremental=False, stop_after_known_pages=2, parse=parse_job_details,
+          frontier=None, deadline=None):
+    """
+    Walk listing pages, harvesting all card links from each page at once and
+    fetching their detail pages concurrently. `save` is called with each
+    record on the calling thread. Returns the number of records passed to it.
+
+    With `incremental`, detail pages of `known` jobs are skipped unless their
+    listing card changed, and the walk stops after `stop_after_known_pages`
+    consecutive pages holding only known jobs.
+
+    Progress is checkpointed in `frontier`: the walk starts after its last
+    finished listing page, detail URLs left pending by an earlier run are
+    fetched first, and failed fetches are retried with backoff. The crawl
+    stops at `deadline` (a time.monotonic() value) leaving the rest pending.
+    """
+    known = known if known is not None else KnownJobs({})
+    frontier = frontier if frontier is not None else Frontier(':memory:')
+
+    def out_of_time(wait=0):
+        return deadline is not None and time.monotonic() + wait >= deadline
+
+    saved = fetch_pending(fetcher, save, frontier, concurrency, parse)
+    known_pages = 0
+    for page in range(frontier.last_page + 1, max_pages + 1):
+        if out_of_time():
+            logging.info(f"Time limit reached before page {page}; continue with --resume.")
+            break
+        logging.info(f"Scraping page {page}")
+        page_url = get_page_url(page, base_url)
+        frontier.add({page_url: (None, False)}, kind='listing', page=page)
+        html = fetch_listing(fetcher, frontier, page_url)
+        if html is None:
+            logging.error(f"Giving up on page {page}; continue with --resume.")
+            break
+        if page == 1 and html:
+            with open("page_source.html", "w", encoding="utf-8") as f:
+                f.write(html)
+            logging.info("Saved page source to page_source.html")
+
+        links = harvest_job_links(html or '', base_url)
+        logging.info(f"Found {len(links)} job cards on page {page}")
+        if not links:
+            logging.info("No more pages.")
+            frontier.mark_done([page_url])
+            break
+
+        to_fetch, all_known = select_links(links, known, incremental, save)
+        frontier.add({link: (links[link], refresh) for link, refresh in to_fetch.items()}, page=page)
+        frontier.page_done(page, page_url)
+        saved += fetch_pending(fetcher, save, frontier, concurrency, parse)
+
+        known_pages = known_pages + 1 if all_known else 0
+        if incremental and known_pages >= stop_after_known_pages:
+            logging.info(f"{known_pages} consecutive pages of known jobs; stopping.")
+            known.stats['pages_saved'] += max_pages - page
+            break
+
+    # Wait out the backoff of failed detail pages, within the time limit
+    while (wait := frontier.next_retry_in()) is not None:
+        if out_of_time(wait):
+            logging.info("Time limit reached with retries pending; continue with --resume.")
+            break
+        time.sleep(wait)
+        saved += fetch_pending(fetcher, save, frontier, concurrency, parse)
+    return saved
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape jobs from Actuary List into the jobs database.")
+    parser.add_argument('--base-url', default=JOBS_URL, help="Site root; point at a local fixture server for testing.")
+    parser.add_argument('--max-pages', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=4, help="Detail pages fetched in parallel.")
+    parser.add_argument('--rate-limit', type=float, default=2.0, help="Max requests per second per host (0 = unlimited).")
+    parser.add_argument('--driver-pool-size', type=int, default=2, help="Headless browsers for pages that need JavaScript.")
+    parser.add_argument('--no-browser', action='store_true', help="Plain HTTP only; never start Chrome.")
+    parser.add_argument('--database-url', help="SQLAlchemy URL to write to instead of the MySQL settings above, e.g. sqlite:///jobs.db.")
+    parser.add_argument('--batch-size', type=int, default=100, help="Rows per insert batch / transaction.")
+    parser.add_argument('--flush-interval', type=float, default=2.0, help="Max seconds a partial batch waits before it is written.")
+    parser.add_argument('--writer-workers', type=int, default=2, help="Concurrent batch writers (pooled connections).")
+    parser.add_argument('--incremental', action='store_true', help="Skip detail pages of stored jobs whose listing card is unchanged.")
+    parser.add_argument('--stop-after-known-pages', type=int, default=2,
+                        help="With --incremental, stop after this many consecutive pages of only known jobs.")
+    parser.add_argument('--parser', choices=('auto',) + PREFERRED, default='auto',
+                        help="HTML extraction backend; auto picks the fastest installed.")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="Parse detail pages in this many worker processes (0 = on the fetch threads).")
+    parser.add_argument('--frontier', default='crawl_frontier.db', help="SQLite file holding the crawl's progress.")
+    parser.add_argument('--resume', action='store_true', help="Continue the crawl recorded in --frontier instead of starting over.")
+    parser.add_argument('--max-retries', type=int, default=3, help="Attempts per failed page before it is marked failed.")
+    parser.add_argument('--retry-backoff', type=float, default=30.0, help="Seconds before the first retry; doubles each time.")
+    parser.add_argument('--time-limit', type=float, help="Stop after this many seconds, leaving the rest for --resume.")
+    parser.add_argument('--dedup-threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Link postings this similar to an earlier one of the same company (0 = off).")
+    parser.add_argument('--cache-redis-url',
+                        help="The API's RESPONSE_CACHE_REDIS_URL, so written batches retire its cached pages at once.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Main function to scrape jobs from Actuary List."""
+    args = parse_args(argv)
+    try:
+        backend = resolve_backend(args.parser)
+    except ValueError as err:
+        logging.error(err)
+        exit(1)
+    engine = setup_database(args.database_url, pool_size=args.writer_workers)
+    known = KnownJobs.load(engine)
+    duplicates = DuplicateIndex(threshold=args.dedup_threshold)
+    if duplicates.enabled:
+        with engine.connect() as conn:
+            logging.info(f"Loaded {duplicates.load(conn)} posting signatures for duplicate detection")
+    frontier = Frontier(args.frontier, resume=args.resume, max_retries=args.max_retries, backoff=args.retry_backoff)
+    writer = BatchWriter(engine, batch_size=args.batch_size, flush_interval=args.flush_interval,
+                         workers=args.writer_workers, on_written=frontier.mark_done, on_failed=frontier.fail_all,
+                         duplicates=duplicates,
+                         cache=RedisCacheBackend.from_url(args.cache_redis_url) if args.cache_redis_url else None)
+    deadline = time.monotonic() + args.time_limit if args.time_limit else None
+    parse_pool = ProcessPoolExecutor(args.parse_workers) if args.parse_workers > 0 else None
+    logging.info(f"Parsing detail pages with {backend}" + (f" in {args.parse_workers} processes" if parse_pool else ""))
+    fetcher = Fetcher(rate_per_host=args.rate_limit, driver_pool_size=args.driver_pool_size,
+                      use_browser=not args.no_browser, wait_selector="section.Job_grid-section__kgIsR")
 
+    try:
+        crawl(fetcher, writer.submit, base_url=args.base_url, max_pages=args.max_pages, concurrency=args.concurrency,
+              known=known, incremental=args.incremental, stop_after_known_pages=args.stop_after_known_pages,
+              parse=partial(parse_job_details, parser=backend, pool=parse_pool), frontier=frontier, deadline=deadline)
+        if args.incremental:
+            known.report()
     finally:
-        if len(driver.window_handles) > 1:
-            driver.switch_to.window(driver.window_handles[0])
-            for handle in driver.window_handles[1:]:
-                driver.switch_to.window(handle)
-                driver.close()
-            driver.switch_to.window(driver.window_handles[0])
-        driver.quit()
-        cursor.close()
-        conn.close()
+        fetcher.close()
+        if parse_pool is not None:
+            parse_pool.shutdown()
+        writer.close()
+        logging.info(f"Frontier {args.frontier}: {frontier.counts()}")
+        frontier.close()
+        engine.dispose()
         logging.info("Scraping completed.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
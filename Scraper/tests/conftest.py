@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The scraper's modules import each other as top-level modules, as when run from Scraper/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,136 @@
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import fetcher
+import scrape
+from fetcher import Fetcher
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'listing_page.html')
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Answers every path with the saved listing page, which also holds a full job card."""
+
+    requested = []
+
+    def do_GET(self):
+        self.requested.append(self.path)
+        with open(FIXTURE, 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    FixtureHandler.requested = []
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def no_browser(monkeypatch):
+    def setup_driver(headless=True):
+        raise AssertionError('the browser was started for a page plain HTTP already served')
+    monkeypatch.setattr(fetcher, 'setup_driver', setup_driver)
+
+
+def test_crawl_extracts_jobs_over_http_without_a_driver(site, no_browser, tmp_path, monkeypatch):
+    # crawl() dumps page 1 to page_source.html in the working directory
+    monkeypatch.chdir(tmp_path)
+    pages = Fetcher(rate_per_host=0, driver_pool_size=1)
+    records = []
+    try:
+        saved = scrape.crawl(pages, records.append, base_url=site, max_pages=1, concurrency=2)
+    finally:
+        pages.close()
+
+    assert saved == len(records) == 3
+    assert pages.drivers._created == 0
+    assert {record['job_id'] for record in records} == {'34422', '34402', '34315'}
+    assert all(record['title'] and record['company'] for record in records)
+    assert sorted(FixtureHandler.requested) == sorted(['/?page=1', '/actuarial-jobs/34422-hannover-re',
+                                                       '/actuarial-jobs/34402-just', '/actuarial-jobs/34315-just'])
+
+
+def test_fetch_falls_back_to_the_browser_when_html_lacks_content(site, monkeypatch):
+    pages = Fetcher(rate_per_host=0, driver_pool_size=1)
+    monkeypatch.setattr(pages.drivers, 'fetch', lambda url: 'rendered')
+    assert pages.fetch(site, usable=lambda html: 'never present' in html) == 'rendered'
+    assert pages.fetch(site, usable=scrape.has_job_links) != 'rendered'
+
+
+class FakeDriver:
+    page_source = '<html>rendered</html>'
+
+    def get(self, url):
+        pass
+
+    def execute_script(self, script):
+        pass
+
+    def quit(self):
+        pass
+
+
+def test_failed_driver_start_frees_its_slot(site, monkeypatch):
+    starts = []
+
+    def setup_driver(headless=True):
+        starts.append(headless)
+        raise RuntimeError('chrome not found')
+    monkeypatch.setattr(fetcher, 'setup_driver', setup_driver)
+
+    pages = Fetcher(rate_per_host=0, driver_pool_size=1)
+    lacks_content = lambda html: False  # noqa: E731
+    # Each fetch gets the start-up error, instead of the second one waiting forever
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match='chrome not found'):
+            pages.fetch(site, usable=lacks_content)
+    assert len(starts) == 3
+    assert pages.drivers._created == 0
+
+
+def test_concurrent_fetches_fail_rather_than_hang_when_drivers_cannot_start(site, monkeypatch):
+    def setup_driver(headless=True):
+        raise RuntimeError('chrome not found')
+    monkeypatch.setattr(fetcher, 'setup_driver', setup_driver)
+    pages = Fetcher(rate_per_host=0, driver_pool_size=1)
+    errors = []
+
+    def fetch():
+        try:
+            pages.fetch(site, usable=lambda html: False)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(errors) == 4
+
+
+def test_acquire_times_out_when_every_driver_is_busy(monkeypatch):
+    monkeypatch.setattr(fetcher, 'setup_driver', lambda headless=True: FakeDriver())
+    pool = fetcher.DriverPool(size=1, acquire_timeout=0.2)
+    busy = pool._acquire('http://127.0.0.1/')
+    with pytest.raises(TimeoutError):
+        pool._acquire('http://127.0.0.1/')
+    pool._idle.put(busy)
+    assert pool._acquire('http://127.0.0.1/') is busy
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from frontier import Frontier
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LISTING = 'https://example.com/jobs?page=1'
+DETAILS = [f'https://example.com/jobs/{i}' for i in range(1, 5)]
+
+
+def crash_mid_run(path):
+    """Run part of a crawl in another process that dies without closing the frontier."""
+    script = textwrap.dedent(f"""
+        import os
+        from frontier import Frontier
+
+        frontier = Frontier({path!r})
+        frontier.add({{{LISTING!r}: (None, False)}}, kind='listing', page=1)
+        frontier.add({{url: ('hash', False) for url in {DETAILS!r}}}, page=1)
+        frontier.page_done(1, {LISTING!r})
+        frontier.add({{'https://example.com/jobs?page=2': (None, False)}}, kind='listing', page=2)
+        claimed = list(frontier.claim_due())
+        frontier.mark_done(claimed[:1])
+        os._exit(1)
+    """)
+    result = subprocess.run([sys.executable, '-c', script], cwd=SCRAPER_DIR)
+    assert result.returncode == 1
+
+
+def test_resume_after_a_crash_refetches_only_unfinished_urls(tmp_path):
+    path = str(tmp_path / 'frontier.db')
+    crash_mid_run(path)
+
+    frontier = Frontier(path, resume=True)
+    assert frontier.last_page == 1
+    # The three URLs in flight when the process died are due again; the written one is not
+    assert frontier.counts() == {'done': 2, 'pending': 4}
+    assert list(frontier.claim_due()) == DETAILS[1:]
+    frontier.close()
+
+
+def test_fresh_run_starts_over(tmp_path):
+    path = str(tmp_path / 'frontier.db')
+    crash_mid_run(path)
+
+    frontier = Frontier(path)
+    assert frontier.last_page == 0
+    assert frontier.counts() == {}
+    frontier.close()
+
+
+def test_failed_urls_back_off_then_give_up(tmp_path):
+    frontier = Frontier(str(tmp_path / 'frontier.db'), max_retries=2, backoff=10.0)
+    frontier.add({DETAILS[0]: (None, False)})
+    assert list(frontier.claim_due()) == [DETAILS[0]]
+
+    assert frontier.fail(DETAILS[0], 'timeout') == 10.0
+    assert frontier.claim_due() == {}
+    assert 9 < frontier.next_retry_in() <= 10
+    assert frontier.fail(DETAILS[0], 'timeout') == 20.0
+    assert frontier.fail(DETAILS[0], 'timeout') is None
+    assert frontier.counts() == {'failed': 1}
+    assert frontier.next_retry_in() is None
+    frontier.close()
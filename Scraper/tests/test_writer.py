@@ -0,0 +1,127 @@
+import threading
+from collections import Counter
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+
+import writer
+from Backend import migrations
+from Backend.models.facet_count import FacetCount
+from Backend.models.job import Job
+from Backend.utils import facets
+from frontier import Frontier
+from writer import BatchWriter
+
+
+def record(job_id, **overrides):
+    return {'title': 'Pricing Actuary', 'company': 'Writerco', 'city': 'London', 'country': 'UK',
+            'posting_date': '2024-04-01', 'job_type': 'Full-Time', 'tags': 'Python, Pricing',
+            'link': f'https://example.com/jobs/{job_id}', 'job_id': job_id, **overrides}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    migrations.upgrade(engine)
+    yield engine
+    engine.dispose()
+
+
+def write(engine, records, **options):
+    batch_writer = BatchWriter(engine, batch_size=len(records), flush_interval=0.05, retry_backoff=0, **options)
+    for item in records:
+        batch_writer.submit(item)
+    batch_writer.close()
+    return batch_writer
+
+
+def stored_job_ids(engine):
+    with engine.connect() as conn:
+        return sorted(conn.execute(select(Job.job_id)).scalars())
+
+
+def facet_drift(engine):
+    with engine.connect() as conn:
+        stored = {(row.facet, row.value, row.job_type, row.filter_tag, row.filter_location): row.n
+                  for row in conn.execute(select(FacetCount)) if row.n}
+        expected = {key: n for key, n in facets.expected_counts(conn).items() if n}
+    return {key: (stored.get(key, 0), expected.get(key, 0))
+            for key in stored.keys() | expected.keys() if stored.get(key, 0) != expected.get(key, 0)}
+
+
+def test_batch_is_written_with_its_facets(engine):
+    batch_writer = write(engine, [record('w-1'), record('w-2', city='Leeds', tags='Reserving')])
+
+    assert batch_writer.stats['rows_written'] == 2
+    assert stored_job_ids(engine) == ['w-1', 'w-2']
+    assert facet_drift(engine) == {}
+
+
+def test_job_the_api_inserts_first_is_counted_once(engine, monkeypatch):
+    load_jobs = writer._load_jobs
+    raced = []
+
+    def load_then_race(conn, job_ids):
+        loaded = load_jobs(conn, job_ids)
+        if not raced:
+            # The API stores one of the batch's job_ids between the batch's read and its insert
+            raced.append(True)
+            with engine.begin() as api:
+                api.execute(Job.__table__.insert(), writer._row(record('race-1')))
+                facets.apply_delta(Counter(facets.facet_rows('Full-Time', 'UK', 'London', 'Python, Pricing')), api)
+        return loaded
+
+    monkeypatch.setattr(writer, '_load_jobs', load_then_race)
+    batch_writer = write(engine, [record('race-1'), record('race-2')])
+
+    assert batch_writer.stats['rows_failed'] == 0
+    assert stored_job_ids(engine) == ['race-1', 'race-2']
+    assert facet_drift(engine) == {}
+
+
+def test_transient_error_retries_the_batch(engine, monkeypatch):
+    write_batch = writer.write_batch
+    attempts = []
+
+    def locked_once(conn, records, duplicates=None, staged=None):
+        attempts.append(len(records))
+        if len(attempts) == 1:
+            raise OperationalError('INSERT INTO jobs', {}, Exception('database is locked'))
+        return write_batch(conn, records, duplicates, staged)
+
+    monkeypatch.setattr(writer, 'write_batch', locked_once)
+    written = []
+    batch_writer = write(engine, [record('retry-1')], on_written=written.extend)
+
+    assert attempts == [1, 1]
+    assert batch_writer.stats['rows_written'] == 1
+    assert written == ['https://example.com/jobs/retry-1']
+
+
+def test_failed_batch_returns_its_urls_to_the_frontier(engine, tmp_path):
+    frontier = Frontier(str(tmp_path / 'frontier.db'))
+    bad = record('bad-1', posting_date='yesterday')
+    frontier.add({bad['link']: (None, False)})
+    assert list(frontier.claim_due()) == [bad['link']]
+    failed = threading.Event()
+
+    def on_failed(links, error):
+        frontier.fail_all(links, error)
+        failed.set()
+
+    batch_writer = BatchWriter(engine, batch_size=1, flush_interval=0.05, retry_backoff=0,
+                               on_written=frontier.mark_done, on_failed=on_failed)
+    batch_writer.submit(bad)
+    assert failed.wait(5)
+    assert batch_writer.stats['rows_failed'] == 1
+    assert frontier.counts() == {'pending': 1}
+    assert stored_job_ids(engine) == []
+
+    # Once the page is refetched, the same job_id is accepted again
+    batch_writer.submit(record('bad-1'))
+    batch_writer.close()
+    assert batch_writer.stats['duplicates_dropped'] == 0
+    assert stored_job_ids(engine) == ['bad-1']
+    assert frontier.counts() == {'done': 1}
+    frontier.close()
@@ -0,0 +1,264 @@
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import OperationalError
+
+from Backend.models.job import Job
+from Backend.models.job_archive import JobArchive
+from Backend.models.listing_card import ListingCard
+from Backend.models.tag import Tag, job_tags
+from Backend.utils import change_log, dedup, facets
+from Backend.utils.locations import replace_job_locations
+from Backend.utils.search import backend_for_dialect
+from Backend.utils.tags import parse_tags, tag_key
+
+JOB_COLUMNS = ('title', 'company', 'city', 'country', 'posting_date', 'job_type', 'tags', 'link', 'job_id')
+# What the tag, location, facet and full-text indexes read back after a write
+INDEXED_COLUMNS = ('id', 'job_id', 'title', 'company', 'city', 'country', 'job_type', 'tags')
+
+_STOP = object()
+
+
+class ConcurrentInsert(Exception):
+    """Another writer (the API) stored some of a batch's new job_ids first; retry the batch to treat them as known."""
+
+
+def _insert_ignore(table):
+    return insert(table).prefix_with('IGNORE', dialect='mysql').prefix_with('OR IGNORE', dialect='sqlite')
+
+
+def _upsert_card_hashes(conn, hashes):
+    table = ListingCard.__table__
+    now = datetime.now()
+    values = [{'job_id': job_id, 'card_hash': card_hash, 'seen_at': now} for job_id, card_hash in hashes.items()]
+    if conn.dialect.name == 'mysql':
+        stmt = mysql.insert(table)
+        stmt = stmt.on_duplicate_key_update(card_hash=stmt.inserted.card_hash, seen_at=stmt.inserted.seen_at)
+    else:
+        stmt = sqlite.insert(table)
+        stmt = stmt.on_conflict_do_update(index_elements=[table.c.job_id],
+                                          set_={'card_hash': stmt.excluded.card_hash, 'seen_at': stmt.excluded.seen_at})
+    conn.execute(stmt, values)
+
+
+def _row(job_data):
+    row = {name: job_data.get(name) for name in JOB_COLUMNS}
+    if isinstance(row['posting_date'], str):
+        row['posting_date'] = datetime.strptime(row['posting_date'], '%Y-%m-%d').date()
+    return row
+
+
+def _load_jobs(conn, job_ids):
+    return {job.job_id: job for job in conn.execute(select(*(getattr(Job, name) for name in INDEXED_COLUMNS))
+                                                    .where(Job.job_id.in_(job_ids)))}
+
+
+def _replace_tags(conn, jobs):
+    tags_by_job = {job.id: parse_tags(job.tags) for job in jobs}
+    conn.execute(job_tags.delete().where(job_tags.c.job_id.in_(list(tags_by_job))))
+    keys = list({tag_key(name) for tags in tags_by_job.values() for name in tags})
+    if not keys:
+        return
+    conn.execute(_insert_ignore(Tag.__table__), [{'name': key} for key in keys])
+    tag_ids = {name: tag_id for tag_id, name in conn.execute(select(Tag.id, Tag.name).where(Tag.name.in_(keys)))}
+    conn.execute(_insert_ignore(job_tags), [{'job_id': job_pk, 'tag_id': tag_ids[tag_key(name)]}
+                                            for job_pk, tags in tags_by_job.items() for name in tags])
+
+
+def write_batch(conn, records, duplicates=None, staged=None):
+    """
+    Write a batch of scraped records in the caller's transaction: new jobs
+    with one executemany insert, and known jobs marked 'refresh' (their
+    listing card changed) with one executemany update. Then re-index the
+    touched rows' tags, locations, facets and (on SQLite) full-text
+    entries, link near-duplicates through the `duplicates` index, store the
+    listing card hashes and append to the change log. 'card_only' records
+    carry just a card hash. The `duplicates` index changes are appended to
+    `staged`, to apply() once the transaction commits. Returns the number of
+    job rows written.
+    """
+    hashes = {record['job_id']: record['card_hash'] for record in records
+              if record.get('card_hash') and record.get('job_id')}
+    rows = [_row(record) for record in records if not record.get('card_only')]
+    # Without a job_id there is nothing to match on, so these are always inserted
+    keyless = [{**row, 'job_id': None} for row in rows if not row['job_id']]
+    rows = [row for row in rows if row['job_id']]
+    refresh = {record['job_id'] for record in records if record.get('refresh')}
+    before = _load_jobs(conn, [row['job_id'] for row in rows])
+    # Postings already moved to jobs_archive are not stored again
+    archived = set(conn.execute(select(JobArchive.job_id)
+                                .where(JobArchive.job_id.in_([row['job_id'] for row in rows]))).scalars())
+    new_rows = [row for row in rows if row['job_id'] not in before and row['job_id'] not in archived]
+    changed_rows = [row for row in rows if row['job_id'] in before and row['job_id'] in refresh]
+
+    if new_rows:
+        inserted = conn.execute(_insert_ignore(Job.__table__), new_rows).rowcount
+        # Counting an ignored row as new would apply its facets on top of the other writer's
+        if 0 <= inserted < len(new_rows):
+            raise ConcurrentInsert(f'{len(new_rows) - inserted} of {len(new_rows)} new job_ids were stored meanwhile')
+    if changed_rows:
+        conn.execute(update(Job.__table__).where(Job.job_id == bindparam('match_job_id')),
+                     [{**row, 'match_job_id': row['job_id']} for row in changed_rows])
+    if hashes:
+        _upsert_card_hashes(conn, hashes)
+    # One at a time, for the primary keys they are read back by
+    keyless_pks = [conn.execute(insert(Job.__table__), row).inserted_primary_key[0] for row in keyless]
+    written = [row['job_id'] for row in new_rows + changed_rows]
+    if not written and not keyless_pks:
+        return 0
+
+    after = _load_jobs(conn, written)
+    if keyless_pks:
+        after.update((('', job.id), job) for job in conn.execute(
+            select(*(getattr(Job, name) for name in INDEXED_COLUMNS)).where(Job.id.in_(keyless_pks))))
+    _replace_tags(conn, after.values())
+    replace_job_locations(after.values(), conn)
+    dedup.link_duplicates(duplicates, list(after.values()), conn, staged)
+
+    deltas = Counter()
+    for job_id, job in after.items():
+        if job_id in before:
+            deltas.subtract(facets.facet_rows(*facets.snapshot(before[job_id])))
+        deltas.update(facets.facet_rows(*facets.snapshot(job)))
+    facets.apply_delta(deltas, conn)
+
+    # MySQL keeps its FULLTEXT index itself; the SQLite FTS5 table needs rows
+    if conn.dialect.name == 'sqlite':
+        backend_for_dialect('sqlite').index_jobs(list(after.values()), conn)
+
+    change_log.record([(job.id, 'update' if job_id in before else 'insert') for job_id, job in after.items()], conn)
+    return len(after)
+
+
+class BatchWriter:
+    """
+    Buffers scraped records on a queue and flushes them in batches from
+    background threads, so parsing never waits on a commit. A batch is
+    flushed when it reaches batch_size or has waited flush_interval seconds,
+    and each batch is one transaction on a connection from the engine's pool.
+    A batch that hits a transient database error or a ConcurrentInsert is
+    retried up to `retries` times, with backoff from `retry_backoff` seconds.
+
+    `on_written` is called with the links of each committed batch and
+    `on_failed` with the links and error of a batch that could not be
+    written, whose records are then gone; `duplicates` is the DuplicateIndex
+    new postings are checked against, and `cache` is the API's shared
+    response cache backend, whose jobs generation each committed batch
+    bumps.
+    """
+
+    def __init__(self, engine, batch_size=100, flush_interval=2.0, workers=2, on_written=None, duplicates=None,
+                 cache=None, on_failed=None, retries=2, retry_backoff=1.0):
+        self.engine = engine
+        self.on_written = on_written
+        self.on_failed = on_failed
+        self.duplicates = duplicates
+        self.cache = cache
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # SQLite allows one writer at a time, so extra threads would only contend
+        self.workers = 1 if engine.dialect.name == 'sqlite' else workers
+        self.queue = queue.Queue(maxsize=batch_size * self.workers * 4)
+        self.stats = Counter()
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._run, name=f'db-writer-{i}', daemon=True)
+                         for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, job_data):
+        if not job_data:
+            return
+        job_id = job_data.get('job_id')
+        with self._lock:
+            # One job_id per run, so concurrent batches never race on the same row
+            if job_id:
+                if job_id in self._seen:
+                    self.stats['duplicates_dropped'] += 1
+                    logging.debug(f"Dropped repeated job_id {job_id} ({job_data.get('link')})")
+                    return
+                self._seen.add(job_id)
+        self.queue.put(job_data)
+
+    def close(self):
+        """Flush everything still buffered and stop the writer threads."""
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        logging.info(f"Writer totals: {self.stats['rows_written']} rows written in {self.stats['batches']} batches, "
+                     f"{self.stats['rows_failed']} failed, {self.stats['duplicates_dropped']} repeated job_ids dropped")
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._flush(batch)
+                return
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        started = time.perf_counter()
+        try:
+            written = self._write(batch)
+        except Exception as e:
+            logging.error(f"Database error writing batch of {len(batch)} jobs: {e}")
+            with self._lock:
+                self.stats['rows_failed'] += len(batch)
+                # So the records are accepted again once their pages are refetched
+                self._seen.difference_update(record['job_id'] for record in batch if record.get('job_id'))
+            if self.on_failed is not None:
+                self.on_failed([record['link'] for record in batch if record.get('link')], e)
+            return
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['rows_written'] += written
+        logging.info(f"Flushed batch: {len(batch)} scraped, {written} rows written in {latency_ms:.1f} ms")
+        if written and self.cache is not None:
+            try:
+                self.cache.bump('jobs')
+            except Exception as e:
+                logging.warning(f"Could not retire the API's cached pages: {e}")
+        if self.on_written is not None:
+            self.on_written([record['link'] for record in batch if record.get('link')])
+
+    def _write(self, batch):
+        for attempt in range(self.retries + 1):
+            staged = []
+            try:
+                with self.engine.begin() as conn:
+                    written = write_batch(conn, batch, self.duplicates, staged)
+            except (OperationalError, ConcurrentInsert) as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.retry_backoff * 2 ** attempt
+                logging.warning(f"Retrying batch of {len(batch)} jobs in {delay:g}s: {e}")
+                time.sleep(delay)
+                continue
+            if self.duplicates is not None:
+                self.duplicates.apply(staged)
+            return written